@@ -1,9 +1,24 @@
 #!/usr/bin/env python3
+import argparse
 import csv
-import io
 import json
 import os
-from typing import Any, Dict, List, Optional
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Set, TextIO, Tuple
+
+from txedge_doc_cache import load_cached_json
+from txedge_io import (
+    JSON_BACKENDS,
+    contains_non_finite,
+    existing_variant,
+    mark_non_finite,
+    open_input,
+    strip_compression,
+    write_json,
+)
+from txedge_partition import is_partitioned, read_index
+from txedge_patch import FORMAT_DELTA, FORMAT_FULL, FORMAT_JSON_PATCH, OUTPUT_FORMATS, make_delta, make_json_patch
+from txedge_stats import ConversionStats, cprofile_to, stage
 
 
 def _parse_bool(s: str) -> Optional[bool]:
@@ -45,36 +60,285 @@ def _coerce_to_type(new_text: str, old_value: Any) -> Any:
     return s
 
 
-def _update_obj_from_row(obj: Dict[str, Any], row: Dict[str, str]) -> None:
-    skip_keys = {"id", "objectType", "stream", "state"}
+# Columns that tie a row back to its object; never written into the JSON
+_SKIP_COLUMNS = {"id", "objectType", "stream", "state"}
+# Ids listed in a duplicate-id warning
+_MAX_LISTED = 10
+
+
+class FieldChange:
+    """One value written back into the JSON.
+
+    ``path`` is the chain of keys from the object root to the changed field and
+    ``index`` the object's position in its section list, when known.
+    """
+
+    def __init__(
+        self,
+        section: str,
+        object_id: Any,
+        path: Tuple[str, ...],
+        old: Any,
+        new: Any,
+        index: Optional[int] = None,
+    ) -> None:
+        self.section = section
+        self.object_id = object_id
+        self.index = index
+        self.path = path
+        self.old = old
+        self.new = new
+
+    @property
+    def key(self) -> str:
+        return self.path[-1]
+
+    def __repr__(self) -> str:
+        return f"FieldChange({self.section!r}, {self.object_id!r}, {'/'.join(self.path)!r}, {self.old!r} -> {self.new!r})"
+
+
+def _to_str(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _to_cell_text(value: Any) -> str:
+    """The text the editable CSV holds for ``value`` (see txedge_to_csv_with_id)."""
+    if isinstance(value, list):
+        try:
+            return json.dumps(value, ensure_ascii=False)
+        except Exception:
+            return _to_str(value)
+    return _to_str(value)
+
+
+def _index_last_keys(
+    obj: Any,
+    index: Optional[Dict[str, Tuple[Dict[str, Any], Tuple[str, ...]]]] = None,
+    path: Tuple[str, ...] = (),
+) -> Dict[str, Tuple[Dict[str, Any], Tuple[str, ...]]]:
+    """Map each CSV column name to the ``(parent dict, path)`` of the value it came from.
+
+    Mirrors ``_flatten_to_last_keys`` in txedge_to_csv_with_id: direct scalars of a
+    dict first, then nested dicts and lists in order, skipping ``state``; the
+    first occurrence of a last-key wins, so a column maps to exactly one location.
+    """
+    if index is None:
+        index = {}
+    if not isinstance(obj, dict):
+        return index
+    for key, value in obj.items():
+        if key == "state" or isinstance(value, (dict, list)):
+            continue
+        if key not in index:
+            index[key] = (obj, path + (key,))
+    for key, value in obj.items():
+        if key == "state":
+            continue
+        if isinstance(value, dict):
+            _index_last_keys(value, index, path + (key,))
+        elif isinstance(value, list) and key not in index:
+            index[key] = (obj, path + (key,))
+    return index
+
+
+def _row_changes(
+    obj: Dict[str, Any],
+    row: Dict[str, str],
+    section: str = "",
+    position: Optional[int] = None,
+    resolved: Optional[Set[str]] = None,
+) -> List[FieldChange]:
+    """The changes the cells of ``row`` make to ``obj``, which is left as is.
+
+    Only columns whose text differs from what the editable CSV would show for the
+    current value are coerced; each one that changes the value gives a
+    ``FieldChange``. Columns that name a field of ``obj`` are added to ``resolved``.
+    """
+    changes: List[FieldChange] = []
+    index = _index_last_keys(obj)
+    for key, text in row.items():
+        if key in _SKIP_COLUMNS or text is None:
+            continue
+        entry = index.get(key)
+        if entry is None:
+            continue
+        if resolved is not None:
+            resolved.add(key)
+        parent, path = entry
+        old = parent[key]
+        if text == _to_cell_text(old):
+            continue
+        if isinstance(old, list):
+            if text.strip() == "":
+                continue
+            try:
+                new = json.loads(text)
+            except Exception:
+                # Ignore invalid JSON payloads for lists
+                continue
+        else:
+            new = _coerce_to_type(text, old)
+        if type(new) is type(old) and new == old:
+            continue
+        changes.append(FieldChange(section, obj.get("id"), path, old, new, position))
+    return changes
+
+
+def _with_changes(obj: Dict[str, Any], changes: List[FieldChange]) -> Dict[str, Any]:
+    """A copy of ``obj`` with ``changes`` applied; only the dicts on a changed path are copied."""
+    updated = dict(obj)
+    copied = {id(updated)}
+    for change in changes:
+        parent = updated
+        for key in change.path[:-1]:
+            child = parent[key]
+            if id(child) not in copied:
+                child = parent[key] = dict(child)
+                copied.add(id(child))
+            parent = child
+        parent[change.key] = change.new
+    return updated
 
-    def recurse(node: Any) -> None:
-        if isinstance(node, dict):
-            for key, value in node.items():
-                if key in skip_keys:
+
+# objectType column value -> section of the objects it describes
+OBJECT_TYPE_SECTIONS = {
+    "Stream": "configuredStreams",
+    "Source": "configuredSources",
+    "Output": "configuredOutputs",
+}
+_SECTION_OBJECT_TYPES = {section: object_type for object_type, section in OBJECT_TYPE_SECTIONS.items()}
+
+# (objectType, id) of a CSV row; objectType is "" when the row has none the converter knows
+_RowKey = Tuple[str, str]
+
+
+class CsvEdits:
+    """The non-empty cells of one or more editable CSVs, per (objectType, id).
+
+    Rows are streamed with ``csv.reader`` and only cells that can change a
+    value are kept: empty or blank cells never do, and the id/objectType/
+    stream/state columns are never written back. Each row keeps one flat tuple
+    ``(column, text, column, text, ...)`` where ``column`` indexes ``columns``,
+    which every file shares. The last row of a key wins, and the last of two
+    same-named columns wins.
+
+    Streams, sources and outputs number their ids separately, so rows are keyed
+    by objectType too; rows without a known objectType match any section by id.
+    Problems are recorded as rows are read: keys on more than one row
+    (``duplicates``: key -> extra rows), repeated or blank header names.
+    """
+
+    def __init__(self) -> None:
+        self.columns: List[str] = []
+        self._column_ids: Dict[str, int] = {}
+        self._cells: Dict[_RowKey, Tuple[Any, ...]] = {}
+        self.rows_read = 0
+        self.duplicates: Dict[_RowKey, int] = {}
+        # (file, column name) of headers naming a column twice, or a blank name
+        self.header_problems: List[Tuple[str, str]] = []
+
+    def _column_id(self, name: str) -> int:
+        column = self._column_ids.get(name)
+        if column is None:
+            column = self._column_ids[name] = len(self.columns)
+            self.columns.append(name)
+        return column
+
+    def read(self, csv_path: str, delimiter: str = ",", encoding: str = "utf-8") -> None:
+        """Add the rows of one CSV; a later row of a key replaces an earlier one."""
+        with open_input(csv_path, "r", encoding=encoding, newline="") as f:
+            reader = csv.reader(f, delimiter=delimiter)
+            header = next(reader, None)
+            if header is None:
+                return
+            # name -> index of its last occurrence, in first-occurrence order
+            positions: Dict[str, int] = {}
+            for position, name in enumerate(header):
+                if name in positions or not name.strip():
+                    self.header_problems.append((csv_path, name))
+                positions[name] = position
+            id_position = positions.get("id")
+            type_position = positions.get("objectType")
+            editable = [
+                (position, self._column_id(name)) for name, position in positions.items() if name not in _SKIP_COLUMNS
+            ]
+            cells = self._cells
+            for row in reader:
+                if not row:
+                    # Blank line
                     continue
-                if key == "state":
+                self.rows_read += 1
+                width = len(row)
+                rid = row[id_position].strip() if id_position is not None and id_position < width else ""
+                if rid == "":
                     continue
-                if isinstance(value, dict):
-                    recurse(value)
-                elif isinstance(value, list):
-                    if key in row and row[key].strip() != "":
-                        try:
-                            node[key] = json.loads(row[key])
-                        except Exception:
-                            # Ignore invalid JSON payloads for lists
-                            pass
-                else:
-                    if key in row:
-                        node[key] = _coerce_to_type(row[key], value)
+                object_type = row[type_position].strip() if type_position is not None and type_position < width else ""
+                key = (object_type if object_type in OBJECT_TYPE_SECTIONS else "", rid)
+                kept: List[Any] = []
+                for position, column in editable:
+                    if position < width:
+                        text = row[position]
+                        if text and not text.isspace():
+                            kept.append(column)
+                            kept.append(text)
+                if key in cells:
+                    self.duplicates[key] = self.duplicates.get(key, 0) + 1
+                cells[key] = tuple(kept)
 
-    recurse(obj)
+    def key_for(self, section: str, rid: str) -> Optional[_RowKey]:
+        """Key of the row holding the edits of object ``rid`` in ``section`` (None if there is none)."""
+        key = (_SECTION_OBJECT_TYPES.get(section, ""), rid)
+        if key in self._cells:
+            return key
+        key = ("", rid)
+        return key if key in self._cells else None
 
+    def row(self, key: _RowKey) -> Dict[str, str]:
+        """The kept cells of a row as column -> text."""
+        kept = self._cells[key]
+        columns = self.columns
+        return {columns[kept[i]]: kept[i + 1] for i in range(0, len(kept), 2)}
 
-def _read_csv_rows(csv_path: str, delimiter: str, encoding: str) -> List[Dict[str, str]]:
-    with io.open(csv_path, "r", encoding=encoding, newline="") as f:
-        reader = csv.DictReader(f, delimiter=delimiter)
-        return [dict(row) for row in reader]
+    def filled_columns(self, keys: Iterable[_RowKey]) -> Set[str]:
+        """Columns holding a kept cell in the rows of ``keys``."""
+        columns: Set[int] = set()
+        for key in keys:
+            columns.update(self._cells[key][::2])
+        return {self.columns[column] for column in columns}
+
+    def rows_for(self, key: _RowKey) -> int:
+        """Rows read for ``key``, including replaced duplicates."""
+        return 1 + self.duplicates.get(key, 0)
+
+
+def report_csv_problems(
+    edits: CsvEdits, csv_location: str, unknown_columns: Iterable[str] = (), stream: Optional[TextIO] = None
+) -> None:
+    """Write warnings for duplicate ids, bad header names and columns that match no field."""
+    out = stream if stream is not None else sys.stderr
+    for path, name in edits.header_problems:
+        problem = "has a blank column name" if not name.strip() else f"has column {name!r} more than once (the last one is used)"
+        print(f"Warning: {path}: header {problem}", file=out)
+    if edits.duplicates:
+        keys = list(edits.duplicates)
+        shown = ", ".join(f"{object_type} {rid}".strip() for object_type, rid in keys[:_MAX_LISTED])
+        if len(keys) > _MAX_LISTED:
+            shown += ", ..."
+        print(
+            f"Warning: {csv_location}: {len(keys)} id(s) appear on more than one row (the last row is used): {shown}",
+            file=out,
+        )
+    unknown = sorted(unknown_columns)
+    if unknown:
+        print(
+            f"Warning: {csv_location}: column(s) with values that match no field of any object were ignored: "
+            + ", ".join(unknown),
+            file=out,
+        )
 
 
 def convert_csv_to_json(
@@ -82,45 +346,152 @@ def convert_csv_to_json(
     output_json_path: str,
     delimiter: str = ",",
     encoding: str = "utf-8",
-) -> None:
+    output_format: str = FORMAT_FULL,
+    json_backend: Optional[str] = None,
+    compact: bool = False,
+    stats: Optional[ConversionStats] = None,
+) -> List[FieldChange]:
+    """Apply an edited CSV to its ``<csv_base>-config.json`` and write the result.
+
+    ``input_csv_path`` may also be a partitioned editable CSV (the
+    ``<csv_base>.parts`` folder or its ``index.json``, see txedge_partition);
+    the rows of all parts are applied together.
+
+    ``output_format`` selects what is written to ``output_json_path``: the full
+    updated document (``full``), or only the changes as an RFC 6902 JSON Patch
+    (``json-patch``) or a per-id delta (``delta``); see txedge_patch. The full
+    document is indented unless ``compact``; patches are always compact.
+    ``json_backend`` picks the parser and serializer (see txedge_io.JSON_BACKENDS).
+    Returns the change set: one ``FieldChange`` per value that was modified.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    if is_partitioned(input_csv_path):
+        parts_dir, csv_paths = read_index(input_csv_path)
+        csv_location = parts_dir
+    else:
+        csv_paths = [input_csv_path]
+        csv_location = input_csv_path
     # Determine the source JSON path in the environment root
-    env_dir = os.path.dirname(os.path.dirname(os.path.abspath(input_csv_path)))
-    csv_base = os.path.splitext(os.path.basename(input_csv_path))[0]
-    source_json_path = os.path.join(env_dir, f"{csv_base}-config.json")
+    env_dir = os.path.dirname(os.path.dirname(os.path.abspath(csv_location)))
+    csv_base = os.path.splitext(strip_compression(os.path.basename(os.path.abspath(csv_location))))[0]
+    # The export may be archived compressed (<csv_base>-config.json.gz...)
+    source_json_path = existing_variant(os.path.join(env_dir, f"{csv_base}-config.json"))
     if not os.path.exists(source_json_path):
         raise FileNotFoundError(f"Matching JSON not found: {source_json_path}")
 
     # Load current JSON
-    with io.open(source_json_path, "r", encoding=encoding) as f:
-        data = json.load(f)
+    with stage(stats, "parse"):
+        data = load_cached_json(source_json_path, encoding=encoding, backend=json_backend)
 
-    # Read CSV rows, index by id (string form for robustness)
-    rows = _read_csv_rows(input_csv_path, delimiter, encoding)
-    id_to_row: Dict[str, Dict[str, str]] = {}
-    for row in rows:
-        rid = (row.get("id") or "").strip()
-        if rid != "":
-            id_to_row[rid] = row
+    # Stream the CSV rows, keeping the editable cells by objectType and id (string form for robustness)
+    with stage(stats, "read_csv"):
+        edits = CsvEdits()
+        for csv_path in csv_paths:
+            edits.read(csv_path, delimiter, encoding)
 
     # Update each object in configuredStreams/Sources/Outputs by id
-    for section_key in ("configuredStreams", "configuredSources", "configuredOutputs"):
-        items = data.get(section_key)
-        if not isinstance(items, list):
-            continue
-        for obj in items:
-            if not isinstance(obj, dict):
-                continue
-            obj_id = obj.get("id")
-            if obj_id is None:
+    changes: List[FieldChange] = []
+    matched: Set[Tuple[str, str]] = set()
+    resolved: Set[str] = set()
+    # The document may be shared through the document cache: changed objects (and the
+    # section lists and top-level dict holding them) are copied, the rest is shared
+    updated = data
+    with stage(stats, "coerce"):
+        for section_key in ("configuredStreams", "configuredSources", "configuredOutputs"):
+            items = data.get(section_key)
+            if not isinstance(items, list):
                 continue
-            row = id_to_row.get(str(obj_id))
-            if not row:
-                continue
-            _update_obj_from_row(obj, row)
+            updated_items: Optional[List[Any]] = None
+            for position, obj in enumerate(items):
+                if not isinstance(obj, dict):
+                    continue
+                obj_id = obj.get("id")
+                if obj_id is None:
+                    continue
+                key = edits.key_for(section_key, str(obj_id))
+                if key is None:
+                    continue
+                matched.add(key)
+                obj_changes = _row_changes(obj, edits.row(key), section_key, position, resolved)
+                if obj_changes:
+                    if updated_items is None:
+                        updated_items = list(items)
+                    updated_items[position] = _with_changes(obj, obj_changes)
+                    changes.extend(obj_changes)
+            if updated_items is not None:
+                if updated is data:
+                    updated = dict(data)
+                updated[section_key] = updated_items
+    report_csv_problems(edits, csv_location, edits.filled_columns(matched) - resolved)
+
+    # Cells such as "nan" or "inf" coerce to floats that orjson would write as null
+    non_finite = any(contains_non_finite(c.new) or contains_non_finite(c.old) for c in changes)
+
+    # Write updated JSON (or just the changes); the destination directory is created if needed
+    with stage(stats, "write"):
+        if output_format == FORMAT_FULL:
+            output: Any = mark_non_finite(updated) if non_finite else updated
+            write_json(output, output_json_path, encoding=encoding, backend=json_backend, compact=compact)
+        else:
+            patch = make_json_patch(changes) if output_format == FORMAT_JSON_PATCH else make_delta(changes)
+            output = mark_non_finite(patch) if non_finite else patch
+            # Patches are shipped to edge nodes; keep them compact
+            write_json(output, output_json_path, encoding=encoding, backend=json_backend, compact=True)
+
+    if stats is not None:
+        stats.rows_read += edits.rows_read
+        # Rows without an id, or whose id matches no object, are not applied
+        stats.objects_skipped += edits.rows_read - sum(edits.rows_for(key) for key in matched)
+        stats.add_input(source_json_path)
+        for csv_path in csv_paths:
+            stats.add_input(csv_path)
+        stats.add_output(output_json_path)
+        stats.finish()
+    return changes
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Apply an edited CSV back to its txEdge JSON")
+    parser.add_argument("-i", "--input", required=True, help="Path to the edited CSV (under <env>/Editable CSVs/), or a partitioned <name>.parts folder")
+    parser.add_argument("-o", "--output", required=True, help="Path to write the updated JSON (or patch)")
+    parser.add_argument("--delimiter", default=",", help="CSV delimiter")
+    parser.add_argument("--encoding", default="utf-8", help="File encoding")
+    parser.add_argument(
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default=FORMAT_FULL,
+        help="Write the full document, an RFC 6902 JSON Patch, or a per-id delta",
+    )
+    parser.add_argument("--json-backend", choices=JSON_BACKENDS, default=None, help="JSON parser and serializer (default: stdlib)")
+    parser.add_argument("--compact", action="store_true", help="Write the updated JSON without indentation")
+    parser.add_argument("--profile", action="store_true", help="Print per-stage timings and counters to stderr")
+    parser.add_argument("--cprofile", metavar="FILE", help="Write a cProfile dump of the conversion to FILE")
+    return parser.parse_args()
+
 
-    # Ensure destination directory exists and write updated JSON
-    os.makedirs(os.path.dirname(os.path.abspath(output_json_path)), exist_ok=True)
-    with io.open(output_json_path, "w", encoding=encoding) as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+def main() -> int:
+    args = parse_args()
+    stats = ConversionStats() if args.profile else None
+    try:
+        with cprofile_to(args.cprofile):
+            convert_csv_to_json(
+                args.input,
+                args.output,
+                delimiter=args.delimiter,
+                encoding=args.encoding,
+                output_format=args.output_format,
+                json_backend=args.json_backend,
+                compact=args.compact,
+                stats=stats,
+            )
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    if stats is not None:
+        print(f"Profile for {args.input}:\n{stats.format()}", file=sys.stderr)
+    return 0
 
 
+if __name__ == "__main__":
+    sys.exit(main())
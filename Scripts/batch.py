@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""Batch conversion of a whole environment folder (TDP/D2C/FTS).
+
+Shared by the GUI's "Convert ALL" option and the headless CLI:
+
+  python -m Scripts.batch --env TDP --script all --workers 4
+
+Files whose outputs are current according to the environment's manifest
+(see batch_manifest.py) are skipped unless a rebuild is forced. Setting the
+TXEDGE_CPROFILE_DIR environment variable writes a cProfile dump per converted
+file (``<input file>.prof``) into that folder.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+# Converters import each other as flat sibling modules
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.append(SCRIPTS_DIR)
+
+from batch_manifest import Manifest, fingerprint  # noqa: E402
+from txedge_doc_cache import configure_document_cache  # noqa: E402
+from txedge_env import DEFAULT_PROJECT_ROOT, ENV_FOLDERS  # noqa: E402
+from txedge_io import COMPRESSIONS, existing_variant, has_extension, strip_compression, with_compression  # noqa: E402
+from txedge_stats import ConversionStats, cprofile_to  # noqa: E402
+
+CPROFILE_DIR_ENV = "TXEDGE_CPROFILE_DIR"
+ALL_REPORTS_LABEL = "All reports"
+SQLITE_LABEL = "SQLite database"
+# Database the "SQLite database" script loads every export of an environment into
+SQLITE_DATABASE_NAME = "txedge.sqlite"
+SCRIPT_LABELS = [
+    "Stream Information",
+    "Input/Output",
+    "Create Editable CSV",
+    "Convert CSV to JSON",
+    ALL_REPORTS_LABEL,
+    SQLITE_LABEL,
+]
+# CLI names for the GUI script labels
+SCRIPT_NAME_TO_LABEL = {
+    "streaminfo": "Stream Information",
+    "inputoutput": "Input/Output",
+    "editable": "Create Editable CSV",
+    "csv2json": "Convert CSV to JSON",
+    "all": ALL_REPORTS_LABEL,
+    "sqlite": SQLITE_LABEL,
+}
+# Reports written by the single-pass "All reports" script, keyed by the label of
+# the script that writes each one on its own
+REPORT_LABEL_TO_NAME = {
+    "Stream Information": "streaminfo",
+    "Input/Output": "inputoutput",
+    "Create Editable CSV": "editable",
+}
+
+
+class BatchResult:
+    """Outcome of converting one input file; ``error`` is None on success.
+
+    ``skipped`` marks files left alone because their outputs were up to date;
+    ``fingerprints`` holds the input fingerprints taken before converting;
+    ``seconds`` and ``stats`` describe the conversion of a converted file.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        output_path: Optional[str] = None,
+        error: Optional[str] = None,
+        skipped: bool = False,
+        fingerprints: Optional[Dict[str, Dict[str, Any]]] = None,
+        seconds: float = 0.0,
+        stats: Optional[ConversionStats] = None,
+    ) -> None:
+        self.filename = filename
+        self.output_path = output_path
+        self.error = error
+        self.skipped = skipped
+        self.fingerprints = fingerprints
+        self.seconds = seconds
+        self.stats = stats
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def default_workers() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def output_subfolder(script_label: str) -> str:
+    if script_label == "Stream Information":
+        return "StreamInfo-CSVs"
+    if script_label == "Create Editable CSV":
+        return "Editable CSVs"
+    if script_label == "Convert CSV to JSON":
+        return "Updated JSONs"
+    if script_label in (ALL_REPORTS_LABEL, SQLITE_LABEL):
+        # Reports land in several subfolders of the environment folder itself;
+        # the database sits in the environment folder
+        return ""
+    return "Input-Output-CSVs"
+
+
+def input_dir(project_root: str, env_folder: str, script_label: str) -> str:
+    if script_label == "Convert CSV to JSON":
+        return os.path.join(project_root, env_folder, "Editable CSVs")
+    return os.path.join(project_root, env_folder)
+
+
+def list_inputs(project_root: str, env_folder: str, script_label: str) -> List[str]:
+    """File names the given script consumes in an environment, sorted.
+
+    Hidden files (the batch manifest, macOS "._" resource forks) are ignored;
+    compressed inputs (``.json.gz``, ``.csv.xz``...) are included.
+    """
+    ext = ".csv" if script_label == "Convert CSV to JSON" else ".json"
+    try:
+        return sorted(
+            f
+            for f in os.listdir(input_dir(project_root, env_folder, script_label))
+            if has_extension(f, ext) and not f.startswith(".")
+        )
+    except FileNotFoundError:
+        return []
+
+
+def output_path_for(
+    project_root: str, env_folder: str, script_label: str, input_filename: str, compression: Optional[str] = None
+) -> str:
+    """Naming rule shared by the GUI and the batch CLI.
+
+    A compressed input is named after its uncompressed name; ``compression``
+    (one of txedge_io.COMPRESSIONS) compresses the output. The database is
+    never compressed.
+    """
+    if script_label == SQLITE_LABEL:
+        # One database per environment, shared by all of its exports
+        return os.path.join(project_root, env_folder, SQLITE_DATABASE_NAME)
+    base_no_ext, _ = os.path.splitext(strip_compression(input_filename))
+    base_lower = base_no_ext.lower()
+    if base_lower.endswith("-config"):
+        trimmed_base = base_no_ext[: -len("-config")]
+    else:
+        trimmed_base = base_no_ext
+    if script_label == "Stream Information":
+        output_base = f"{trimmed_base}-StreamInfo"
+    elif script_label == "Convert CSV to JSON":
+        # For reverse conversion, output JSON should be named <csv_base>-config.json
+        output_base = f"{base_no_ext}-config"
+    else:
+        output_base = trimmed_base
+    env_output_dir = os.path.join(project_root, env_folder, output_subfolder(script_label))
+    ext = ".json" if script_label == "Convert CSV to JSON" else ".csv"
+    return with_compression(os.path.join(env_output_dir, f"{output_base}{ext}"), compression)
+
+
+def make_output_path(
+    project_root: str, env_folder: str, script_label: str, input_filename: str, compression: Optional[str] = None
+) -> str:
+    """Like output_path_for, creating the output folder."""
+    output_path = output_path_for(project_root, env_folder, script_label, input_filename, compression)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    return output_path
+
+
+def output_paths_for(
+    project_root: str, env_folder: str, script_label: str, input_filename: str, compression: Optional[str] = None
+) -> List[str]:
+    """Every file a script writes for one input ("All reports" writes several)."""
+    if script_label == ALL_REPORTS_LABEL:
+        return [
+            output_path_for(project_root, env_folder, label, input_filename, compression)
+            for label in REPORT_LABEL_TO_NAME
+        ]
+    return [output_path_for(project_root, env_folder, script_label, input_filename, compression)]
+
+
+def input_paths_for(project_root: str, env_folder: str, script_label: str, input_filename: str) -> List[str]:
+    """Every file a conversion reads; CSV to JSON also reads <csv_base>-config.json (or a compressed variant)."""
+    paths = [os.path.join(input_dir(project_root, env_folder, script_label), input_filename)]
+    if script_label == "Convert CSV to JSON":
+        csv_base = os.path.splitext(strip_compression(input_filename))[0]
+        paths.append(existing_variant(os.path.join(project_root, env_folder, f"{csv_base}-config.json")))
+    return paths
+
+
+def outputs_current(
+    manifest: Manifest,
+    project_root: str,
+    env_folder: str,
+    script_label: str,
+    input_filename: str,
+    compression: Optional[str] = None,
+) -> bool:
+    """True when the manifest shows the outputs of ``input_filename`` as up to date.
+
+    The database is shared by every export of the environment, so its existence
+    says nothing about one export: it must also still hold that export's rows,
+    loaded from the file content the manifest recorded.
+    """
+    input_paths = input_paths_for(project_root, env_folder, script_label, input_filename)
+    output_paths = output_paths_for(project_root, env_folder, script_label, input_filename, compression)
+    if not manifest.is_up_to_date(script_label, input_filename, input_paths, output_paths):
+        return False
+    if script_label == SQLITE_LABEL:
+        from txedge_to_sqlite import loaded_sha256
+
+        recorded = manifest.recorded_sha256(script_label, input_filename, input_paths[0])
+        return recorded is not None and loaded_sha256(output_paths[0], input_filename) == recorded
+    return True
+
+
+def load_converter(script_label: str) -> Callable[..., None]:
+    """Import the conversion function behind a script label."""
+    if script_label == "Stream Information":
+        from txedge_to_csv_streams_sources import convert_streams_sources
+
+        return convert_streams_sources
+    if script_label == "Input/Output":
+        from txedge_to_csv import convert_txedge_to_csv
+
+        return convert_txedge_to_csv
+    if script_label == "Create Editable CSV":
+        from txedge_to_csv_with_id import convert_txedge_to_csv_with_id
+
+        return convert_txedge_to_csv_with_id
+    if script_label == "Convert CSV to JSON":
+        from CSV_to_JSON import convert_csv_to_json
+
+        return convert_csv_to_json
+    if script_label == ALL_REPORTS_LABEL:
+        from txedge_reports import convert_reports
+
+        return convert_reports
+    if script_label == SQLITE_LABEL:
+        from txedge_to_sqlite import convert_txedge_to_sqlite
+
+        return convert_txedge_to_sqlite
+    raise ValueError(f"Unknown script: {script_label}")
+
+
+def convert_file(
+    project_root: str,
+    env_folder: str,
+    script_label: str,
+    input_filename: str,
+    convert_func: Optional[Callable[..., None]] = None,
+    stats: Optional[ConversionStats] = None,
+    compression: Optional[str] = None,
+) -> str:
+    """Convert one file of an environment; returns the output path.
+
+    For "All reports" every report is written to its usual folder and the
+    environment folder is returned. ``stats`` is filled in by the converter.
+    ``compression`` compresses the outputs (see output_path_for).
+    Raises on conversion errors.
+    """
+    if convert_func is None:
+        convert_func = load_converter(script_label)
+    input_abs_path = os.path.join(input_dir(project_root, env_folder, script_label), input_filename)
+    if script_label == ALL_REPORTS_LABEL:
+        # Parse once, write every report to its usual location
+        output_paths = {
+            report: make_output_path(project_root, env_folder, label, input_filename, compression)
+            for label, report in REPORT_LABEL_TO_NAME.items()
+        }
+        convert_func(input_abs_path, output_paths, stats=stats)
+    else:
+        output_path = make_output_path(project_root, env_folder, script_label, input_filename, compression)
+        convert_func(input_abs_path, output_path, stats=stats)
+    return convert_output_path(project_root, env_folder, script_label, input_filename, compression)
+
+
+def convert_output_path(
+    project_root: str, env_folder: str, script_label: str, input_filename: str, compression: Optional[str] = None
+) -> str:
+    """Path reported for a conversion: the output file, or the environment folder for "All reports"."""
+    if script_label == ALL_REPORTS_LABEL:
+        return os.path.join(project_root, env_folder)
+    return output_path_for(project_root, env_folder, script_label, input_filename, compression)
+
+
+def convert_worker(
+    project_root: str,
+    env_folder: str,
+    script_label: str,
+    input_filename: str,
+    convert_func: Optional[Callable[..., None]] = None,
+    fingerprint_inputs: bool = False,
+    compression: Optional[str] = None,
+) -> BatchResult:
+    """Convert one input file, timing it and (when asked) fingerprinting its inputs first.
+
+    Runs in pool processes: errors come back in the result so every file gets one.
+    """
+    try:
+        fingerprints = None
+        if fingerprint_inputs:
+            # Taken before converting so a file replaced mid-run is rebuilt next time
+            fingerprints = {
+                p: fingerprint(p) for p in input_paths_for(project_root, env_folder, script_label, input_filename)
+            }
+        stats = ConversionStats()
+        profile_dir = os.environ.get(CPROFILE_DIR_ENV)
+        start = time.perf_counter()
+        with cprofile_to(os.path.join(profile_dir, f"{input_filename}.prof") if profile_dir else None):
+            output_path = convert_file(
+                project_root, env_folder, script_label, input_filename, convert_func, stats, compression
+            )
+        seconds = time.perf_counter() - start
+    except Exception as exc:
+        return BatchResult(input_filename, error=str(exc))
+    return BatchResult(input_filename, output_path=output_path, fingerprints=fingerprints, seconds=seconds, stats=stats)
+
+
+def run_batch(
+    project_root: str,
+    env_folder: str,
+    script_label: str,
+    files: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    on_result: Optional[Callable[[BatchResult, int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    convert_func: Optional[Callable[..., None]] = None,
+    force: bool = False,
+    compression: Optional[str] = None,
+) -> List[BatchResult]:
+    """Convert many files of one environment, in parallel processes.
+
+    - Files whose outputs the environment manifest shows as up to date are not
+      converted again (``skipped`` results) unless ``force`` is set.
+    - ``on_result(result, completed, total)`` is called as each file finishes
+      (completion order), from the calling thread.
+    - Setting ``cancel_event`` stops scheduling: queued files are dropped, files
+      already being converted run to completion.
+    - With ``max_workers == 1`` files are converted in-process, one at a time;
+      only then is ``convert_func`` used instead of importing the converter.
+    - ``compression`` compresses the outputs (see output_path_for).
+
+    Returns the results of the files that ran, in input order.
+    """
+    if files is None:
+        files = list_inputs(project_root, env_folder, script_label)
+    total = len(files)
+    order = {name: idx for idx, name in enumerate(files)}
+    results: List[BatchResult] = []
+    manifest = Manifest.load(os.path.join(project_root, env_folder))
+
+    def record(result: BatchResult) -> None:
+        if result.ok and result.fingerprints is not None:
+            manifest.record(
+                script_label,
+                result.filename,
+                result.fingerprints,
+                output_paths_for(project_root, env_folder, script_label, result.filename, compression),
+            )
+        results.append(result)
+        if on_result is not None:
+            on_result(result, len(results), total)
+
+    try:
+        todo: List[str] = []
+        for fname in files:
+            if not force and outputs_current(manifest, project_root, env_folder, script_label, fname, compression):
+                output_path = convert_output_path(project_root, env_folder, script_label, fname, compression)
+                record(BatchResult(fname, output_path=output_path, skipped=True))
+            else:
+                todo.append(fname)
+
+        workers = max(1, min(max_workers or default_workers(), len(todo) or 1))
+        if workers == 1:
+            for fname in todo:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                record(convert_worker(project_root, env_folder, script_label, fname, convert_func, True, compression))
+        elif todo:
+            # Each worker reads its files once; a document cache configured here (GUI) stays in this process
+            with ProcessPoolExecutor(max_workers=workers, initializer=configure_document_cache, initargs=(0,)) as executor:
+                pending = {
+                    executor.submit(
+                        convert_worker, project_root, env_folder, script_label, fname, None, True, compression
+                    ): fname
+                    for fname in todo
+                }
+                try:
+                    while pending:
+                        # Poll so cancellation is noticed while long files are still running
+                        done, _ = wait(list(pending), timeout=0.2, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            record(future_result(future, pending.pop(future)))
+                        if cancel_event is not None and cancel_event.is_set():
+                            for future in list(pending):
+                                if future.cancel():
+                                    del pending[future]
+                except KeyboardInterrupt:
+                    for future in pending:
+                        future.cancel()
+                    raise
+    finally:
+        try:
+            manifest.save()
+        except OSError:
+            # Read-only environment folder: conversions still count, just not incrementally
+            pass
+
+    results.sort(key=lambda r: order.get(r.filename, total))
+    return results
+
+
+def future_result(future: "Future[Any]", fname: str) -> BatchResult:
+    """The ``BatchResult`` of a ``convert_worker`` future, or an error result if the worker failed."""
+    try:
+        return future.result()
+    except Exception as exc:
+        # e.g. a worker process died (BrokenProcessPool)
+        return BatchResult(fname, error=str(exc) or exc.__class__.__name__)
+
+
+def throughput_summary(results: List[BatchResult], elapsed: float, slowest: int = 3) -> str:
+    """One-line throughput of a batch (files/s, rows/s) plus its slowest files."""
+    converted = [r for r in results if r.ok and not r.skipped]
+    if not converted or elapsed <= 0:
+        return ""
+    rows = sum(r.stats.rows_read + r.stats.rows_written for r in converted if r.stats is not None)
+    summary = f"{len(converted)} file(s) in {elapsed:.1f}s: {len(converted) / elapsed:.2f} files/s, {rows / elapsed:,.0f} rows/s"
+    ranked = sorted(converted, key=lambda r: r.seconds, reverse=True)[:slowest]
+    if len(converted) > 1:
+        summary += "; slowest: " + ", ".join(f"{r.filename} ({r.seconds:.1f}s)" for r in ranked)
+    return summary
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert every file of a TechEx environment folder without the GUI")
+    parser.add_argument("--env", required=True, choices=ENV_FOLDERS, help="Environment folder")
+    parser.add_argument(
+        "--script", required=True, choices=sorted(SCRIPT_NAME_TO_LABEL), help="Conversion to run ('all' writes every CSV report)"
+    )
+    parser.add_argument("--root", default=DEFAULT_PROJECT_ROOT, help="Folder containing TDP/D2C/FTS (default: repository root)")
+    parser.add_argument("--workers", type=int, default=default_workers(), help="Number of worker processes (1 = in-process)")
+    parser.add_argument("--force", action="store_true", help="Rebuild every file, even if its outputs are up to date")
+    parser.add_argument(
+        "--compress", choices=COMPRESSIONS, help="Write compressed outputs (e.g. example.csv.gz); inputs are detected by extension"
+    )
+    parser.add_argument("files", nargs="*", help="Only convert these file names (default: all in the environment)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    script_label = SCRIPT_NAME_TO_LABEL[args.script]
+    root = os.path.abspath(args.root)
+    files = args.files or list_inputs(root, args.env, script_label)
+    if not files:
+        print(f"Error: no input files found in {input_dir(root, args.env, script_label)}", file=sys.stderr)
+        return 1
+
+    def on_result(result: BatchResult, completed: int, total: int) -> None:
+        if result.skipped:
+            print(f"[{completed}/{total}] {result.filename}: up to date")
+        elif result.ok:
+            print(f"[{completed}/{total}] {result.filename} -> {result.output_path}")
+        else:
+            print(f"[{completed}/{total}] {result.filename}: FAILED: {result.error}", file=sys.stderr)
+
+    start = time.perf_counter()
+    try:
+        results = run_batch(
+            root,
+            args.env,
+            script_label,
+            files,
+            max_workers=args.workers,
+            on_result=on_result,
+            force=args.force,
+            compression=args.compress,
+        )
+    except KeyboardInterrupt:
+        print("Cancelled.", file=sys.stderr)
+        return 130
+    failures = sum(1 for r in results if not r.ok)
+    skipped = sum(1 for r in results if r.skipped)
+    print(f"{len(results) - failures - skipped} converted, {skipped} up to date, {failures} failed")
+    summary = throughput_summary(results, time.perf_counter() - start)
+    if summary:
+        print(summary)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
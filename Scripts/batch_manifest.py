@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Per-environment manifest used by incremental batch runs.
+
+``<env>/.txedge-manifest.json`` records, for every script and input file, the
+inputs' size/mtime/content hash, the converter version and the outputs that
+were written. A later batch run can then skip files whose outputs are current.
+"""
+import hashlib
+import io
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from txedge_io import atomic_open, file_sha256
+
+MANIFEST_NAME = ".txedge-manifest.json"
+MANIFEST_FORMAT = 1
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Modules whose code shapes conversion output. Runners, timing and caching
+# (batch, the GUI, txedge_stats, txedge_doc_cache...) are left out so editing
+# them does not mark every output stale; add new converter modules here.
+CONVERTER_MODULES = [
+    "CSV_to_JSON.py",
+    "txedge_grouping.py",
+    "txedge_io.py",
+    "txedge_parallel.py",
+    "txedge_partition.py",
+    "txedge_patch.py",
+    "txedge_records.py",
+    "txedge_report_spec.py",
+    "txedge_reports.py",
+    "txedge_stream_parser.py",
+    "txedge_to_csv.py",
+    "txedge_to_csv_streams_sources.py",
+    "txedge_to_csv_with_id.py",
+    "txedge_to_sqlite.py",
+]
+
+_converter_version: Optional[str] = None
+
+
+def converter_version() -> str:
+    """Hash of the converter sources (CONVERTER_MODULES); any change to them invalidates old outputs."""
+    global _converter_version
+    if _converter_version is not None:
+        return _converter_version
+    digest = hashlib.sha256()
+    found = False
+    candidates = [SCRIPTS_DIR]
+    base_dir = getattr(sys, "_MEIPASS", None)
+    if base_dir:
+        candidates.append(os.path.join(base_dir, "Scripts"))
+    for scripts_dir in candidates:
+        names = [name for name in CONVERTER_MODULES if os.path.isfile(os.path.join(scripts_dir, name))]
+        for name in names:
+            with io.open(os.path.join(scripts_dir, name), "rb") as f:
+                digest.update(name.encode("utf-8"))
+                digest.update(f.read())
+            found = True
+        if found:
+            break
+    if not found:
+        # Frozen build without bundled sources: tie the version to the executable
+        try:
+            st = os.stat(sys.executable)
+            digest.update(f"{st.st_size}:{st.st_mtime_ns}".encode("ascii"))
+        except OSError:
+            pass
+    _converter_version = digest.hexdigest()[:16]
+    return _converter_version
+
+
+def fingerprint(path: str) -> Dict[str, Any]:
+    """Size, mtime and content hash of one input file."""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": file_sha256(path)}
+
+
+class Manifest:
+    """Manifest of one environment folder; paths are stored relative to it."""
+
+    def __init__(self, env_dir: str, entries: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        self.env_dir = env_dir
+        self.path = os.path.join(env_dir, MANIFEST_NAME)
+        self.entries: Dict[str, Dict[str, Any]] = entries or {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, env_dir: str) -> "Manifest":
+        """Read the manifest; a missing or unreadable one starts empty."""
+        try:
+            with io.open(os.path.join(env_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(env_dir)
+        if not isinstance(data, dict) or data.get("format") != MANIFEST_FORMAT:
+            return cls(env_dir)
+        entries = data.get("entries")
+        return cls(env_dir, entries if isinstance(entries, dict) else {})
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), self.env_dir).replace(os.sep, "/")
+
+    def is_up_to_date(self, script: str, filename: str, input_paths: List[str], output_paths: List[str]) -> bool:
+        """True when the recorded run used the same inputs and converter and its outputs still exist.
+
+        Inputs are compared by size/mtime first; only when those changed is the
+        content hash recomputed (e.g. a file copied back in unchanged).
+        """
+        entry = self.entries.get(script, {}).get(filename)
+        if not isinstance(entry, dict) or entry.get("converter_version") != converter_version():
+            return False
+        if sorted(entry.get("outputs") or []) != sorted(self._rel(p) for p in output_paths):
+            return False
+        if not all(os.path.exists(p) for p in output_paths):
+            return False
+        recorded_inputs = entry.get("inputs") or {}
+        if sorted(recorded_inputs) != sorted(self._rel(p) for p in input_paths):
+            return False
+        for path in input_paths:
+            recorded = recorded_inputs[self._rel(path)]
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False
+            if st.st_size == recorded.get("size") and st.st_mtime_ns == recorded.get("mtime_ns"):
+                continue
+            if st.st_size != recorded.get("size") or file_sha256(path) != recorded.get("sha256"):
+                return False
+            # Same content with a new mtime: remember it so the next check is cheap
+            recorded["mtime_ns"] = st.st_mtime_ns
+            self._dirty = True
+        return True
+
+    def recorded_sha256(self, script: str, filename: str, input_path: str) -> Optional[str]:
+        """Content hash stored for one input of the recorded run, if any."""
+        entry = self.entries.get(script, {}).get(filename)
+        if not isinstance(entry, dict):
+            return None
+        recorded = (entry.get("inputs") or {}).get(self._rel(input_path))
+        return recorded.get("sha256") if isinstance(recorded, dict) else None
+
+    def record(
+        self,
+        script: str,
+        filename: str,
+        input_fingerprints: Dict[str, Dict[str, Any]],
+        output_paths: List[str],
+    ) -> None:
+        """Store a successful conversion; ``input_fingerprints`` maps input path -> fingerprint."""
+        self.entries.setdefault(script, {})[filename] = {
+            "inputs": {self._rel(p): fp for p, fp in input_fingerprints.items()},
+            "converter_version": converter_version(),
+            "outputs": sorted(self._rel(p) for p in output_paths),
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest atomically if anything changed."""
+        if not self._dirty:
+            return
+        with atomic_open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"format": MANIFEST_FORMAT, "entries": self.entries}, f, indent=2, sort_keys=True)
+        self._dirty = False
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""Watch mode: convert exports as they are dropped into environment folders.
+
+  python -m Scripts.batch_watch --env TDP --env D2C --script all --workers 2
+
+The folders are polled, so no extra dependency is needed and network shares
+work. A file is converted once its size and mtime have stayed the same for
+``--settle`` seconds, so an export that is still being copied is left alone.
+Whether a file needs converting is decided by the environment manifest, as in
+a batch run: files already converted are skipped, edited ones are rebuilt.
+
+At most ``--workers`` files convert at once and at most ``--queue`` more wait
+for a worker. Further files stay pending and are picked up by a later poll,
+so a burst of drops never queues unbounded work.
+"""
+import argparse
+import collections
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+# Converters import each other as flat sibling modules
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.append(SCRIPTS_DIR)
+
+from batch import (  # noqa: E402
+    SCRIPT_NAME_TO_LABEL,
+    BatchResult,
+    convert_worker,
+    default_workers,
+    future_result,
+    input_dir,
+    list_inputs,
+    output_paths_for,
+    outputs_current,
+)
+from batch_manifest import MANIFEST_NAME, Manifest  # noqa: E402
+from txedge_doc_cache import configure_document_cache  # noqa: E402
+from txedge_env import DEFAULT_PROJECT_ROOT, ENV_FOLDERS  # noqa: E402
+
+DEFAULT_INTERVAL = 2.0
+DEFAULT_SETTLE = 2.0
+
+# (environment folder, input file name)
+_Key = Tuple[str, str]
+# (size, mtime_ns) of an input file
+_Signature = Tuple[int, int]
+
+
+class _Seen:
+    """What the watcher knows about one input file."""
+
+    def __init__(self, signature: _Signature, since: float) -> None:
+        self.signature = signature
+        # Monotonic time the file was first seen with this signature
+        self.since = since
+        # Converted (or found up to date, or failed) at this signature
+        self.handled = False
+
+
+class Watcher:
+    """Polls environment folders and converts new or changed inputs of one script.
+
+    ``on_result(env_folder, result)`` is called from the thread running
+    ``run`` as each conversion finishes.
+    """
+
+    def __init__(
+        self,
+        project_root: str,
+        env_folders: List[str],
+        script_label: str,
+        max_workers: Optional[int] = None,
+        interval: float = DEFAULT_INTERVAL,
+        settle: float = DEFAULT_SETTLE,
+        max_queue: Optional[int] = None,
+        on_result: Optional[Callable[[str, BatchResult], None]] = None,
+    ) -> None:
+        self.project_root = project_root
+        self.env_folders = list(env_folders)
+        self.script_label = script_label
+        self.max_workers = max(1, max_workers or default_workers())
+        self.interval = interval
+        self.settle = settle
+        self.max_queue = max_queue if max_queue is not None else self.max_workers * 4
+        self.on_result = on_result
+        self._seen: Dict[_Key, _Seen] = {}
+        self._queue: Deque[Tuple[_Key, _Signature]] = collections.deque()
+        self._busy: Set[_Key] = set()
+        self._running: Dict["Future[Any]", Tuple[_Key, _Signature]] = {}
+        # env folder -> (manifest, manifest mtime_ns when loaded/saved)
+        self._manifests: Dict[str, Tuple[Manifest, Optional[int]]] = {}
+
+    def _manifest(self, env_folder: str) -> Manifest:
+        """The environment's manifest, reloaded when another process has rewritten it."""
+        env_dir = os.path.join(self.project_root, env_folder)
+        mtime = _mtime_ns(os.path.join(env_dir, MANIFEST_NAME))
+        cached = self._manifests.get(env_folder)
+        if cached is not None and cached[1] == mtime:
+            return cached[0]
+        manifest = Manifest.load(env_dir)
+        self._manifests[env_folder] = (manifest, mtime)
+        return manifest
+
+    def _save_manifest(self, env_folder: str, manifest: Manifest) -> None:
+        try:
+            manifest.save()
+        except OSError:
+            # Read-only environment folder: conversions still count, just not incrementally
+            return
+        self._manifests[env_folder] = (manifest, _mtime_ns(manifest.path))
+
+    def poll(self) -> None:
+        """Scan the folders once and queue inputs that have settled and are not up to date."""
+        now = time.monotonic()
+        present: Set[_Key] = set()
+        for env_folder in self.env_folders:
+            folder = input_dir(self.project_root, env_folder, self.script_label)
+            for fname in list_inputs(self.project_root, env_folder, self.script_label):
+                key = (env_folder, fname)
+                try:
+                    st = os.stat(os.path.join(folder, fname))
+                except OSError:
+                    continue
+                present.add(key)
+                signature = (st.st_size, st.st_mtime_ns)
+                seen = self._seen.get(key)
+                if seen is None or seen.signature != signature:
+                    # New or still being written: wait for it to settle
+                    self._seen[key] = _Seen(signature, now)
+                    continue
+                if seen.handled or key in self._busy or now - seen.since < self.settle:
+                    continue
+                manifest = self._manifest(env_folder)
+                if outputs_current(manifest, self.project_root, env_folder, self.script_label, fname):
+                    seen.handled = True
+                    continue
+                if len(self._queue) >= self.max_queue:
+                    # Queue full: left pending, queued by a later poll
+                    continue
+                self._queue.append((key, signature))
+                self._busy.add(key)
+        for key in list(self._seen):
+            if key not in present:
+                del self._seen[key]
+
+    def _dispatch(self, executor: ProcessPoolExecutor) -> None:
+        while self._queue and len(self._running) < self.max_workers:
+            (env_folder, fname), signature = self._queue.popleft()
+            future = executor.submit(
+                convert_worker, self.project_root, env_folder, self.script_label, fname, None, True
+            )
+            self._running[future] = ((env_folder, fname), signature)
+
+    def _collect(self, done: Set["Future[Any]"]) -> None:
+        for future in done:
+            key, signature = self._running.pop(future)
+            env_folder, fname = key
+            result = future_result(future, fname)
+            self._busy.discard(key)
+            seen = self._seen.get(key)
+            if seen is not None and seen.signature == signature:
+                # Failures are not retried until the file changes again
+                seen.handled = True
+            if result.ok and result.fingerprints is not None:
+                manifest = self._manifest(env_folder)
+                manifest.record(
+                    self.script_label,
+                    fname,
+                    result.fingerprints,
+                    output_paths_for(self.project_root, env_folder, self.script_label, fname),
+                )
+                self._save_manifest(env_folder, manifest)
+            if self.on_result is not None:
+                self.on_result(env_folder, result)
+
+    def run(self, stop_event: Optional[threading.Event] = None) -> None:
+        """Poll and convert until ``stop_event`` is set; conversions in progress then finish."""
+        stop_event = stop_event or threading.Event()
+        # Workers convert each changed file once; keep no parsed documents in them
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=configure_document_cache, initargs=(0,)
+        ) as executor:
+            try:
+                next_poll = time.monotonic()
+                while not stop_event.is_set():
+                    now = time.monotonic()
+                    if now >= next_poll:
+                        self.poll()
+                        next_poll = now + self.interval
+                    self._dispatch(executor)
+                    timeout = max(0.0, min(next_poll - time.monotonic(), 0.5))
+                    if self._running:
+                        done, _ = wait(list(self._running), timeout=timeout, return_when=FIRST_COMPLETED)
+                        self._collect(done)
+                    else:
+                        stop_event.wait(timeout)
+                self._queue.clear()
+                if self._running:
+                    done, _ = wait(list(self._running))
+                    self._collect(done)
+            except KeyboardInterrupt:
+                for future in self._running:
+                    future.cancel()
+                raise
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert new or changed files of TechEx environment folders as they appear")
+    parser.add_argument(
+        "--env", action="append", choices=ENV_FOLDERS, help="Environment folder to watch (repeatable; default: all)"
+    )
+    parser.add_argument(
+        "--script", required=True, choices=sorted(SCRIPT_NAME_TO_LABEL), help="Conversion to run ('all' writes every CSV report)"
+    )
+    parser.add_argument("--root", default=DEFAULT_PROJECT_ROOT, help="Folder containing TDP/D2C/FTS (default: repository root)")
+    parser.add_argument("--workers", type=int, default=default_workers(), help="Number of worker processes")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="Seconds between folder scans")
+    parser.add_argument(
+        "--settle", type=float, default=DEFAULT_SETTLE, help="Seconds a file must stay unchanged before it is converted"
+    )
+    parser.add_argument("--queue", type=int, help="Files allowed to wait for a worker (default: 4 per worker)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    envs = args.env or ENV_FOLDERS
+    script_label = SCRIPT_NAME_TO_LABEL[args.script]
+    root = os.path.abspath(args.root)
+
+    def on_result(env_folder: str, result: BatchResult) -> None:
+        stamp = time.strftime("%H:%M:%S")
+        if result.ok:
+            print(f"{stamp} {env_folder}/{result.filename} -> {result.output_path} ({result.seconds:.1f}s)", flush=True)
+        else:
+            print(f"{stamp} {env_folder}/{result.filename}: FAILED: {result.error}", file=sys.stderr, flush=True)
+
+    watcher = Watcher(
+        root,
+        envs,
+        script_label,
+        max_workers=args.workers,
+        interval=args.interval,
+        settle=args.settle,
+        max_queue=args.queue,
+        on_result=on_result,
+    )
+    print(f"Watching {', '.join(envs)} under {root} for '{script_label}' (Ctrl+C to stop)", flush=True)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("Stopped.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Port/address conflicts across every export of an environment.
+
+  python -m Scripts.txedge_conflicts --env TDP
+  python3 Scripts/txedge_conflicts.py -i TDP/a-config.json TDP/b-config.json -o conflicts.csv
+
+Every export is read once. Its sources and outputs go through the same field
+extraction as the Input/Output report, and three hash indexes are filled:
+
+- ``interface-port``: (networkInterface/hostAddress, port) used by more than one object
+- ``address``: sourceAddress/address used by more than one object (e.g. a multicast group)
+- ``stream-name``: stream name used by more than one configured stream
+
+Only keys seen more than once are written: one CSV row per occurrence, grouped
+by conflict and key, in the order the keys were first seen (files in name order).
+"""
+import argparse
+import csv
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.append(SCRIPTS_DIR)
+
+from txedge_doc_cache import load_cached_json  # noqa: E402
+from txedge_env import DEFAULT_PROJECT_ROOT, ENV_FOLDERS  # noqa: E402
+from txedge_grouping import group_by_stream  # noqa: E402
+from txedge_io import atomic_open, has_extension  # noqa: E402
+from txedge_report_spec import iter_report_rows, to_str  # noqa: E402
+from txedge_stream_parser import load_sections  # noqa: E402
+from txedge_to_csv import INPUT_OUTPUT_REPORT  # noqa: E402
+
+CONFLICT_INTERFACE_PORT = "interface-port"
+CONFLICT_ADDRESS = "address"
+CONFLICT_STREAM_NAME = "stream-name"
+CONFLICTS: List[str] = [CONFLICT_INTERFACE_PORT, CONFLICT_ADDRESS, CONFLICT_STREAM_NAME]
+
+# Input/Output report columns an occurrence is described by
+_REPORT_COLUMNS = [
+    "streamName",
+    "Input/Output",
+    "name",
+    "protocol",
+    "port",
+    "networkInterface/hostAddress",
+    "sourceAddress/address",
+]
+HEADERS: List[str] = ["conflict", "key", "count", "exportFile"] + _REPORT_COLUMNS
+
+_COL = {name: INPUT_OUTPUT_REPORT.headers.index(name) for name in _REPORT_COLUMNS}
+
+
+class ConflictIndex:
+    """Hash indexes of the keys that may collide, filled one export at a time."""
+
+    def __init__(self) -> None:
+        # conflict -> key -> occurrences (export file name, report cells); dicts keep first-seen order
+        self.indexes: Dict[str, Dict[Tuple[str, ...], List[Tuple[str, List[str]]]]] = {c: {} for c in CONFLICTS}
+        self.files_scanned = 0
+        self.failures: List[Tuple[str, str]] = []
+
+    def _add(self, conflict: str, key: Tuple[str, ...], export_file: str, cells: List[str]) -> None:
+        occurrences = self.indexes[conflict].get(key)
+        if occurrences is None:
+            self.indexes[conflict][key] = [(export_file, cells)]
+        else:
+            occurrences.append((export_file, cells))
+
+    def add_export(self, export_file: str, data: Dict[str, Any]) -> None:
+        """Index the streams, sources and outputs of one parsed export."""
+        streams = data.get("configuredStreams") or []
+        sources = data.get("configuredSources") or []
+        outputs = data.get("configuredOutputs") or []
+        if not isinstance(streams, list) or not isinstance(sources, list) or not isinstance(outputs, list):
+            raise ValueError("Input JSON must contain lists: configuredStreams, configuredSources, configuredOutputs")
+        grouping = group_by_stream(streams, sources, outputs)
+        port_col = _COL["port"]
+        iface_col = _COL["networkInterface/hostAddress"]
+        address_col = _COL["sourceAddress/address"]
+        for row in iter_report_rows(INPUT_OUTPUT_REPORT, grouping):
+            cells = [row[_COL[name]] for name in _REPORT_COLUMNS]
+            if row[port_col]:
+                self._add(CONFLICT_INTERFACE_PORT, (row[iface_col], row[port_col]), export_file, cells)
+            if row[address_col]:
+                self._add(CONFLICT_ADDRESS, (row[address_col],), export_file, cells)
+        blanks = [""] * (len(_REPORT_COLUMNS) - 1)
+        for stream in grouping.streams:
+            name = to_str(stream.get("name"))
+            if name:
+                self._add(CONFLICT_STREAM_NAME, (name,), export_file, [name] + blanks)
+        self.files_scanned += 1
+
+    def add_file(self, path: str, encoding: str = "utf-8", streaming: bool = False) -> None:
+        if streaming:
+            data = load_sections(path, encoding=encoding)
+        else:
+            data = load_cached_json(path, encoding=encoding)
+        if not isinstance(data, dict):
+            raise ValueError("Input JSON must be an object")
+        self.add_export(os.path.basename(path), data)
+
+    def conflicts(self) -> List[Tuple[str, Tuple[str, ...], List[Tuple[str, List[str]]]]]:
+        """(conflict, key, occurrences) for every key seen more than once."""
+        return [
+            (conflict, key, occurrences)
+            for conflict in CONFLICTS
+            for key, occurrences in self.indexes[conflict].items()
+            if len(occurrences) > 1
+        ]
+
+    def write_csv(self, output_path: str, delimiter: str = ",", encoding: str = "utf-8") -> int:
+        """Write the conflicts; returns the number of conflicting keys."""
+        found = self.conflicts()
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        with atomic_open(output_path, "w", encoding=encoding, newline="") as csvfile:
+            writer = csv.writer(csvfile, delimiter=delimiter)
+            writer.writerow(HEADERS)
+            for conflict, key, occurrences in found:
+                key_text = ":".join(key)
+                count = str(len(occurrences))
+                writer.writerows([conflict, key_text, count, export_file] + cells for export_file, cells in occurrences)
+        return len(found)
+
+
+def find_conflicts(
+    input_paths: List[str],
+    output_path: str,
+    delimiter: str = ",",
+    encoding: str = "utf-8",
+    streaming: bool = False,
+) -> ConflictIndex:
+    """Index every export and write the conflicts CSV.
+
+    An export that cannot be read is recorded in ``failures`` and left out.
+    """
+    index = ConflictIndex()
+    for path in input_paths:
+        try:
+            index.add_file(path, encoding=encoding, streaming=streaming)
+        except Exception as exc:
+            index.failures.append((path, str(exc)))
+    index.write_csv(output_path, delimiter=delimiter, encoding=encoding)
+    return index
+
+
+def environment_exports(project_root: str, env_folder: str) -> List[str]:
+    env_dir = os.path.join(project_root, env_folder)
+    try:
+        names = sorted(f for f in os.listdir(env_dir) if has_extension(f, ".json") and not f.startswith("."))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(env_dir, f) for f in names]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Report port/address and stream name conflicts across txEdge exports")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--env", choices=ENV_FOLDERS, help="Scan every JSON export of this environment folder")
+    source.add_argument("-i", "--input", nargs="+", help="Scan these txEdge JSON files")
+    parser.add_argument("--root", default=DEFAULT_PROJECT_ROOT, help="Folder containing TDP/D2C/FTS (default: repository root)")
+    parser.add_argument("-o", "--output", help="Conflicts CSV (default: <env>/<env>-conflicts.csv with --env)")
+    parser.add_argument("--delimiter", default=",", help="CSV delimiter")
+    parser.add_argument("--encoding", default="utf-8", help="File encoding")
+    parser.add_argument("--stream", action="store_true", help="Parse the inputs incrementally to bound memory on large exports")
+    args = parser.parse_args()
+    if args.input and not args.output:
+        parser.error("-o/--output is required with -i/--input")
+    return args
+
+
+def main() -> int:
+    args = parse_args()
+    if args.env:
+        root = os.path.abspath(args.root)
+        input_paths = environment_exports(root, args.env)
+        output_path = args.output or os.path.join(root, args.env, f"{args.env}-conflicts.csv")
+        if not input_paths:
+            print(f"Error: no JSON exports found in {os.path.join(root, args.env)}", file=sys.stderr)
+            return 1
+    else:
+        input_paths = args.input
+        output_path = args.output
+    try:
+        index = find_conflicts(
+            input_paths, output_path, delimiter=args.delimiter, encoding=args.encoding, streaming=args.stream
+        )
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    for path, error in index.failures:
+        print(f"Warning: skipped {path}: {error}", file=sys.stderr)
+    found = index.conflicts()
+    by_kind = {c: sum(1 for kind, _, _ in found if kind == c) for c in CONFLICTS}
+    print(
+        f"{index.files_scanned} export(s) scanned: "
+        + ", ".join(f"{by_kind[c]} {c}" for c in CONFLICTS)
+        + f" conflict(s) -> {output_path}"
+    )
+    return 1 if index.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Parsed exports kept in memory between conversions of one process.
+
+Running several reports on the same export, then converting its edited CSV
+back to JSON, parses the same ``-config.json`` each time. ``load_cached_json``
+returns the document parsed earlier while the file's (path, mtime, size) is
+unchanged, keeping the most recently used documents within a memory budget.
+
+The budget is 0 (cache off) unless ``configure_document_cache`` sets one: the
+GUI does, command-line runs and batch worker processes read every file once
+anyway. Cached documents are shared, so callers must not modify them
+(CSV_to_JSON copies only the objects it changes).
+"""
+import codecs
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from txedge_io import compression_for, load_json
+
+# Parsed size of a document relative to its file (measured 2-3x on indented exports)
+MEMORY_PER_FILE_BYTE = 4
+# Assumed expansion of a compressed export when estimating its parsed size
+COMPRESSED_RATIO = 8
+DEFAULT_CACHE_MB = 1024
+
+# (absolute path, encoding, mtime_ns, size)
+_CacheKey = Tuple[str, str, int, int]
+
+
+class DocumentCache:
+    """LRU cache of parsed JSON documents within ``max_bytes`` of estimated memory.
+
+    A document's cost is estimated from its file size; documents larger than
+    the whole budget are not kept. Safe to use from several threads.
+    """
+
+    def __init__(self, max_bytes: int = 0) -> None:
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[_CacheKey, Tuple[Any, int]]" = OrderedDict()
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, max_bytes: int) -> None:
+        """Set the budget, evicting documents that no longer fit; 0 turns the cache off."""
+        with self._lock:
+            self.max_bytes = max(0, max_bytes)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.used_bytes = 0
+
+    def load(self, path: str, encoding: str = "utf-8", backend: Optional[str] = None) -> Any:
+        """``load_json(path, encoding, backend)``, reusing an earlier parse of the unchanged file."""
+        if self.max_bytes <= 0:
+            return load_json(path, encoding=encoding, backend=backend)
+        st = os.stat(path)
+        # The backends give equal documents, so a parse by either one serves both
+        key = (os.path.abspath(path), codecs.lookup(encoding).name, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        data = load_json(path, encoding=encoding, backend=backend)
+        cost = st.st_size * MEMORY_PER_FILE_BYTE * (COMPRESSED_RATIO if compression_for(path) else 1)
+        with self._lock:
+            if cost <= self.max_bytes and key not in self._entries:
+                # Older parses of a file that has since changed can never hit again
+                for stale in [k for k in self._entries if k[0] == key[0]]:
+                    self.used_bytes -= self._entries.pop(stale)[1]
+                self._entries[key] = (data, cost)
+                self.used_bytes += cost
+                self._evict()
+        return data
+
+    def summary(self) -> str:
+        """e.g. ``cache: 3 hits, 1 miss``."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return f"cache: {hits} hit{'' if hits == 1 else 's'}, {misses} miss{'' if misses == 1 else 'es'}"
+
+    def _evict(self) -> None:
+        while self._entries and self.used_bytes > self.max_bytes:
+            _, (_, cost) = self._entries.popitem(last=False)
+            self.used_bytes -= cost
+
+
+DOCUMENT_CACHE = DocumentCache()
+
+
+def configure_document_cache(max_bytes: int) -> None:
+    """Set the process-wide cache budget (0 turns it off); also used as a pool initializer."""
+    DOCUMENT_CACHE.configure(max_bytes)
+
+
+def load_cached_json(path: str, encoding: str = "utf-8", backend: Optional[str] = None) -> Any:
+    """Parse ``path`` through the process-wide cache; see ``DocumentCache.load``."""
+    return DOCUMENT_CACHE.load(path, encoding=encoding, backend=backend)
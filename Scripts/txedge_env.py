@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""Environment folders shared by the batch tools and the GUI.
+
+Each environment (TDP/D2C/FTS) is a folder of the project root holding its
+JSON exports, with the editable CSVs and converter outputs in subfolders.
+"""
+import os
+from typing import List
+
+# Folder containing TDP/D2C/FTS when running from a checkout: the parent of Scripts
+DEFAULT_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_FOLDERS: List[str] = ["TDP", "D2C", "FTS"]
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Set, TextIO, Tuple
+
+
+class StreamGrouping:
+    """configuredSources/configuredOutputs bucketed by their ``stream`` id.
+
+    Built in a single pass over each collection so converters can look up the
+    children of a stream in O(1) instead of rescanning every source/output per
+    stream. Original order is preserved inside every bucket.
+    """
+
+    def __init__(self) -> None:
+        self.streams: List[Dict[str, Any]] = []
+        self.sources_by_stream: Dict[Any, List[Dict[str, Any]]] = {}
+        self.outputs_by_stream: Dict[Any, List[Dict[str, Any]]] = {}
+        self.orphan_sources: List[Dict[str, Any]] = []
+        self.orphan_outputs: List[Dict[str, Any]] = []
+        # Non-dict entries dropped from the three collections
+        self.invalid_items = 0
+
+    def sources_for(self, stream: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return _children(self.sources_by_stream, stream.get("id"))
+
+    def outputs_for(self, stream: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return _children(self.outputs_by_stream, stream.get("id"))
+
+    def subset(self, streams: List[Dict[str, Any]]) -> Optional["StreamGrouping"]:
+        """A grouping of ``streams`` (taken from this one) holding only their source/output buckets.
+
+        Orphans are left out. None when a stream id is unhashable: such children
+        share one bucket, matched by equality, that cannot be split.
+        """
+        subset = StreamGrouping()
+        subset.streams = streams
+        for stream in streams:
+            key = _stream_key(stream.get("id"))
+            if key is _UNHASHABLE:
+                return None
+            sources = self.sources_by_stream.get(key)
+            if sources is not None:
+                subset.sources_by_stream[key] = sources
+            outputs = self.outputs_by_stream.get(key)
+            if outputs is not None:
+                subset.outputs_by_stream[key] = outputs
+        return subset
+
+    @property
+    def skipped_count(self) -> int:
+        """Objects that end up in no report row: orphans and non-dict entries."""
+        return len(self.orphan_sources) + len(self.orphan_outputs) + self.invalid_items
+
+
+def _stream_key(value: Any) -> Any:
+    # Unhashable ids (lists/dicts) cannot be bucketed; they all share the bucket
+    # of this sentinel and are matched by equality (see _children).
+    try:
+        hash(value)
+    except TypeError:
+        return _UNHASHABLE
+    return value
+
+
+_UNHASHABLE = object()
+
+
+def _children(buckets: Dict[Any, List[Dict[str, Any]]], stream_id: Any) -> List[Dict[str, Any]]:
+    key = _stream_key(stream_id)
+    if key is _UNHASHABLE:
+        # Linear fallback over the shared bucket of unhashable references
+        return [item for item in buckets.get(_UNHASHABLE, []) if item.get("stream") == stream_id]
+    return buckets.get(key, [])
+
+
+def _orphans(
+    buckets: Dict[Any, List[Dict[str, Any]]], known_ids: Set[Any], unhashable_ids: List[Any]
+) -> List[Dict[str, Any]]:
+    orphans: List[Dict[str, Any]] = []
+    for key, items in buckets.items():
+        if key is _UNHASHABLE:
+            # ``in`` on a list compares by equality, as _children does
+            orphans.extend(item for item in items if item.get("stream") not in unhashable_ids)
+        elif key not in known_ids:
+            orphans.extend(items)
+    return orphans
+
+
+def _bucket(items: Iterable[Any], object_types: Tuple[type, ...] = (dict,)) -> Dict[Any, List[Dict[str, Any]]]:
+    buckets: Dict[Any, List[Dict[str, Any]]] = {}
+    for item in items:
+        if not isinstance(item, object_types):
+            continue
+        key = _stream_key(item.get("stream"))
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = [item]
+        else:
+            bucket.append(item)
+    return buckets
+
+
+def group_by_stream(
+    streams: List[Any],
+    sources: Optional[List[Any]] = None,
+    outputs: Optional[List[Any]] = None,
+    object_types: Tuple[type, ...] = (dict,),
+) -> StreamGrouping:
+    """Group sources and outputs under their owning stream in one pass each.
+
+    - Entries that are not ``object_types`` (dicts, or txedge_records records)
+      are ignored, as the converters always did with non-dict entries.
+    - Sources/outputs whose ``stream`` matches no configured stream id are kept in
+      ``orphan_sources``/``orphan_outputs`` so callers can report them.
+    """
+    grouping = StreamGrouping()
+    grouping.streams = [s for s in streams if isinstance(s, object_types)]
+    grouping.sources_by_stream = _bucket(sources or [], object_types)
+    grouping.outputs_by_stream = _bucket(outputs or [], object_types)
+    grouping.invalid_items = (
+        len(streams)
+        - len(grouping.streams)
+        + sum(1 for item in sources or [] if not isinstance(item, object_types))
+        + sum(1 for item in outputs or [] if not isinstance(item, object_types))
+    )
+
+    known_ids: Set[Any] = set()
+    unhashable_ids: List[Any] = []
+    for stream in grouping.streams:
+        stream_id = stream.get("id")
+        key = _stream_key(stream_id)
+        if key is _UNHASHABLE:
+            unhashable_ids.append(stream_id)
+        else:
+            known_ids.add(key)
+    grouping.orphan_sources = _orphans(grouping.sources_by_stream, known_ids, unhashable_ids)
+    grouping.orphan_outputs = _orphans(grouping.outputs_by_stream, known_ids, unhashable_ids)
+    return grouping
+
+
+def report_orphans(grouping: StreamGrouping, input_path: str, stream: Optional[TextIO] = None) -> None:
+    """Write a warning listing sources/outputs that reference an unknown stream."""
+    if not grouping.orphan_sources and not grouping.orphan_outputs:
+        return
+    out = stream if stream is not None else sys.stderr
+    print(
+        f"Warning: {input_path}: {len(grouping.orphan_sources)} source(s) and "
+        f"{len(grouping.orphan_outputs)} output(s) reference no configured stream",
+        file=out,
+    )
+    for label, items in (("source", grouping.orphan_sources), ("output", grouping.orphan_outputs)):
+        for item in items:
+            print(f"  {label} {item.get('name')!r} (stream={item.get('stream')!r})", file=out)
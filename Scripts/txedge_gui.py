@@ -1,61 +1,252 @@
 #!/usr/bin/env python3
+import time
+
+# Reference point for --startup-trace, taken before anything heavier is imported
+_STARTUP_T0 = time.perf_counter()
+
+import argparse
+import importlib
+import io
 import os
 import sys
 import tkinter.font as tkfont
 import tkinter as tk
 from tkinter import ttk, messagebox
+import multiprocessing
 import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
-# Make sibling scripts importable and import conversion functions
+# Make sibling scripts importable; converters themselves are imported on first use
 SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
 if SCRIPTS_DIR not in sys.path:
     sys.path.append(SCRIPTS_DIR)
-try:
-    from txedge_to_csv import convert_txedge_to_csv  # type: ignore
-    from txedge_to_csv_streams_sources import convert_streams_sources  # type: ignore
-    from txedge_to_csv_with_id import convert_txedge_to_csv_with_id  # type: ignore
-    from CSV_to_JSON import convert_csv_to_json  # type: ignore
-except Exception:
-    # If running in an unusual environment (e.g., frozen onefile), load later with a fallback
-    convert_txedge_to_csv = None  # type: ignore
-    convert_streams_sources = None  # type: ignore
-    convert_txedge_to_csv_with_id = None  # type: ignore
-    convert_csv_to_json = None  # type: ignore
+
+
+def _add_bundled_scripts_dir() -> bool:
+    """In frozen onefile builds, make the bundled Scripts folder importable; False when not frozen."""
+    base_dir = getattr(sys, "_MEIPASS", None)
+    if not base_dir:
+        return False
+    # Converters import shared helpers (e.g. txedge_grouping) as sibling modules
+    bundled_scripts_dir = os.path.join(base_dir, "Scripts")
+    if bundled_scripts_dir in sys.path:
+        return False
+    sys.path.append(bundled_scripts_dir)
+    return True
+
+
+# Batch/watch support; a frozen or broken bundle missing these still opens the window
+SUPPORT_IMPORT_ERROR: Optional[str] = None
+for _attempt in range(2):
+    try:
+        from batch import ALL_REPORTS_LABEL, SCRIPT_LABELS, SQLITE_LABEL, BatchResult, convert_file, default_workers, load_converter, output_subfolder, run_batch, throughput_summary  # type: ignore  # noqa: E402
+        from batch_watch import Watcher  # type: ignore  # noqa: E402
+        from txedge_doc_cache import DEFAULT_CACHE_MB, DOCUMENT_CACHE, configure_document_cache  # type: ignore  # noqa: E402
+        from txedge_env import ENV_FOLDERS  # type: ignore  # noqa: E402
+        from txedge_io import has_extension  # type: ignore  # noqa: E402
+        SUPPORT_IMPORT_ERROR = None
+        break
+    except Exception as exc:
+        SUPPORT_IMPORT_ERROR = str(exc)
+        # Onefile builds: retry once from the bundled Scripts data folder
+        if _attempt or not _add_bundled_scripts_dir():
+            break
+        importlib.invalidate_caches()
+
+if SUPPORT_IMPORT_ERROR is not None:
+
+    def _unavailable(*args: object, **kwargs: object) -> None:
+        raise ImportError(f"Conversion support could not be loaded: {SUPPORT_IMPORT_ERROR}")
+
+    # Every script then reports the import error when run
+    ALL_REPORTS_LABEL = "All reports"
+    SQLITE_LABEL = "SQLite database"
+    SCRIPT_LABELS = [
+        "Stream Information",
+        "Input/Output",
+        "Create Editable CSV",
+        "Convert CSV to JSON",
+        ALL_REPORTS_LABEL,
+        SQLITE_LABEL,
+    ]
+    BatchResult = Watcher = convert_file = load_converter = run_batch = throughput_summary = _unavailable  # type: ignore
+    DEFAULT_CACHE_MB = 0
+    ENV_FOLDERS = ["TDP", "D2C", "FTS"]
+    DOCUMENT_CACHE = None  # type: ignore
+
+    def configure_document_cache(max_bytes: int) -> None:  # type: ignore
+        pass
+
+    def default_workers() -> int:  # type: ignore
+        return max(1, os.cpu_count() or 1)
+
+    def output_subfolder(script_label: str) -> str:  # type: ignore
+        return ""
+
+    def has_extension(path: str, ext: str) -> bool:  # type: ignore
+        return path.lower().endswith(ext)
+
 
 
 if getattr(sys, "frozen", False):
     PROJECT_ROOT = os.path.dirname(sys.executable)
 else:
     PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-ENV_FOLDERS = ["TDP", "D2C", "FTS"]
-SCRIPT_LABEL_TO_FUNC = {
-    "Stream Information": convert_streams_sources,
-    "Input/Output": convert_txedge_to_csv,
-    "Create Editable CSV": convert_txedge_to_csv_with_id,
-    "Convert CSV to JSON": convert_csv_to_json,
-}
+
+
+class StartupTrace:
+    """Startup milestones, in ms since this module started loading (``--startup-trace``).
+
+    Each milestone is written as soon as it is reached, to ``path`` (appended) or
+    to stderr for "-". A disabled trace (``path`` None) ignores marks.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.marks: List[Tuple[str, float]] = []
+
+    def mark(self, name: str) -> None:
+        if self.path is None:
+            return
+        elapsed_ms = (time.perf_counter() - _STARTUP_T0) * 1000
+        self.marks.append((name, elapsed_ms))
+        line = f"startup {elapsed_ms:9.1f} ms  {name}\n"
+        try:
+            if self.path == "-":
+                if sys.stderr is not None:  # None in windowed frozen builds
+                    sys.stderr.write(line)
+                    sys.stderr.flush()
+            else:
+                with io.open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+        except OSError:
+            pass
+
+
+class ConverterRegistry:
+    """Conversion functions by script label, imported the first time each is used.
+
+    Keeps the converter modules (and what they import) off the startup path. In
+    frozen onefile builds a module missing from the bundle's import graph is
+    retried from the bundled ``Scripts`` data folder.
+    """
+
+    def __init__(self, labels: List[str], trace: Optional[StartupTrace] = None) -> None:
+        self.labels = list(labels)
+        self.trace = trace
+        self._funcs: Dict[str, Callable[..., None]] = {}
+        self.errors: Dict[str, str] = {}
+
+    def get(self, label: str) -> Optional[Callable[..., None]]:
+        """The conversion function for ``label``, or None (see ``errors``) when it cannot be loaded."""
+        func = self._funcs.get(label)
+        if func is not None:
+            return func
+        if label not in self.labels:
+            return None
+        try:
+            func = load_converter(label)
+        except ImportError as exc:
+            if not _add_bundled_scripts_dir():
+                self.errors[label] = str(exc)
+                return None
+            importlib.invalidate_caches()
+            try:
+                func = load_converter(label)
+            except Exception as retry_exc:
+                self.errors[label] = str(retry_exc)
+                return None
+        except Exception as exc:
+            self.errors[label] = str(exc)
+            return None
+        self.errors.pop(label, None)
+        self._funcs[label] = func
+        if self.trace is not None:
+            self.trace.mark(f"converter loaded: {label}")
+        return func
+
+
+CONVERTERS = ConverterRegistry(SCRIPT_LABELS)
+
+
+# Names handed to the GUI per progress update while a folder is being scanned
+SCAN_BATCH_SIZE = 256
+
+
+class FileListCache:
+    """Sorted file listings per (folder, extension), reused while the folder's mtime is unchanged.
+
+    Adding, removing or renaming a file changes its folder's mtime, so a cached
+    listing costs one ``stat`` to validate instead of a full directory read.
+    Safe to use from several threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Tuple[int, List[str]]] = {}
+
+    def listing(
+        self,
+        path: str,
+        ext: str,
+        force: bool = False,
+        on_batch: Optional[Callable[[List[str]], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> List[str]:
+        """Non-hidden files in ``path`` ending in ``ext`` (case-insensitive, compressed too), sorted.
+
+        While scanning, ``on_batch`` receives the matching names in chunks (scan
+        order); a cached listing is passed in one chunk. A scan stopped through
+        ``cancelled`` returns what it found so far and is not cached.
+        """
+        try:
+            # Taken before scanning so a change made during the scan invalidates the result
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return []
+        key = (path, ext)
+        if not force:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime:
+                if on_batch is not None and entry[1]:
+                    on_batch(list(entry[1]))
+                return list(entry[1])
+        files: List[str] = []
+        pending: List[str] = []
+        try:
+            with os.scandir(path) as it:
+                for dir_entry in it:
+                    if cancelled is not None and cancelled():
+                        return sorted(files)
+                    name = dir_entry.name
+                    if name.startswith(".") or not has_extension(name, ext):
+                        continue
+                    files.append(name)
+                    if on_batch is not None:
+                        pending.append(name)
+                        if len(pending) >= SCAN_BATCH_SIZE:
+                            on_batch(pending)
+                            pending = []
+        except OSError:
+            return []
+        if pending and on_batch is not None:
+            on_batch(pending)
+        files.sort()
+        with self._lock:
+            self._entries[key] = (mtime, files)
+        return list(files)
+
+
+FILE_LISTS = FileListCache()
 
 
 def list_json_files(env_folder: str) -> list:
-    env_path = os.path.join(PROJECT_ROOT, env_folder)
-    try:
-        files = sorted(
-            [f for f in os.listdir(env_path) if f.lower().endswith(".json")]
-        )
-    except FileNotFoundError:
-        files = []
-    return files
+    return FILE_LISTS.listing(os.path.join(PROJECT_ROOT, env_folder), ".json")
 
 
 def list_csv_files_in_editable(env_folder: str) -> list:
-    env_path = os.path.join(PROJECT_ROOT, env_folder, "Editable CSVs")
-    try:
-        files = sorted(
-            [f for f in os.listdir(env_path) if f.lower().endswith(".csv")]
-        )
-    except FileNotFoundError:
-        files = []
-    return files
+    return FILE_LISTS.listing(os.path.join(PROJECT_ROOT, env_folder, "Editable CSVs"), ".csv")
 
 
 def _hide_windows_console_if_present() -> None:
@@ -82,66 +273,6 @@ def _hide_windows_console_if_present() -> None:
         pass
 
 
-def _load_conversion_functions_from_meipass() -> None:
-    """In frozen onefile builds, attempt to import converters from bundled data."""
-    global convert_txedge_to_csv, convert_streams_sources, convert_txedge_to_csv_with_id, convert_csv_to_json
-    if (
-        (convert_txedge_to_csv is not None)
-        and (convert_streams_sources is not None)
-        and (convert_txedge_to_csv_with_id is not None)
-        and (convert_csv_to_json is not None)
-    ):
-        return
-    base_dir = getattr(sys, "_MEIPASS", None)
-    if not base_dir:
-        return
-    try:
-        import importlib.util
-        # txedge_to_csv.py
-        csv_mod_path = os.path.join(base_dir, "Scripts", "txedge_to_csv.py")
-        if (convert_txedge_to_csv is None) and os.path.exists(csv_mod_path):
-            spec = importlib.util.spec_from_file_location("txedge_to_csv", csv_mod_path)
-            if spec and spec.loader:
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)  # type: ignore[attr-defined]
-                convert_txedge_to_csv = getattr(module, "convert_txedge_to_csv", None)
-        # txedge_to_csv_streams_sources.py
-        s_mod_path = os.path.join(base_dir, "Scripts", "txedge_to_csv_streams_sources.py")
-        if (convert_streams_sources is None) and os.path.exists(s_mod_path):
-            spec2 = importlib.util.spec_from_file_location("txedge_to_csv_streams_sources", s_mod_path)
-            if spec2 and spec2.loader:
-                module2 = importlib.util.module_from_spec(spec2)
-                spec2.loader.exec_module(module2)  # type: ignore[attr-defined]
-                convert_streams_sources = getattr(module2, "convert_streams_sources", None)
-        # txedge_to_csv_with_id.py
-        id_mod_path = os.path.join(base_dir, "Scripts", "txedge_to_csv_with_id.py")
-        if (convert_txedge_to_csv_with_id is None) and os.path.exists(id_mod_path):
-            spec3 = importlib.util.spec_from_file_location("txedge_to_csv_with_id", id_mod_path)
-            if spec3 and spec3.loader:
-                module3 = importlib.util.module_from_spec(spec3)
-                spec3.loader.exec_module(module3)  # type: ignore[attr-defined]
-                convert_txedge_to_csv_with_id = getattr(module3, "convert_txedge_to_csv_with_id", None)
-        # CSV_to_JSON.py
-        rev_mod_path = os.path.join(base_dir, "Scripts", "CSV_to_JSON.py")
-        if (convert_csv_to_json is None) and os.path.exists(rev_mod_path):
-            spec4 = importlib.util.spec_from_file_location("CSV_to_JSON", rev_mod_path)
-            if spec4 and spec4.loader:
-                module4 = importlib.util.module_from_spec(spec4)
-                spec4.loader.exec_module(module4)  # type: ignore[attr-defined]
-                convert_csv_to_json = getattr(module4, "convert_csv_to_json", None)
-    except Exception:
-        # Non-fatal; handled by UI error message later
-        pass
-
-
-def _update_script_mapping() -> None:
-    """Refresh mapping after late imports in frozen builds."""
-    SCRIPT_LABEL_TO_FUNC["Stream Information"] = convert_streams_sources  # type: ignore[index]
-    SCRIPT_LABEL_TO_FUNC["Input/Output"] = convert_txedge_to_csv  # type: ignore[index]
-    SCRIPT_LABEL_TO_FUNC["Create Editable CSV"] = convert_txedge_to_csv_with_id  # type: ignore[index]
-    SCRIPT_LABEL_TO_FUNC["Convert CSV to JSON"] = convert_csv_to_json  # type: ignore[index]
-
-
 def _ensure_environment_structure() -> None:
     """Ensure TDP/D2C/FTS and output subfolders exist under PROJECT_ROOT."""
     try:
@@ -180,28 +311,51 @@ class TxEdgeGUI(tk.Tk):
         self.env_var = tk.StringVar(value=ENV_FOLDERS[0])
         self.env_combo = ttk.Combobox(container, textvariable=self.env_var, values=ENV_FOLDERS, state="readonly", width=int(round(30 * scale_factor)))
         self.env_combo.grid(row=1, column=0, sticky="ew", pady=(0, 8))
-        self.env_combo.bind("<<ComboboxSelected>>", lambda e: self._refresh_json_options())
+        self.env_combo.bind("<<ComboboxSelected>>", lambda e: self._on_selection_changed())
 
         # Script
         ttk.Label(container, text="Script").grid(row=2, column=0, sticky="w")
         self.script_var = tk.StringVar(value="Stream Information")
-        self.script_combo = ttk.Combobox(container, textvariable=self.script_var, values=list(SCRIPT_LABEL_TO_FUNC.keys()), state="readonly", width=int(round(30 * scale_factor)))
+        self.script_combo = ttk.Combobox(container, textvariable=self.script_var, values=CONVERTERS.labels, state="readonly", width=int(round(30 * scale_factor)))
         self.script_combo.grid(row=3, column=0, sticky="ew", pady=(0, 8))
 
         # File Label (JSON/CSV depending on script)
         self.file_label = ttk.Label(container, text="JSON File")
         self.file_label.grid(row=4, column=0, sticky="w")
-        refresh_btn = ttk.Button(container, text="Refresh", command=self._refresh_json_options)
+        refresh_btn = ttk.Button(container, text="Refresh", command=lambda: self._refresh_json_options(force=True))
         refresh_btn.grid(row=4, column=1, sticky="w", padx=(8, 0))
         self.json_var = tk.StringVar(value="")
-        self.json_combo = ttk.Combobox(container, textvariable=self.json_var, values=[], state="readonly", width=int(round(50 * scale_factor)))
+        # Editable so typing narrows the list to matching file names
+        self.json_combo = ttk.Combobox(container, textvariable=self.json_var, values=[], width=int(round(50 * scale_factor)))
         self.json_combo.grid(row=5, column=0, sticky="ew", pady=(0, 12))
+        self.json_combo.bind("<KeyRelease>", self._on_file_key)
+        self._file_kind = "JSON File"
+        self._all_files: List[str] = []
+        self._all_files_set: Set[str] = set()
+        self._scan_done = False
+        self._scan_generation = 0
 
         # Convert all checkbox
         self.convert_all_var = tk.BooleanVar(value=False)
         self.convert_all_checkbox = ttk.Checkbutton(container, text="Convert ALL TechEx JSON Files", variable=self.convert_all_var)
         self.convert_all_checkbox.grid(row=6, column=0, sticky="w", pady=(0, 8))
 
+        # Batch options: number of worker processes, and rebuilding up-to-date outputs
+        batch_frame = ttk.Frame(container)
+        batch_frame.grid(row=6, column=1, sticky="w", padx=(8, 0), pady=(0, 8))
+        ttk.Label(batch_frame, text="Workers").grid(row=0, column=0, sticky="w")
+        self.workers_var = tk.IntVar(value=default_workers())
+        self.workers_spinbox = ttk.Spinbox(batch_frame, from_=1, to=max(64, default_workers()), textvariable=self.workers_var, width=4)
+        self.workers_spinbox.grid(row=0, column=1, sticky="w", padx=(4, 0))
+        self.force_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(batch_frame, text="Force rebuild", variable=self.force_var).grid(row=0, column=2, sticky="w", padx=(8, 0))
+        # Watch mode: convert files dropped into the selected environment as they settle
+        self.watch_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(batch_frame, text="Watch folder", variable=self.watch_var, command=self._on_watch_toggled).grid(
+            row=0, column=3, sticky="w", padx=(8, 0)
+        )
+        self._watch_stop: Optional[threading.Event] = None
+
         # Progress bar and active file label (shown during batch conversions)
         self.progress_var = tk.IntVar(value=0)
         self.progress = ttk.Progressbar(container, orient="horizontal", mode="determinate", maximum=0, variable=self.progress_var)
@@ -220,30 +374,170 @@ class TxEdgeGUI(tk.Tk):
         self.status_var = tk.StringVar(value="")
         self.status_label = ttk.Label(container, textvariable=self.status_var, foreground="#555")
         self.status_label.grid(row=10, column=0, sticky="w", pady=(8, 0))
+        self._cancel_event = threading.Event()
+        self.cancel_button = ttk.Button(container, text="Cancel", command=self.on_cancel_clicked, state=tk.DISABLED)
+        self.cancel_button.grid(row=10, column=1, sticky="ew", pady=(8, 0))
 
         # React to script changes to update labels and file lists
-        self.script_combo.bind("<<ComboboxSelected>>", lambda e: self._refresh_json_options())
+        self.script_combo.bind("<<ComboboxSelected>>", lambda e: self._on_selection_changed())
+
+        self._refresh_json_options()
 
+    def _on_selection_changed(self) -> None:
         self._refresh_json_options()
+        if self.watch_var.get():
+            # Keep watching, now for the newly selected environment/script
+            self._stop_watch()
+            self._start_watch()
+
+    def _on_watch_toggled(self) -> None:
+        if self.watch_var.get():
+            self._start_watch()
+        else:
+            self._stop_watch()
+            self.status_var.set("Stopped watching.")
+
+    def _start_watch(self) -> None:
+        env_folder = self.env_var.get()
+        script_label = self.script_var.get()
+        try:
+            max_workers = max(1, int(self.workers_var.get()))
+        except (tk.TclError, ValueError):
+            max_workers = default_workers()
+        stop_event = threading.Event()
+        self._watch_stop = stop_event
+
+        def on_result(env: str, result: BatchResult) -> None:
+            # Called from the watcher thread as each file finishes
+            stamp = time.strftime("%H:%M:%S")
+            if result.ok:
+                text = f"{stamp} converted {result.filename} ({result.seconds:.1f}s)"
+            else:
+                text = f"{stamp} failed {result.filename}: {result.error}"
+            self.after(0, lambda: self.active_file_var.set(text))
+
+        def worker() -> None:
+            try:
+                watcher = Watcher(PROJECT_ROOT, [env_folder], script_label, max_workers=max_workers, on_result=on_result)
+                watcher.run(stop_event)
+            except Exception as exc:
+                error = str(exc)
+
+                def failed() -> None:
+                    if self._watch_stop is stop_event:
+                        self._watch_stop = None
+                        self.watch_var.set(False)
+                    messagebox.showerror("Watch stopped", error)
+
+                self.after(0, failed)
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.status_var.set(f"Watching {env_folder} for '{script_label}'...")
+
+    def _stop_watch(self) -> None:
+        """Stop the watcher; files already converting finish in the background."""
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+            self._watch_stop = None
+
+    def _refresh_json_options(self, force: bool = False) -> None:
+        """List the current environment's input files on a background thread.
 
-    def _refresh_json_options(self) -> None:
+        The file list fills in as the folder is scanned; ``force`` rescans even
+        if the cached listing is still current (the Refresh button).
+        """
         env_folder = self.env_var.get()
         script_label = self.script_var.get()
         if script_label == "Convert CSV to JSON":
-            files = list_csv_files_in_editable(env_folder)
-            self.file_label.configure(text="CSV File")
+            folder = os.path.join(PROJECT_ROOT, env_folder, "Editable CSVs")
+            ext = ".csv"
+            self._file_kind = "CSV File"
             self.convert_all_checkbox.configure(text="Convert ALL CSV Files")
         else:
-            files = list_json_files(env_folder)
-            self.file_label.configure(text="JSON File")
+            folder = os.path.join(PROJECT_ROOT, env_folder)
+            ext = ".json"
+            self._file_kind = "JSON File"
             self.convert_all_checkbox.configure(text="Convert ALL TechEx JSON Files")
-        self.json_combo["values"] = files
-        self.json_var.set(files[0] if files else "")
+        self._scan_generation += 1
+        generation = self._scan_generation
+        self._all_files = []
+        self._all_files_set = set()
+        self._scan_done = False
+        self.json_combo["values"] = []
+        self.json_var.set("")
+        self.file_label.configure(text=f"{self._file_kind} (scanning...)")
+
+        def cancelled() -> bool:
+            # A newer refresh supersedes this one
+            return generation != self._scan_generation
+
+        def scan() -> None:
+            files = FILE_LISTS.listing(
+                folder,
+                ext,
+                force=force,
+                on_batch=lambda names: self.after(0, lambda: self._on_scan_batch(generation, names)),
+                cancelled=cancelled,
+            )
+            self.after(0, lambda: self._on_scan_done(generation, files))
+
+        threading.Thread(target=scan, daemon=True).start()
+
+    def _on_scan_batch(self, generation: int, names: List[str]) -> None:
+        if generation != self._scan_generation:
+            return
+        self._all_files.extend(names)
+        self._all_files_set.update(names)
+        self._all_files.sort()
+        self.file_label.configure(text=f"{self._file_kind} (scanning... {len(self._all_files)})")
+        self._apply_file_filter()
+
+    def _on_scan_done(self, generation: int, files: List[str]) -> None:
+        if generation != self._scan_generation:
+            return
+        self._all_files = files
+        self._all_files_set = set(files)
+        self._scan_done = True
+        self.file_label.configure(text=f"{self._file_kind} ({len(files)})")
+        self._apply_file_filter()
+        if not self.json_var.get() and files:
+            self.json_var.set(files[0])
+
+    def _filtered_files(self) -> List[str]:
+        """Files whose name contains the typed text (case-insensitive); all of them once a file is picked."""
+        text = self.json_var.get().strip()
+        if not text or text in self._all_files_set:
+            return self._all_files
+        needle = text.lower()
+        return [f for f in self._all_files if needle in f.lower()]
+
+    def _apply_file_filter(self) -> None:
+        self.json_combo["values"] = self._filtered_files()
+
+    def _on_file_key(self, event: tk.Event) -> None:
+        if event.keysym in ("Up", "Down", "Return", "KP_Enter", "Tab", "Escape"):
+            return
+        self._apply_file_filter()
+
+    def _selected_file(self) -> str:
+        """The chosen file: the typed name, or the only file the typed text matches ("" if none)."""
+        text = self.json_var.get().strip()
+        if not text or text in self._all_files_set:
+            return text
+        matches = self._filtered_files()
+        if len(matches) == 1:
+            self.json_var.set(matches[0])
+            return matches[0]
+        if not matches and not self._scan_done:
+            # Still scanning: let the existence check below decide
+            return text
+        return ""
 
     def on_run_clicked(self) -> None:
         env_folder = self.env_var.get()
         script_label = self.script_var.get()
-        json_file_name = self.json_var.get()
+        typed_name = self.json_var.get().strip()
+        json_file_name = self._selected_file()
 
         if not env_folder:
             messagebox.showerror("Error", "Please select a TechEx Environment.")
@@ -252,48 +546,27 @@ class TxEdgeGUI(tk.Tk):
             messagebox.showerror("Error", "Please select a Script.")
             return
         if not json_file_name:
-            messagebox.showerror("Error", f"No JSON files found in '{env_folder}'.")
+            if typed_name:
+                messagebox.showerror("Error", f"'{typed_name}' does not match exactly one file; pick one from the list.")
+            elif not self._scan_done:
+                messagebox.showinfo("Please wait", f"Still listing the files in '{env_folder}'.")
+            else:
+                messagebox.showerror("Error", f"No JSON files found in '{env_folder}'.")
             return
 
         # Resolve conversion function
-        convert_func = SCRIPT_LABEL_TO_FUNC.get(script_label)
+        convert_func = CONVERTERS.get(script_label)
         if convert_func is None:
-            messagebox.showerror("Error", f"Conversion function not available for: {script_label}")
+            detail = CONVERTERS.errors.get(script_label)
+            messagebox.showerror(
+                "Error", f"Conversion function not available for: {script_label}" + (f"\n\n{detail}" if detail else "")
+            )
             return
 
         self.status_var.set("Running...")
         self.run_button.configure(state=tk.DISABLED)
         self.update_idletasks()
 
-        # Helper for naming rule
-        def make_output_path(input_filename: str) -> str:
-            base_no_ext, _ = os.path.splitext(input_filename)
-            base_lower = base_no_ext.lower()
-            if base_lower.endswith("-config"):
-                trimmed_base = base_no_ext[: -len("-config")]
-            else:
-                trimmed_base = base_no_ext
-            if script_label == "Stream Information":
-                output_base = f"{trimmed_base}-StreamInfo"
-            elif script_label == "Convert CSV to JSON":
-                # For reverse conversion, output JSON should be named <csv_base>-config.json
-                output_base = f"{base_no_ext}-config"
-            else:
-                output_base = trimmed_base
-            # Route to subfolder based on script
-            if script_label == "Stream Information":
-                subfolder = "StreamInfo-CSVs"
-            elif script_label == "Create Editable CSV":
-                subfolder = "Editable CSVs"
-            elif script_label == "Convert CSV to JSON":
-                subfolder = "Updated JSONs"
-            else:
-                subfolder = "Input-Output-CSVs"
-            env_output_dir = os.path.join(PROJECT_ROOT, env_folder, subfolder)
-            os.makedirs(env_output_dir, exist_ok=True)
-            ext = ".json" if script_label == "Convert CSV to JSON" else ".csv"
-            return os.path.join(env_output_dir, f"{output_base}{ext}")
-
         # Batch or single
         if self.convert_all_var.get():
             if script_label == "Convert CSV to JSON":
@@ -311,35 +584,64 @@ class TxEdgeGUI(tk.Tk):
             # Prepare progress
             self.progress.configure(maximum=len(all_files))
             self.progress_var.set(0)
-            self.active_file_var.set("")
+            self.active_file_var.set(f"Converting {len(all_files)} file(s)...")
+            self._cancel_event = threading.Event()
+            self.cancel_button.configure(state=tk.NORMAL)
+            try:
+                max_workers = max(1, int(self.workers_var.get()))
+            except (tk.TclError, ValueError):
+                max_workers = default_workers()
+            force = self.force_var.get()
+
+            def on_result(result: BatchResult, completed: int, total: int) -> None:
+                # Called from the worker thread as each file finishes
+                if result.skipped:
+                    label = "Up to date"
+                else:
+                    label = "Converted" if result.ok else "Failed"
+                self.after(0, lambda: self.active_file_var.set(f"{label}: {result.filename} ({completed}/{total})"))
+                self.after(0, lambda: self.progress_var.set(completed))
 
             def worker() -> None:
-                successes = 0
-                failures = 0
-                failure_msgs = []
-                for idx, fname in enumerate(all_files, start=1):
-                    self.after(0, lambda f=fname: self.active_file_var.set(f"Converting: {f}"))
-                    if script_label == "Convert CSV to JSON":
-                        input_abs_path = os.path.join(PROJECT_ROOT, env_folder, "Editable CSVs", fname)
-                    else:
-                        input_abs_path = os.path.join(PROJECT_ROOT, env_folder, fname)
-                    output_abs_path = make_output_path(fname)
-                    try:
-                        convert_func(input_abs_path, output_abs_path)  # type: ignore[misc]
-                        successes += 1
-                    except Exception as exc:
-                        failures += 1
-                        failure_msgs.append(f"{fname}: {str(exc)}")
-                    self.after(0, lambda i=idx: self.progress_var.set(i))
+                start = time.perf_counter()
+                try:
+                    results = run_batch(
+                        PROJECT_ROOT,
+                        env_folder,
+                        script_label,
+                        all_files,
+                        max_workers=max_workers,
+                        on_result=on_result,
+                        cancel_event=self._cancel_event,
+                        convert_func=convert_func,
+                        force=force,
+                    )
+                except Exception as exc:
+                    results = [BatchResult(f, error=str(exc)) for f in all_files]
+                skipped = sum(1 for r in results if r.skipped)
+                successes = sum(1 for r in results if r.ok) - skipped
+                failures = len(results) - successes - skipped
+                failure_msgs = [f"{r.filename}: {r.error}" for r in results if not r.ok]
+                cancelled = len(all_files) - len(results)
+                throughput = throughput_summary(results, time.perf_counter() - start)
 
                 def finish() -> None:
-                    if failures:
-                        self.status_var.set(f"Done with errors: {successes} succeeded, {failures} failed")
-                        messagebox.showwarning("Completed with errors", "\n".join(failure_msgs[:20]))
+                    skipped_note = f", {skipped} up to date" if skipped else ""
+                    throughput_note = f"\n{throughput}" if throughput else ""
+                    if cancelled:
+                        self._set_status(
+                            f"Cancelled: {successes} succeeded, {failures} failed{skipped_note}, {cancelled} not converted"
+                        )
+                    elif failures:
+                        self._set_status(f"Done with errors: {successes} succeeded, {failures} failed{skipped_note}")
+                        messagebox.showwarning("Completed with errors", "\n".join(failure_msgs[:20]) + throughput_note)
                     else:
-                        self.status_var.set(f"Completed: {successes} files converted")
-                        messagebox.showinfo("Success", f"Converted {successes} file(s) in {env_folder}.")
+                        self._set_status(f"Completed: {successes} files converted{skipped_note}")
+                        messagebox.showinfo(
+                            "Success", f"Converted {successes} file(s) in {env_folder}{skipped_note}.{throughput_note}"
+                        )
                     self.active_file_var.set("")
+                    self.cancel_button.configure(state=tk.DISABLED)
                     self.run_button.configure(state=tk.NORMAL)
 
                 self.after(0, finish)
@@ -358,18 +660,34 @@ class TxEdgeGUI(tk.Tk):
                 messagebox.showerror("Error", f"Input {missing_label} not found: {input_abs_path}")
                 self.status_var.set("Failed.")
                 return
-            output_abs_path = make_output_path(json_file_name)
             try:
-                convert_func(input_abs_path, output_abs_path)  # type: ignore[misc]
-                self.status_var.set(f"Done: {os.path.relpath(output_abs_path, PROJECT_ROOT)}")
-                success_label = "JSON" if script_label == "Convert CSV to JSON" else "CSV"
+                output_abs_path = convert_file(PROJECT_ROOT, env_folder, script_label, json_file_name, convert_func)
+                self._set_status(f"Done: {os.path.relpath(output_abs_path, PROJECT_ROOT)}")
+                if script_label == ALL_REPORTS_LABEL:
+                    success_label = "Reports"
+                elif script_label == SQLITE_LABEL:
+                    success_label = "Database"
+                else:
+                    success_label = "JSON" if script_label == "Convert CSV to JSON" else "CSV"
                 messagebox.showinfo("Success", f"{success_label} created:\n{output_abs_path}")
             except Exception as exc:
                 messagebox.showerror("Conversion failed", str(exc))
-                self.status_var.set("Failed.")
+                self._set_status("Failed.")
         finally:
             self.run_button.configure(state=tk.NORMAL)
 
+    def _set_status(self, text: str) -> None:
+        """Show ``text`` after a conversion, with the session's parsed-document cache counts when it is on."""
+        if DOCUMENT_CACHE is not None and DOCUMENT_CACHE.max_bytes > 0:
+            text = f"{text} ({DOCUMENT_CACHE.summary()})"
+        self.status_var.set(text)
+
+    def on_cancel_clicked(self) -> None:
+        """Stop a running batch: queued files are dropped, files in progress finish."""
+        self._cancel_event.set()
+        self.cancel_button.configure(state=tk.DISABLED)
+        self.status_var.set("Cancelling...")
+
     def on_open_output_folder(self) -> None:
         env_folder = self.env_var.get()
         script_label = self.script_var.get()
@@ -380,16 +698,7 @@ class TxEdgeGUI(tk.Tk):
             messagebox.showerror("Error", "Please select a Script.")
             return
 
-        if script_label == "Stream Information":
-            subfolder = "StreamInfo-CSVs"
-        elif script_label == "Create Editable CSV":
-            subfolder = "Editable CSVs"
-        elif script_label == "Convert CSV to JSON":
-            subfolder = "Updated JSONs"
-        else:
-            subfolder = "Input-Output-CSVs"
-
-        target_dir = os.path.join(PROJECT_ROOT, env_folder, subfolder)
+        target_dir = os.path.join(PROJECT_ROOT, env_folder, output_subfolder(script_label))
         try:
             os.makedirs(target_dir, exist_ok=True)
         except Exception as exc:
@@ -409,17 +718,55 @@ class TxEdgeGUI(tk.Tk):
             messagebox.showerror("Error", f"Failed to open folder:\n{target_dir}\n\n{exc}")
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="TxEdge JSON/CSV converter GUI")
+    parser.add_argument(
+        "--startup-trace",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help="Write startup milestones (ms) to FILE, or to stderr when no file is given",
+    )
+    parser.add_argument(
+        "--doc-cache-mb",
+        type=int,
+        default=DEFAULT_CACHE_MB,
+        help=f"Memory for parsed exports reused between conversions (default: {DEFAULT_CACHE_MB}; 0 = off)",
+    )
+    # Ignore anything else the platform passes (e.g. macOS -psn_ arguments)
+    args, _ = parser.parse_known_args()
+    return args
+
+
 def main() -> int:
+    # Batch conversions run in worker processes; required for frozen builds
+    multiprocessing.freeze_support()
+    args = parse_args()
+    configure_document_cache(args.doc_cache_mb << 20)
+    trace = StartupTrace(args.startup_trace)
+    CONVERTERS.trace = trace
+    trace.mark("imports done")
     _hide_windows_console_if_present()
-    _ensure_environment_structure()
-    _load_conversion_functions_from_meipass()
-    _update_script_mapping()
     app = TxEdgeGUI()
+    trace.mark("window built")
+
+    def on_first_map(event: tk.Event) -> None:
+        if event.widget is not app:
+            return
+        app.unbind("<Map>")
+        trace.mark("window shown")
+
+        def ensure_folders() -> None:
+            # Off the UI thread: on network shares each makedirs can take a while
+            _ensure_environment_structure()
+            trace.mark("environment folders ready")
+
+        threading.Thread(target=ensure_folders, daemon=True).start()
+
+    app.bind("<Map>", on_first_map)
     app.mainloop()
     return 0
 
 
 if __name__ == "__main__":
     sys.exit(main())
-
-
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""File helpers shared by the converters.
+
+- ``atomic_open`` writes through a large buffer into a hidden temporary file next
+  to the destination and renames it into place only after the write succeeded,
+  so an interrupted run never leaves a truncated CSV/JSON behind.
+- ``write_json`` serializes with a pluggable backend: the stdlib ``json`` module
+  (default) or ``orjson`` when it is installed, indented or compact. Documents
+  holding NaN/Infinity always go through the stdlib, as orjson writes ``null``.
+- Paths ending in ``.gz``, ``.bz2`` or ``.xz`` are compressed transparently:
+  ``open_input`` stream-decompresses them and ``atomic_open`` compresses what
+  is written, so ``x-config.json.gz`` and ``x.csv.gz`` work wherever the plain
+  names do.
+- ``load_json`` parses a whole export, memory-mapping plain UTF-8 files.
+"""
+import bz2
+import codecs
+import contextlib
+import gzip
+import hashlib
+import io
+import json
+import math
+import mmap
+import os
+import secrets
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import lzma
+except ImportError:  # pragma: no cover - Python built without liblzma
+    lzma = None  # type: ignore
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+
+JSON_BACKEND_STDLIB = "stdlib"
+JSON_BACKEND_ORJSON = "orjson"
+JSON_BACKENDS: List[str] = [JSON_BACKEND_STDLIB, JSON_BACKEND_ORJSON]
+
+WRITE_BUFFER_SIZE = 1 << 20
+
+COMPRESSION_GZIP = "gz"
+COMPRESSION_BZIP2 = "bz2"
+COMPRESSION_XZ = "xz"
+COMPRESSIONS: List[str] = [COMPRESSION_GZIP, COMPRESSION_BZIP2, COMPRESSION_XZ]
+# gzip's default level 9 is several times slower than 6 for a few percent less output
+GZIP_LEVEL = 6
+
+_OPENERS: Dict[str, Any] = {COMPRESSION_GZIP: gzip.open, COMPRESSION_BZIP2: bz2.open, COMPRESSION_XZ: lzma and lzma.open}
+
+
+def compression_for(path: str) -> Optional[str]:
+    """Compression implied by the extension of ``path`` (one of COMPRESSIONS), or None."""
+    ext = os.path.splitext(path)[1][1:].lower()
+    return ext if ext in _OPENERS else None
+
+
+def strip_compression(path: str) -> str:
+    """``path`` without a compression extension: ``x-config.json.gz`` -> ``x-config.json``."""
+    return os.path.splitext(path)[0] if compression_for(path) else path
+
+
+def has_extension(path: str, ext: str) -> bool:
+    """True if ``path`` ends in ``ext`` (case-insensitive), optionally followed by a compression extension."""
+    return strip_compression(path).lower().endswith(ext)
+
+
+def with_compression(path: str, compression: Optional[str]) -> str:
+    """``path`` with the extension of ``compression`` added (unchanged for None)."""
+    if compression is None:
+        return path
+    if compression not in _OPENERS:
+        raise ValueError(f"Unknown compression: {compression}")
+    return f"{path}.{compression}"
+
+
+def existing_variant(path: str) -> str:
+    """``path`` if it exists, else the first existing compressed variant (``path.gz``...), else ``path``."""
+    if os.path.exists(path):
+        return path
+    for compression in COMPRESSIONS:
+        candidate = with_compression(path, compression)
+        if os.path.exists(candidate):
+            return candidate
+    return path
+
+
+def _opener(compression: str) -> Any:
+    opener = _OPENERS[compression]
+    if opener is None:
+        raise ValueError(f"{compression} compression is not available in this Python build")
+    return opener
+
+
+def open_input(path: str, mode: str = "r", encoding: Optional[str] = None, newline: Optional[str] = None) -> Any:
+    """Open ``path`` for reading like ``io.open``, decompressing ``.gz``/``.bz2``/``.xz`` files on the fly."""
+    compression = compression_for(path)
+    if compression is None:
+        return io.open(path, mode, encoding=encoding, newline=newline)
+    if "b" in mode:
+        return _opener(compression)(path, mode)
+    return _opener(compression)(path, mode.replace("t", "") + "t", encoding=encoding, newline=newline)
+
+
+def file_sha256(path: str) -> str:
+    """Hex SHA-256 of the bytes of ``path`` as stored (compressed files are not decompressed)."""
+    digest = hashlib.sha256()
+    with io.open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _NonFiniteDict(dict):
+    """A document holding NaN or Infinity somewhere inside (see mark_non_finite)."""
+
+
+class _NonFiniteList(list):
+    """A document holding NaN or Infinity somewhere inside (see mark_non_finite)."""
+
+
+def mark_non_finite(data: Any) -> Any:
+    """``data`` flagged as holding NaN/Infinity, so ``write_json`` never serializes it with orjson.
+
+    orjson writes non-finite floats as ``null`` without an error; flagged
+    documents are written by the stdlib instead, which keeps ``NaN``. The flag
+    is a shallow copy of the top-level object or array (the values are shared).
+    """
+    if isinstance(data, dict) and not isinstance(data, _NonFiniteDict):
+        return _NonFiniteDict(data)
+    if isinstance(data, list) and not isinstance(data, _NonFiniteList):
+        return _NonFiniteList(data)
+    return data
+
+
+def is_marked_non_finite(data: Any) -> bool:
+    return isinstance(data, (_NonFiniteDict, _NonFiniteList))
+
+
+def contains_non_finite(value: Any) -> bool:
+    """True if ``value`` is or contains a NaN/Infinity float; walks the whole value, so meant for small ones."""
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, float) and not math.isfinite(value):
+            return True
+    return False
+
+
+def _parse_stdlib(parse: Callable[..., Any], source: Any) -> Any:
+    # NaN/Infinity only reach parse_constant, so noticing them costs nothing
+    constants: List[str] = []
+
+    def parse_constant(name: str) -> float:
+        constants.append(name)
+        return float(name)
+
+    data = parse(source, parse_constant=parse_constant)
+    return mark_non_finite(data) if constants else data
+
+
+def load_json(path: str, encoding: str = "utf-8", backend: Optional[str] = None) -> Any:
+    """Parse a whole JSON file; the loader shared by the converters.
+
+    Uncompressed UTF-8 files are memory-mapped and decoded straight from the
+    mapping, skipping the bytes copy and chunked decoding of a text-mode read.
+    With the ``orjson`` backend they are parsed from the mapped bytes without
+    building a str at all: faster, though orjson's intermediate document needs
+    more transient memory. Documents orjson rejects (NaN, integers beyond 64
+    bits) fall back to the stdlib parser. Other encodings and compressed files
+    are read through ``open_input``. Documents holding NaN or Infinity are
+    returned marked (see mark_non_finite).
+    """
+    backend = backend or JSON_BACKEND_STDLIB
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {backend}")
+    if backend == JSON_BACKEND_ORJSON and orjson is None:
+        raise ValueError("orjson backend requested but orjson is not installed")
+    if compression_for(path) is None and codecs.lookup(encoding).name == "utf-8":
+        with io.open(path, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # Empty files, or filesystems that cannot map (read normally below)
+                mapped = None
+            if mapped is not None:
+                with mapped:
+                    if backend == JSON_BACKEND_ORJSON:
+                        with memoryview(mapped) as view:
+                            try:
+                                return orjson.loads(view)
+                            except orjson.JSONDecodeError:
+                                pass
+                    text = str(mapped, "utf-8")
+                return _parse_stdlib(json.loads, text)
+    with open_input(path, "r", encoding=encoding) as f:
+        return _parse_stdlib(json.load, f)
+
+
+def _compressed_writer(raw: Any, compression: str) -> Any:
+    if compression == COMPRESSION_GZIP:
+        # No file name or timestamp in the header, so identical data gives identical files
+        return gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=GZIP_LEVEL, mtime=0)
+    if compression == COMPRESSION_BZIP2:
+        return bz2.BZ2File(raw, "wb")
+    return _opener(compression)(raw, "wb")
+
+
+@contextlib.contextmanager
+def atomic_open(
+    path: str,
+    mode: str = "w",
+    encoding: Optional[str] = None,
+    newline: Optional[str] = None,
+) -> Iterator[Any]:
+    """Open ``path`` for writing via a temporary file that replaces it on success.
+
+    The temporary file is a dotfile in the destination folder (so folder listings
+    skip it) and is removed if the ``with`` block raises. A ``path`` with a
+    compression extension is written compressed.
+    """
+    if "w" not in mode:
+        raise ValueError(f"atomic_open only supports write modes, got {mode!r}")
+    compression = compression_for(path)
+    if compression is not None:
+        _opener(compression)
+    directory, name = os.path.split(os.path.abspath(path))
+    tmp_path = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+    # os.open applies the umask, so the final file gets the usual permissions
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        if compression is None:
+            with io.open(fd, mode, buffering=WRITE_BUFFER_SIZE, encoding=encoding, newline=newline) as f:
+                yield f
+        else:
+            with io.open(fd, "wb", buffering=WRITE_BUFFER_SIZE) as raw, _compressed_writer(raw, compression) as packed:
+                if "b" in mode:
+                    yield packed
+                else:
+                    with io.TextIOWrapper(packed, encoding=encoding, newline=newline) as f:
+                        yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def available_json_backends() -> List[str]:
+    return [b for b in JSON_BACKENDS if b != JSON_BACKEND_ORJSON or orjson is not None]
+
+
+def _dumps_orjson(data: Any, compact: bool) -> Optional[bytes]:
+    if is_marked_non_finite(data) or (isinstance(data, float) and not math.isfinite(data)):
+        # orjson would write these as null
+        return None
+    try:
+        return orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2)
+    except (TypeError, ValueError):
+        # Values orjson rejects (e.g. integers beyond 64 bits, non-string keys)
+        return None
+
+
+def dumps_json(data: Any, backend: Optional[str] = None, compact: bool = False) -> str:
+    """Serialize like ``json.dumps(data, ensure_ascii=False, indent=2)``, or without whitespace when ``compact``.
+
+    orjson spells some floats differently (``1e16`` for ``1e+16``); documents
+    marked by ``mark_non_finite`` are always serialized by the stdlib.
+    """
+    backend = backend or JSON_BACKEND_STDLIB
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {backend}")
+    if backend == JSON_BACKEND_ORJSON:
+        if orjson is None:
+            raise ValueError("orjson backend requested but orjson is not installed")
+        raw = _dumps_orjson(data, compact)
+        if raw is not None:
+            return raw.decode("utf-8")
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def write_json(
+    data: Any,
+    path: str,
+    encoding: str = "utf-8",
+    backend: Optional[str] = None,
+    compact: bool = False,
+) -> None:
+    """Serialize ``data`` and write it to ``path`` atomically."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if backend == JSON_BACKEND_ORJSON and orjson is not None and codecs.lookup(encoding).name == "utf-8":
+        # orjson already produces UTF-8; skip the decode/encode round trip
+        raw = _dumps_orjson(data, compact)
+        if raw is not None:
+            with atomic_open(path, "wb") as fb:
+                fb.write(raw)
+            return
+        backend = JSON_BACKEND_STDLIB
+    text = dumps_json(data, backend=backend, compact=compact)
+    with atomic_open(path, "w", encoding=encoding) as f:
+        f.write(text)
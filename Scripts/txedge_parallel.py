@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Format one large export with several worker processes.
+
+Batch runs convert files in parallel, which does not help when a single export
+holds most of the data. With ``workers`` > 1 the converters cut the configured
+streams into contiguous chunks (a stream always travels with its sources and
+outputs), format each chunk's rows as CSV text in a worker process and write
+the texts in chunk order. csv.writer keeps no state between rows, so the file
+is byte-identical to a serial run.
+
+Parsing and grouping stay in the main process and chunks are pickled to the
+workers, so this only pays off for exports with many thousands of streams;
+smaller ones are written serially.
+"""
+import csv
+import os
+from typing import Iterable, List, Tuple
+
+from txedge_grouping import StreamGrouping
+from txedge_io import atomic_open
+
+# Chunks smaller than this are not worth the round trip to a worker
+MIN_CHUNK_STREAMS = 500
+# More chunks than workers, so one slow chunk does not leave the others idle
+CHUNKS_PER_WORKER = 4
+
+
+def default_chunk_workers() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def split_grouping(grouping: StreamGrouping, workers: int) -> List[StreamGrouping]:
+    """Contiguous chunks of ``grouping.streams``, each holding only its own streams' source/output buckets.
+
+    Orphans are left out (they never produce rows). A single chunk, the grouping
+    itself, is returned when the export is too small to be worth splitting.
+    """
+    streams = grouping.streams
+    count = min(workers * CHUNKS_PER_WORKER, len(streams) // MIN_CHUNK_STREAMS)
+    if workers < 2 or count < 2:
+        return [grouping]
+    size = -(-len(streams) // count)
+    chunks: List[StreamGrouping] = []
+    for start in range(0, len(streams), size):
+        chunk = grouping.subset(streams[start : start + size])
+        if chunk is None:
+            # Exports with unhashable stream ids are written serially
+            return [grouping]
+        chunks.append(chunk)
+    return chunks
+
+
+def write_chunk_texts(
+    output_path: str,
+    headers: List[str],
+    texts: Iterable[Tuple[str, int]],
+    delimiter: str = ",",
+    encoding: str = "utf-8",
+) -> int:
+    """Write the header row, then each chunk's (CSV text, row count) in order; returns the data row count."""
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    rows_written = 0
+    with atomic_open(output_path, "w", encoding=encoding, newline="") as csvfile:
+        csv.writer(csvfile, delimiter=delimiter).writerow(headers)
+        for text, rows in texts:
+            csvfile.write(text)
+            rows_written += rows
+    return rows_written
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Split a CSV report into parts that spreadsheet tools can open.
+
+A partitioned report ``X.csv`` is written as a folder ``X.parts/`` holding
+``part-001.csv``, ``part-002.csv``... and an ``index.json`` listing them:
+
+  {"format": "txedge-parts", "version": 1,
+   "parts": [{"file": "part-001.csv", "rows": 9998, "streams": 2000, "prefix": null}, ...]}
+
+Streams are assigned to parts whole, so a stream row is always in the same
+part as its sources and outputs. Parts are cut by stream-name prefix (the
+first N characters, or the text before a separator), by a maximum row count,
+or both (prefix groups further split by rows). A single stream with more rows
+than the limit gets a part of its own. Each part is a complete report with
+its own header; parts are written concurrently and the index is written last.
+
+CSV_to_JSON accepts the ``X.parts`` folder (or its ``index.json``) in place of
+``X.csv`` and applies the edits of every part in one pass.
+"""
+import argparse
+import io
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from txedge_grouping import StreamGrouping
+from txedge_io import atomic_open, compression_for, strip_compression, with_compression
+from txedge_report_spec import OUTPUT, SOURCE, STREAM
+
+PARTS_SUFFIX = ".parts"
+INDEX_NAME = "index.json"
+PARTS_FORMAT = "txedge-parts"
+PARTS_VERSION = 1
+DEFAULT_PART_WORKERS = 4
+
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9._-]+")
+_PART_FILE = re.compile(r"^part-\d+.*\.csv(\.(gz|bz2|xz))?$")
+
+
+class Partitioning:
+    """How to split a report: ``max_rows`` per part and/or one part group per stream-name prefix.
+
+    The prefix is the first ``prefix_length`` characters of the stream name, or
+    the text before the first ``prefix_separator`` (the whole name without one).
+    """
+
+    def __init__(
+        self,
+        max_rows: Optional[int] = None,
+        prefix_length: Optional[int] = None,
+        prefix_separator: Optional[str] = None,
+    ) -> None:
+        if max_rows is not None and max_rows < 1:
+            raise ValueError("max_rows must be at least 1")
+        if prefix_length is not None and prefix_length < 1:
+            raise ValueError("prefix_length must be at least 1")
+        if prefix_length is not None and prefix_separator:
+            raise ValueError("Use either a prefix length or a prefix separator, not both")
+        if max_rows is None and prefix_length is None and not prefix_separator:
+            raise ValueError("Partitioning needs max_rows, prefix_length or prefix_separator")
+        self.max_rows = max_rows
+        self.prefix_length = prefix_length
+        self.prefix_separator = prefix_separator or None
+
+    @property
+    def by_prefix(self) -> bool:
+        return self.prefix_length is not None or self.prefix_separator is not None
+
+    def prefix(self, name: Any) -> str:
+        text = "" if name is None else str(name)
+        if self.prefix_length is not None:
+            return text[: self.prefix_length]
+        return text.split(self.prefix_separator, 1)[0]
+
+
+def rows_per_stream(row_kinds: Tuple[str, ...]) -> Callable[[StreamGrouping, Any], int]:
+    """Counter of the report rows one stream produces, for a report writing ``row_kinds``."""
+    with_stream = STREAM in row_kinds
+    with_sources = SOURCE in row_kinds
+    with_outputs = OUTPUT in row_kinds
+
+    def count(grouping: StreamGrouping, stream: Any) -> int:
+        rows = 1 if with_stream else 0
+        if with_sources:
+            rows += len(grouping.sources_for(stream))
+        if with_outputs:
+            rows += len(grouping.outputs_for(stream))
+        return rows
+
+    return count
+
+
+class Part:
+    """Streams assigned to one output file."""
+
+    def __init__(self, prefix: Optional[str]) -> None:
+        self.prefix = prefix
+        self.streams: List[Any] = []
+        self.rows = 0
+
+
+def plan_parts(
+    grouping: StreamGrouping, partitioning: Partitioning, count_rows: Callable[[StreamGrouping, Any], int]
+) -> List[Part]:
+    """Assign streams to parts; prefix groups keep the order their first stream appears in."""
+    groups: Dict[Optional[str], List[Any]] = {}
+    for stream in grouping.streams:
+        key = partitioning.prefix(stream.get("name")) if partitioning.by_prefix else None
+        bucket = groups.get(key)
+        if bucket is None:
+            groups[key] = [stream]
+        else:
+            bucket.append(stream)
+
+    parts: List[Part] = []
+    for prefix, streams in groups.items():
+        current = Part(prefix)
+        for stream in streams:
+            rows = count_rows(grouping, stream)
+            if partitioning.max_rows is not None and current.streams and current.rows + rows > partitioning.max_rows:
+                parts.append(current)
+                current = Part(prefix)
+            current.streams.append(stream)
+            current.rows += rows
+        parts.append(current)
+    return parts
+
+
+def sub_grouping(grouping: StreamGrouping, streams: List[Any]) -> StreamGrouping:
+    """A grouping of ``streams`` sharing the source/output buckets (and orphans) of ``grouping``."""
+    part = StreamGrouping()
+    part.streams = streams
+    part.sources_by_stream = grouping.sources_by_stream
+    part.outputs_by_stream = grouping.outputs_by_stream
+    part.orphan_sources = grouping.orphan_sources
+    part.orphan_outputs = grouping.orphan_outputs
+    return part
+
+
+def parts_dir_for(output_path: str) -> str:
+    """``X.parts`` folder written instead of the report ``X.csv`` (or ``X.csv.gz``...)."""
+    return os.path.splitext(strip_compression(output_path))[0] + PARTS_SUFFIX
+
+
+def _part_filename(number: int, prefix: Optional[str], compression: Optional[str] = None) -> str:
+    name = f"part-{number:03d}.csv"
+    if prefix:
+        safe = _UNSAFE_FILENAME.sub("_", prefix).strip("._")[:40]
+        if safe:
+            name = f"part-{number:03d}-{safe}.csv"
+    return with_compression(name, compression)
+
+
+def write_partitioned(
+    grouping: StreamGrouping,
+    output_path: str,
+    write_part: Callable[[StreamGrouping, str], int],
+    count_rows: Callable[[StreamGrouping, Any], int],
+    partitioning: Partitioning,
+    max_workers: int = DEFAULT_PART_WORKERS,
+) -> List[Tuple[str, int]]:
+    """Write a report as parts under ``parts_dir_for(output_path)``; returns (part path, data rows) per part.
+
+    ``write_part(grouping, path)`` writes one part and returns its data row
+    count. Parts are compressed like ``output_path`` (``X.csv.gz`` gives
+    ``part-001.csv.gz``...). Part files left over from an earlier, larger split
+    are removed.
+    """
+    parts_dir = parts_dir_for(output_path)
+    os.makedirs(parts_dir, exist_ok=True)
+    parts = plan_parts(grouping, partitioning, count_rows)
+    compression = compression_for(output_path)
+    names = [_part_filename(n, part.prefix, compression) for n, part in enumerate(parts, 1)]
+    paths = [os.path.join(parts_dir, name) for name in names]
+
+    # Threads overlap the file I/O of the parts (useful on network shares)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(parts)))) as executor:
+        row_counts = list(
+            executor.map(lambda job: write_part(sub_grouping(grouping, job[0].streams), job[1]), zip(parts, paths))
+        )
+
+    index = {
+        "format": PARTS_FORMAT,
+        "version": PARTS_VERSION,
+        "parts": [
+            {"file": name, "rows": rows, "streams": len(part.streams), "prefix": part.prefix}
+            for name, part, rows in zip(names, parts, row_counts)
+        ],
+    }
+    with atomic_open(os.path.join(parts_dir, INDEX_NAME), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    current = set(names)
+    for name in os.listdir(parts_dir):
+        if _PART_FILE.match(name) and name not in current:
+            os.remove(os.path.join(parts_dir, name))
+    return list(zip(paths, row_counts))
+
+
+def is_partitioned(path: str) -> bool:
+    """True for a parts folder or its index file."""
+    if os.path.basename(path) == INDEX_NAME:
+        return True
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, INDEX_NAME))
+
+
+def read_index(path: str) -> Tuple[str, List[str]]:
+    """(parts folder, part file paths in order) of a parts folder or its index file."""
+    parts_dir = os.path.dirname(os.path.abspath(path)) if os.path.basename(path) == INDEX_NAME else path
+    with io.open(os.path.join(parts_dir, INDEX_NAME), "r", encoding="utf-8") as f:
+        index = json.load(f)
+    if not isinstance(index, dict) or index.get("format") != PARTS_FORMAT or index.get("version") != PARTS_VERSION:
+        raise ValueError(f"Not a txEdge parts index: {os.path.join(parts_dir, INDEX_NAME)}")
+    part_paths = []
+    for entry in index.get("parts") or []:
+        part_path = os.path.join(parts_dir, entry["file"])
+        if not os.path.exists(part_path):
+            raise FileNotFoundError(f"Part listed in the index is missing: {part_path}")
+        part_paths.append(part_path)
+    return parts_dir, part_paths
+
+
+def add_partition_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("split into parts (writes <output>.parts/ instead of the output CSV)")
+    group.add_argument("--max-rows", type=int, help="At most this many rows per part (streams are never split)")
+    prefix = group.add_mutually_exclusive_group()
+    prefix.add_argument("--prefix-length", type=int, help="One part group per first N characters of the stream name")
+    prefix.add_argument("--prefix-separator", help="One part group per stream-name text before this separator")
+
+
+def partitioning_from_args(args: argparse.Namespace) -> Optional[Partitioning]:
+    if args.max_rows is None and args.prefix_length is None and not args.prefix_separator:
+        return None
+    return Partitioning(max_rows=args.max_rows, prefix_length=args.prefix_length, prefix_separator=args.prefix_separator)
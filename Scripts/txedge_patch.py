@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""Change-only output for CSV→JSON and the matching "apply patch" step.
+
+Two formats are supported:
+
+- ``json-patch``: an RFC 6902 JSON Patch. Every change is a ``test`` of the old
+  value followed by a ``replace``, so applying it to the wrong document fails
+  instead of silently overwriting values.
+- ``delta``: a compact per-id delta, ``{"format": "txedge-delta", "version": 1,
+  "changes": {section: {id: [{"path": [...], "value": ...}]}}}``. Objects are
+  found by id, so it still applies after objects were reordered.
+"""
+import argparse
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+from txedge_io import JSON_BACKENDS, is_marked_non_finite, load_json, mark_non_finite, write_json
+
+FORMAT_FULL = "full"
+FORMAT_JSON_PATCH = "json-patch"
+FORMAT_DELTA = "delta"
+OUTPUT_FORMATS: List[str] = [FORMAT_FULL, FORMAT_JSON_PATCH, FORMAT_DELTA]
+
+DELTA_FORMAT = "txedge-delta"
+DELTA_VERSION = 1
+
+
+def _escape_pointer_token(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _pointer(parts: Iterable[Any]) -> str:
+    return "".join("/" + _escape_pointer_token(p) for p in parts)
+
+
+def _parse_pointer(pointer: str) -> List[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: {pointer!r}")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def make_json_patch(changes: Iterable[Any]) -> List[Dict[str, Any]]:
+    """RFC 6902 operations for a change set from ``convert_csv_to_json``."""
+    ops: List[Dict[str, Any]] = []
+    for change in changes:
+        if change.index is None:
+            raise ValueError("JSON Patch output needs the position of every changed object")
+        path = _pointer((change.section, change.index) + tuple(change.path))
+        ops.append({"op": "test", "path": path, "value": change.old})
+        ops.append({"op": "replace", "path": path, "value": change.new})
+    return ops
+
+
+def make_delta(changes: Iterable[Any]) -> Dict[str, Any]:
+    """Per-id delta for a change set from ``convert_csv_to_json``."""
+    sections: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    for change in changes:
+        entries = sections.setdefault(change.section, {}).setdefault(str(change.object_id), [])
+        entries.append({"path": list(change.path), "value": change.new})
+    return {"format": DELTA_FORMAT, "version": DELTA_VERSION, "changes": sections}
+
+
+def _resolve_parent(doc: Any, tokens: List[str], pointer: str) -> Any:
+    node = doc
+    for token in tokens[:-1]:
+        node = _child(node, token, pointer)
+    return node
+
+
+def _child(node: Any, token: str, pointer: str) -> Any:
+    if isinstance(node, dict):
+        if token not in node:
+            raise ValueError(f"Patch path does not exist: {pointer}")
+        return node[token]
+    if isinstance(node, list):
+        return node[_list_index(node, token, pointer)]
+    raise ValueError(f"Patch path does not exist: {pointer}")
+
+
+def _list_index(node: List[Any], token: str, pointer: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(node)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise ValueError(f"Invalid array index in patch path: {pointer}")
+    index = int(token)
+    if index > len(node) or (index == len(node) and not allow_end):
+        raise ValueError(f"Patch path does not exist: {pointer}")
+    return index
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    """Equality of two JSON values as RFC 6902 ``test`` defines it.
+
+    The JSON types must match: booleans never equal numbers (Python's
+    ``True == 1`` does), while ints and floats are both JSON numbers and compare
+    by value (NaN equals NaN). Arrays compare element-wise, objects key by key.
+    """
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool) and a == b
+    if isinstance(a, (int, float)) or isinstance(b, (int, float)):
+        if not (isinstance(a, (int, float)) and isinstance(b, (int, float))):
+            return False
+        # NaN (kept by the stdlib writer) must still pass a test of itself
+        return a == b or (a != a and b != b)
+    if isinstance(a, list) or isinstance(b, list):
+        return isinstance(a, list) and isinstance(b, list) and len(a) == len(b) and all(map(_json_equal, a, b))
+    if isinstance(a, dict) or isinstance(b, dict):
+        return (
+            isinstance(a, dict)
+            and isinstance(b, dict)
+            and a.keys() == b.keys()
+            and all(_json_equal(value, b[key]) for key, value in a.items())
+        )
+    return type(a) is type(b) and a == b
+
+
+def _apply_json_patch(doc: Any, ops: List[Any]) -> Any:
+    for op in ops:
+        if not isinstance(op, dict) or "op" not in op or "path" not in op:
+            raise ValueError(f"Invalid JSON Patch operation: {op!r}")
+        kind = op["op"]
+        pointer = op["path"]
+        tokens = _parse_pointer(pointer)
+        if kind not in ("add", "remove", "replace", "test"):
+            raise ValueError(f"Unsupported JSON Patch operation: {kind!r}")
+        if kind != "remove" and "value" not in op:
+            raise ValueError(f"JSON Patch operation without a value: {op!r}")
+        if not tokens:
+            if kind == "test":
+                if not _json_equal(doc, op["value"]):
+                    raise ValueError(f"JSON Patch test failed at {pointer!r}")
+            elif kind == "remove":
+                raise ValueError("Cannot remove the whole document")
+            else:
+                doc = op["value"]
+            continue
+        parent = _resolve_parent(doc, tokens, pointer)
+        last = tokens[-1]
+        if kind == "test":
+            if not _json_equal(_child(parent, last, pointer), op["value"]):
+                raise ValueError(f"JSON Patch test failed at {pointer!r}")
+        elif isinstance(parent, dict):
+            if kind != "add" and last not in parent:
+                raise ValueError(f"Patch path does not exist: {pointer}")
+            if kind == "remove":
+                del parent[last]
+            else:
+                parent[last] = op["value"]
+        elif isinstance(parent, list):
+            index = _list_index(parent, last, pointer, allow_end=(kind == "add"))
+            if kind == "add":
+                parent.insert(index, op["value"])
+            elif kind == "remove":
+                del parent[index]
+            else:
+                parent[index] = op["value"]
+        else:
+            raise ValueError(f"Patch path does not exist: {pointer}")
+    return doc
+
+
+def _apply_delta(doc: Any, delta: Dict[str, Any]) -> Any:
+    if delta.get("version") != DELTA_VERSION:
+        raise ValueError(f"Unsupported delta version: {delta.get('version')!r}")
+    if not isinstance(doc, dict):
+        raise ValueError("Input JSON must be an object")
+    for section, by_id in (delta.get("changes") or {}).items():
+        items = doc.get(section)
+        if not isinstance(items, list):
+            raise ValueError(f"Section missing from document: {section}")
+        objects: Dict[str, List[Dict[str, Any]]] = {}
+        for obj in items:
+            if isinstance(obj, dict) and obj.get("id") is not None:
+                objects.setdefault(str(obj["id"]), []).append(obj)
+        for obj_id, entries in by_id.items():
+            targets = objects.get(obj_id)
+            if not targets:
+                raise ValueError(f"No object with id {obj_id!r} in {section}")
+            for entry in entries:
+                path = entry["path"]
+                for obj in targets:
+                    node = obj
+                    for key in path[:-1]:
+                        node = node.get(key) if isinstance(node, dict) else None
+                    if not isinstance(node, dict) or path[-1] not in node:
+                        raise ValueError(f"Path {'/'.join(path)!r} not found in {section} id {obj_id!r}")
+                    node[path[-1]] = entry["value"]
+    return doc
+
+
+def apply_patch(doc: Any, patch: Any) -> Any:
+    """Apply a JSON Patch (list) or txEdge delta (dict) to ``doc`` in place; returns the document."""
+    if isinstance(patch, list):
+        return _apply_json_patch(doc, patch)
+    if isinstance(patch, dict) and patch.get("format") == DELTA_FORMAT:
+        return _apply_delta(doc, patch)
+    raise ValueError("Unrecognised patch: expected a JSON Patch array or a txedge-delta object")
+
+
+def apply_patch_file(
+    input_json_path: str,
+    patch_path: str,
+    output_json_path: str,
+    encoding: str = "utf-8",
+    json_backend: Optional[str] = None,
+    compact: bool = False,
+) -> None:
+    """Apply the patch in ``patch_path`` to a JSON file and write the result."""
+    doc = load_json(input_json_path, encoding=encoding, backend=json_backend)
+    patch = load_json(patch_path)
+    doc = apply_patch(doc, patch)
+    if is_marked_non_finite(patch):
+        # NaN/Infinity values patched in must not be written as null by orjson
+        doc = mark_non_finite(doc)
+    write_json(doc, output_json_path, encoding=encoding, backend=json_backend, compact=compact)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Apply a JSON Patch or txEdge delta to a txEdge JSON file")
+    parser.add_argument("-i", "--input", required=True, help="Path to the JSON file to patch")
+    parser.add_argument("-p", "--patch", required=True, help="Path to the patch/delta file")
+    parser.add_argument("-o", "--output", required=True, help="Path to write the patched JSON")
+    parser.add_argument("--encoding", default="utf-8", help="File encoding")
+    parser.add_argument("--json-backend", choices=JSON_BACKENDS, default=None, help="JSON parser and serializer (default: stdlib)")
+    parser.add_argument("--compact", action="store_true", help="Write the patched JSON without indentation")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        apply_patch_file(
+            args.input,
+            args.patch,
+            args.output,
+            encoding=args.encoding,
+            json_backend=args.json_backend,
+            compact=args.compact,
+        )
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Compact in-memory model of txEdge streams, sources and outputs.
+
+Each object becomes a ``__slots__`` record holding only the values the fixed
+reports read (see ``FIELDS`` on each class), taken with the same rules as a
+report ``Field``: a missing key or a non-dict step gives None. Repeated short
+strings (protocol, interface, failover mode) are interned so every record
+shares one copy.
+
+Everything else is dropped unless ``keep_extra`` is set, in which case it is
+kept as compact JSON text and only decoded when ``extra`` is first read.
+
+``load_records`` reads an export straight into records; with ``streaming`` each
+object is converted as soon as it is parsed, so the full dicts never coexist.
+"""
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from txedge_doc_cache import load_cached_json
+from txedge_report_spec import OUTPUT, SOURCE, STREAM
+from txedge_stream_parser import SECTIONS, iter_section_items
+
+
+class Record:
+    """Base of the record types; subclasses list their fields in ``FIELDS``."""
+
+    __slots__ = ("_extra",)
+
+    # (attribute, path of keys in the txEdge object, intern the value)
+    FIELDS: Tuple[Tuple[str, Tuple[str, ...], bool], ...] = ()
+    # path -> attribute, for building report extractors against the record
+    PATHS: Dict[Tuple[str, ...], str] = {}
+    # top-level key -> attribute, for ``get``
+    _TOP_LEVEL: Dict[str, str] = {}
+    # FIELDS as (attribute, parent keys, last key, intern), split once per type
+    _STEPS: Tuple[Tuple[str, Tuple[str, ...], str, bool], ...] = ()
+
+    def __init__(self, obj: Dict[str, Any], keep_extra: bool = False) -> None:
+        if not self._STEPS:
+            raise TypeError("Record is abstract; use Stream, Source or Output")
+        for attr, parents, last, intern in self._STEPS:
+            parent = obj
+            for key in parents:
+                parent = parent.get(key)
+                if not isinstance(parent, dict):
+                    parent = _EMPTY
+                    break
+            value = parent.get(last)
+            if intern and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, attr, value)
+        self._extra = _leftover_json(obj, self.FIELDS) if keep_extra else None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Top-level value by txEdge key (``id``, ``name``, ``stream``...), like ``dict.get``."""
+        attr = self._TOP_LEVEL.get(key)
+        if attr is not None:
+            value = getattr(self, attr)
+            return default if value is None else value
+        extra = self.extra
+        if extra is not None:
+            return extra.get(key, default)
+        return default
+
+    @property
+    def extra(self) -> Optional[Dict[str, Any]]:
+        """The fields not held in slots (decoded on first use); None unless loaded with ``keep_extra``."""
+        if isinstance(self._extra, str):
+            self._extra = json.loads(self._extra)
+        return self._extra
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r}, name={getattr(self, 'name', None)!r})"
+
+
+# Stands in for a missing/non-dict intermediate value; never mutated
+_EMPTY: Dict[str, Any] = {}
+
+
+def _leftover_json(obj: Dict[str, Any], fields: Tuple[Tuple[str, Tuple[str, ...], bool], ...]) -> str:
+    """``obj`` without the values held in slots, as compact JSON."""
+    rest = dict(obj)
+    copied: Dict[Tuple[str, ...], Dict[str, Any]] = {(): rest}
+    for _, path, _ in fields:
+        parent: Any = rest
+        for depth, key in enumerate(path[:-1], 1):
+            child = parent.get(key)
+            if not isinstance(child, dict):
+                parent = None
+                break
+            prefix = path[:depth]
+            if prefix not in copied:
+                # Copy on the way down so the source object is left untouched
+                child = dict(child)
+                parent[key] = child
+                copied[prefix] = child
+            parent = copied[prefix]
+        if parent is not None:
+            parent.pop(path[-1], None)
+    return json.dumps(rest, ensure_ascii=False, separators=(",", ":"))
+
+
+def _record_type(name: str, fields: List[Tuple[str, Tuple[str, ...], bool]], doc: str) -> Type[Record]:
+    attrs = tuple(attr for attr, _, _ in fields)
+    return type(
+        name,
+        (Record,),
+        {
+            "__slots__": attrs,
+            "__doc__": doc,
+            "_STEPS": tuple((attr, path[:-1], path[-1], intern) for attr, path, intern in fields),
+            "FIELDS": tuple(fields),
+            "PATHS": {path: attr for attr, path, _ in fields},
+            "_TOP_LEVEL": {path[0]: attr for attr, path, _ in fields if len(path) == 1},
+        },
+    )
+
+
+_TRIGGERS = [
+    ("zero_bitrate", "zeroBitrate"),
+    ("ts_sync_loss", "TSSyncLoss"),
+    ("low_bitrate_threshold", "lowBitrateThreshold"),
+    ("cc_errors_in_period_threshold", "CCErrorsInPeriodThreshold"),
+    ("cc_errors_in_period_time", "CCErrorsInPeriodTime"),
+    ("low_bitrate", "lowBitrate"),
+    ("cc_errors_in_period", "CCErrorsInPeriod"),
+]
+
+Stream = _record_type(
+    "Stream",
+    [
+        ("id", ("id",), False),
+        ("name", ("name",), False),
+        ("enable_thumbnails", ("enableThumbnails",), False),
+        ("options_enable_thumbnails", ("options", "enableThumbnails"), False),
+        ("failover_mode", ("options", "failoverMode"), True),
+        ("failover_revert_time", ("options", "failoverRevertTime"), False),
+        ("failover_wait_time", ("options", "failoverWaitTime"), False),
+    ]
+    + [(attr, ("options", "failoverTriggers", key), False) for attr, key in _TRIGGERS],
+    "A configured stream.",
+)
+
+Source = _record_type(
+    "Source",
+    [
+        ("id", ("id",), False),
+        ("stream", ("stream",), False),
+        ("name", ("name",), False),
+        ("protocol", ("protocol",), True),
+        ("stopped", ("stopped",), False),
+        ("paused", ("paused",), False),
+        ("priority", ("priority",), False),
+        ("port", ("options", "port"), False),
+        ("network_interface", ("options", "networkInterface"), True),
+        ("source_address", ("options", "sourceAddress"), False),
+        ("address", ("options", "address"), False),
+    ],
+    "A configured source (input).",
+)
+
+Output = _record_type(
+    "Output",
+    [
+        ("id", ("id",), False),
+        ("stream", ("stream",), False),
+        ("name", ("name",), False),
+        ("protocol", ("protocol",), True),
+        ("paused", ("paused",), False),
+        ("port", ("options", "port"), False),
+        ("host_address", ("options", "hostAddress"), True),
+        ("address", ("options", "address"), False),
+    ],
+    "A configured output.",
+)
+
+# Report row kind -> record type; pass as ``model=`` to the report writers
+RECORD_MODEL: Dict[str, Type[Record]] = {STREAM: Stream, SOURCE: Source, OUTPUT: Output}
+SECTION_TYPES: Dict[str, Type[Record]] = {
+    "configuredStreams": Stream,
+    "configuredSources": Source,
+    "configuredOutputs": Output,
+}
+
+
+def to_records(section: str, items: Iterable[Any], keep_extra: bool = False) -> List[Any]:
+    """Records for the objects of one section; other entries are kept as they are (grouping ignores them)."""
+    cls = SECTION_TYPES[section]
+    return [cls(item, keep_extra) if isinstance(item, dict) else item for item in items]
+
+
+def load_records(
+    input_path: str,
+    encoding: str = "utf-8",
+    sections: Iterable[str] = SECTIONS,
+    streaming: bool = False,
+    keep_extra: bool = False,
+) -> Dict[str, Any]:
+    """Read ``sections`` of an export as lists of records, keyed like the JSON.
+
+    Without ``streaming`` the document is parsed whole and converted; with it,
+    each object is converted as soon as it is parsed. A section that is not a
+    list is returned as its raw value, for the caller to reject.
+    """
+    wanted = tuple(sections)
+    if not streaming:
+        data = load_cached_json(input_path, encoding=encoding)
+        result: Dict[str, Any] = {}
+        for section in wanted:
+            value = data.get(section)
+            result[section] = to_records(section, value, keep_extra) if isinstance(value, list) else value
+        return result
+
+    result = {}
+
+    def on_value(section: str, value: Any) -> None:
+        result[section] = value
+
+    for section, item in iter_section_items(input_path, encoding=encoding, sections=wanted, on_value=on_value):
+        items = result.get(section)
+        if items is None:
+            items = result[section] = []
+        items.append(SECTION_TYPES[section](item, keep_extra) if isinstance(item, dict) else item)
+    return result
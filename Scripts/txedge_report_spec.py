@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Declarative fixed-column CSV reports over grouped txEdge objects.
+
+A report is a list of ``Column``s and the kinds of rows it emits per stream
+(the stream itself, its sources, its outputs, in that order). Each column says,
+per row kind, where its value comes from: a ``Field`` path into the row's object
+(or into its stream), with an optional fallback path, or a ``Const`` text.
+Columns without a value for a row kind are left blank.
+
+Each (report, row kind) pair is turned once into a list of per-cell getters
+(``operator`` getters or small closures), so nothing about the spec is looked
+up again while rows are written.
+"""
+import csv
+import io
+import operator
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from txedge_grouping import StreamGrouping
+from txedge_io import atomic_open
+
+STREAM = "stream"
+SOURCE = "source"
+OUTPUT = "output"
+ROW_KINDS: Tuple[str, ...] = (STREAM, SOURCE, OUTPUT)
+
+# Rows handed to csv.writer.writerows per call
+WRITE_CHUNK_ROWS = 1024
+
+
+class Field:
+    """The value at ``path`` (nested dict keys), or at ``fallback`` when that is None.
+
+    Every step must be a dict, otherwise the value is None (written as a blank
+    cell). ``from_stream`` reads from the row's stream instead of the row's object.
+    """
+
+    def __init__(self, *path: str, fallback: Optional[Sequence[str]] = None, from_stream: bool = False) -> None:
+        if not path:
+            raise ValueError("Field needs at least one key")
+        self.path: Tuple[str, ...] = tuple(path)
+        self.fallback: Optional[Tuple[str, ...]] = tuple(fallback) if fallback else None
+        self.from_stream = from_stream
+
+
+class Const:
+    """Fixed cell text."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+ValueSpec = Union[Field, Const]
+
+
+class Column:
+    """One report column: ``value`` applies to every row kind unless overridden by kind."""
+
+    def __init__(
+        self,
+        name: str,
+        value: Optional[ValueSpec] = None,
+        stream: Optional[ValueSpec] = None,
+        source: Optional[ValueSpec] = None,
+        output: Optional[ValueSpec] = None,
+    ) -> None:
+        self.name = name
+        self.by_kind: Dict[str, Optional[ValueSpec]] = {
+            STREAM: stream or value,
+            SOURCE: source or value,
+            OUTPUT: output or value,
+        }
+
+
+class ReportSpec:
+    """Columns of a report and the row kinds it writes for each stream."""
+
+    def __init__(self, columns: List[Column], row_kinds: Sequence[str]) -> None:
+        unknown = [k for k in row_kinds if k not in ROW_KINDS]
+        if unknown:
+            raise ValueError(f"Unknown row kind(s): {', '.join(unknown)}")
+        self.columns = columns
+        self.row_kinds: Tuple[str, ...] = tuple(k for k in ROW_KINDS if k in row_kinds)
+        self._extractors: Dict[Tuple[str, Optional[int]], Callable[[Any, Any], List[str]]] = {}
+
+    @property
+    def headers(self) -> List[str]:
+        return [c.name for c in self.columns]
+
+    def extractor(self, kind: str, model: Optional[Dict[str, Any]] = None) -> Callable[[Any, Any], List[str]]:
+        """``extract(obj, stream) -> row`` for one row kind, built on first use.
+
+        ``model`` maps row kinds to record types (see txedge_records); the
+        extractor then reads their attributes instead of dict keys.
+        """
+        key = (kind, id(model) if model is not None else None)
+        func = self._extractors.get(key)
+        if func is None:
+            specs = [c.by_kind[kind] for c in self.columns]
+            if model is None:
+                func = _build_extractor(specs, _key_getter, _key_getter)
+            else:
+                func = _build_extractor(specs, _attribute_getter(model[kind]), _attribute_getter(model[STREAM]))
+            self._extractors[key] = func
+        return func
+
+
+def to_str(value: Any) -> str:
+    """A JSON value as report cell text: "" for null, true/false for booleans."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _blank(obj: Any, stream: Any) -> str:
+    return ""
+
+
+def _key_getter(path: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Any]:
+    """Reads ``path`` from a dict: None when a key is missing or a step is not a dict."""
+    if len(path) == 1:
+        return operator.methodcaller("get", path[0])
+    parents, last = path[:-1], path[-1]
+
+    def get(obj: Dict[str, Any]) -> Any:
+        for key in parents:
+            obj = obj.get(key)
+            if not isinstance(obj, dict):
+                return None
+        return obj.get(last)
+
+    return get
+
+
+def _attribute_getter(cls: Any) -> Callable[[Tuple[str, ...]], Callable[[Any], Any]]:
+    """Maker of getters reading a path from records of ``cls`` (see txedge_records)."""
+
+    def getter(path: Tuple[str, ...]) -> Callable[[Any], Any]:
+        attr = cls.PATHS.get(path)
+        if attr is None:
+            raise ValueError(f"{cls.__name__} records do not hold {'.'.join(path)}")
+        return operator.attrgetter(attr)
+
+    return getter
+
+
+def _cell(spec: Optional[ValueSpec], getter: Callable[[Tuple[str, ...]], Callable[[Any], Any]]) -> Callable[[Any, Any], str]:
+    """``cell(obj, stream) -> text`` for one column of one row kind."""
+    if spec is None:
+        return _blank
+    if isinstance(spec, Const):
+        text = spec.text
+        return lambda obj, stream: text
+    get = getter(spec.path)
+    fallback = getter(spec.fallback) if spec.fallback else None
+    from_stream = spec.from_stream
+    # to_str inlined: this runs once per cell of every report
+    if fallback is None and not from_stream:
+
+        def cell(obj: Any, stream: Any) -> str:
+            value = get(obj)
+            if value is None:
+                return ""
+            if value is True or value is False:
+                return "true" if value else "false"
+            return str(value)
+
+        return cell
+
+    def cell_with_fallback(obj: Any, stream: Any) -> str:
+        root = stream if from_stream else obj
+        value = get(root)
+        if value is None and fallback is not None:
+            value = fallback(root)
+        return to_str(value)
+
+    return cell_with_fallback
+
+
+def _build_extractor(
+    specs: List[Optional[ValueSpec]],
+    obj_getter: Callable[[Tuple[str, ...]], Callable[[Any], Any]],
+    stream_getter: Callable[[Tuple[str, ...]], Callable[[Any], Any]],
+) -> Callable[[Any, Any], List[str]]:
+    cells = [_cell(spec, stream_getter if isinstance(spec, Field) and spec.from_stream else obj_getter) for spec in specs]
+
+    def extract(obj: Any, stream: Any) -> List[str]:
+        return [cell(obj, stream) for cell in cells]
+
+    return extract
+
+
+def iter_report_rows(
+    spec: ReportSpec, grouping: StreamGrouping, model: Optional[Dict[str, Any]] = None
+) -> Iterable[List[str]]:
+    """Data rows in report order: per stream, its own row, its sources, its outputs.
+
+    ``model`` is needed when the grouping holds records instead of dicts.
+    """
+    extract_stream = spec.extractor(STREAM, model) if STREAM in spec.row_kinds else None
+    extract_source = spec.extractor(SOURCE, model) if SOURCE in spec.row_kinds else None
+    extract_output = spec.extractor(OUTPUT, model) if OUTPUT in spec.row_kinds else None
+    for stream in grouping.streams:
+        if extract_stream is not None:
+            yield extract_stream(stream, stream)
+        if extract_source is not None:
+            for source in grouping.sources_for(stream):
+                yield extract_source(source, stream)
+        if extract_output is not None:
+            for output in grouping.outputs_for(stream):
+                yield extract_output(output, stream)
+
+
+def format_report_rows(
+    spec: ReportSpec, grouping: StreamGrouping, delimiter: str = ",", model: Optional[Dict[str, Any]] = None
+) -> Tuple[str, int]:
+    """The data rows (no header) as CSV text, exactly as write_report_csv writes them; returns (text, row count)."""
+    buffer = io.StringIO()
+    rows = list(iter_report_rows(spec, grouping, model))
+    csv.writer(buffer, delimiter=delimiter).writerows(rows)
+    return buffer.getvalue(), len(rows)
+
+
+def write_report_csv(
+    spec: ReportSpec,
+    grouping: StreamGrouping,
+    output_path: str,
+    delimiter: str = ",",
+    encoding: str = "utf-8",
+    model: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Write a report for already-grouped objects (records with ``model``); returns the data row count."""
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    rows_written = 0
+    with atomic_open(output_path, "w", encoding=encoding, newline="") as csvfile:
+        writer = csv.writer(csvfile, delimiter=delimiter)
+        writer.writerow(spec.headers)
+        chunk: List[List[str]] = []
+        for row in iter_report_rows(spec, grouping, model):
+            chunk.append(row)
+            if len(chunk) >= WRITE_CHUNK_ROWS:
+                writer.writerows(chunk)
+                rows_written += len(chunk)
+                chunk = []
+        if chunk:
+            writer.writerows(chunk)
+            rows_written += len(chunk)
+    return rows_written
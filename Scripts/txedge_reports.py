@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+from typing import Any, Dict, List, Optional
+
+from txedge_doc_cache import load_cached_json
+from txedge_grouping import group_by_stream, report_orphans
+from txedge_stats import ConversionStats, cprofile_to, stage
+from txedge_stream_parser import load_sections
+from txedge_to_csv import write_txedge_csv
+from txedge_to_csv_streams_sources import write_streams_sources_csv
+from txedge_to_csv_with_id import write_txedge_csv_with_id
+
+
+REPORT_STREAM_INFO = "streaminfo"
+REPORT_INPUT_OUTPUT = "inputoutput"
+REPORT_EDITABLE = "editable"
+REPORTS: List[str] = [REPORT_STREAM_INFO, REPORT_INPUT_OUTPUT, REPORT_EDITABLE]
+
+
+def convert_reports(
+    input_path: str,
+    output_paths: Dict[str, str],
+    delimiter: str = ",",
+    encoding: str = "utf-8",
+    streaming: bool = False,
+    low_memory: bool = False,
+    stats: Optional[ConversionStats] = None,
+) -> None:
+    """Parse one txEdge export once and write every requested report from it.
+
+    ``output_paths`` maps report names (see ``REPORTS``) to CSV paths; reports
+    that are not in the mapping are not written. The stream grouping is built
+    once and shared by all writers, so output matches the individual converters.
+    """
+    unknown = [name for name in output_paths if name not in REPORTS]
+    if unknown:
+        raise ValueError(f"Unknown report(s): {', '.join(unknown)}")
+    if not output_paths:
+        raise ValueError("No reports requested")
+
+    # Stream Information never looks at outputs, so don't load them for it alone
+    needs_outputs = REPORT_INPUT_OUTPUT in output_paths or REPORT_EDITABLE in output_paths
+    with stage(stats, "parse"):
+        if streaming:
+            sections = ["configuredStreams", "configuredSources"]
+            if needs_outputs:
+                sections.append("configuredOutputs")
+            data = load_sections(input_path, encoding=encoding, sections=sections)
+        else:
+            data = load_cached_json(input_path, encoding=encoding)
+
+    streams = data.get("configuredStreams") or []
+    sources = data.get("configuredSources") or []
+    outputs: Any = (data.get("configuredOutputs") or []) if needs_outputs else []
+
+    if needs_outputs:
+        if not isinstance(streams, list) or not isinstance(sources, list) or not isinstance(outputs, list):
+            raise ValueError("Input JSON must contain lists: configuredStreams, configuredSources, configuredOutputs")
+    elif not isinstance(streams, list) or not isinstance(sources, list):
+        raise ValueError("Input JSON must contain lists: configuredStreams, configuredSources")
+
+    with stage(stats, "group"):
+        grouping = group_by_stream(streams, sources, outputs)
+
+    rows_written = 0
+    if REPORT_STREAM_INFO in output_paths:
+        with stage(stats, "write"):
+            rows_written += write_streams_sources_csv(
+                grouping, output_paths[REPORT_STREAM_INFO], delimiter=delimiter, encoding=encoding
+            )
+    if REPORT_INPUT_OUTPUT in output_paths:
+        with stage(stats, "write"):
+            rows_written += write_txedge_csv(grouping, output_paths[REPORT_INPUT_OUTPUT], delimiter=delimiter, encoding=encoding)
+    if REPORT_EDITABLE in output_paths:
+        rows_written += write_txedge_csv_with_id(
+            grouping, output_paths[REPORT_EDITABLE], delimiter=delimiter, encoding=encoding, low_memory=low_memory, stats=stats
+        )
+
+    report_orphans(grouping, input_path)
+    if stats is not None:
+        stats.rows_written += rows_written
+        stats.objects_skipped += grouping.skipped_count
+        stats.add_input(input_path)
+        for path in output_paths.values():
+            stats.add_output(path)
+        stats.finish()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Write several txEdge CSV reports from a single parse of the JSON")
+    parser.add_argument("-i", "--input", required=True, help="Path to txEdge JSON file")
+    parser.add_argument("--stream-info", help="Write the Stream Information CSV to this path")
+    parser.add_argument("--input-output", help="Write the Input/Output CSV to this path")
+    parser.add_argument("--editable", help="Write the editable CSV (with ids) to this path")
+    parser.add_argument("--delimiter", default=",", help="CSV delimiter")
+    parser.add_argument("--encoding", default="utf-8", help="File encoding")
+    parser.add_argument("--stream", action="store_true", help="Parse the input incrementally to bound memory on large exports")
+    parser.add_argument("--low-memory", action="store_true", help="Spill flattened editable rows to a temporary file instead of memory")
+    parser.add_argument("--profile", action="store_true", help="Print per-stage timings and counters to stderr")
+    parser.add_argument("--cprofile", metavar="FILE", help="Write a cProfile dump of the conversion to FILE")
+    args = parser.parse_args()
+    if not (args.stream_info or args.input_output or args.editable):
+        parser.error("at least one of --stream-info, --input-output or --editable is required")
+    return args
+
+
+def main() -> int:
+    args = parse_args()
+    output_paths: Dict[str, str] = {}
+    if args.stream_info:
+        output_paths[REPORT_STREAM_INFO] = args.stream_info
+    if args.input_output:
+        output_paths[REPORT_INPUT_OUTPUT] = args.input_output
+    if args.editable:
+        output_paths[REPORT_EDITABLE] = args.editable
+    stats = ConversionStats() if args.profile else None
+    try:
+        with cprofile_to(args.cprofile):
+            convert_reports(
+                args.input,
+                output_paths,
+                delimiter=args.delimiter,
+                encoding=args.encoding,
+                streaming=args.stream,
+                low_memory=args.low_memory,
+                stats=stats,
+            )
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    if stats is not None:
+        print(f"Profile for {args.input}:\n{stats.format()}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Per-stage timings and counters collected by the converters.
+
+Pass a ``ConversionStats`` as ``stats=`` to any converter to have it filled in;
+``--profile`` on the command lines prints it, ``--cprofile FILE`` dumps a
+cProfile of the whole conversion for ``python -m pstats`` / snakeviz.
+"""
+import contextlib
+import cProfile
+import io
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, Optional
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in MiB (0.0 where unavailable)."""
+    try:
+        with io.open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class ConversionStats:
+    """Stage timings (seconds, in the order the stages ran) and counters of one conversion."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, float] = {}
+        self.rows_read = 0
+        self.rows_written = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.objects_skipped = 0
+        self.peak_memory_mb = 0.0
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.stages.values())
+
+    def add_input(self, path: str) -> None:
+        with contextlib.suppress(OSError):
+            self.bytes_read += os.path.getsize(path)
+
+    def add_output(self, path: str) -> None:
+        with contextlib.suppress(OSError):
+            self.bytes_written += os.path.getsize(path)
+
+    def finish(self) -> None:
+        """Record the process's peak memory; called by converters when they are done."""
+        self.peak_memory_mb = peak_rss_mb()
+
+    def merge(self, other: "ConversionStats") -> None:
+        for name, seconds in other.stages.items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+        self.rows_read += other.rows_read
+        self.rows_written += other.rows_written
+        self.bytes_read += other.bytes_read
+        self.bytes_written += other.bytes_written
+        self.objects_skipped += other.objects_skipped
+        self.peak_memory_mb = max(self.peak_memory_mb, other.peak_memory_mb)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stages": dict(self.stages),
+            "total_seconds": self.total_seconds,
+            "rows_read": self.rows_read,
+            "rows_written": self.rows_written,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "objects_skipped": self.objects_skipped,
+            "peak_memory_mb": self.peak_memory_mb,
+        }
+
+    def format(self) -> str:
+        lines = [f"  {name:<10} {seconds:9.3f}s" for name, seconds in self.stages.items()]
+        lines.append(f"  {'total':<10} {self.total_seconds:9.3f}s")
+        lines.append(
+            f"  rows read {self.rows_read}, rows written {self.rows_written}, objects skipped {self.objects_skipped}, "
+            f"read {self.bytes_read / 1048576:.1f} MiB, written {self.bytes_written / 1048576:.1f} MiB, "
+            f"peak memory {self.peak_memory_mb:.1f} MiB"
+        )
+        return "\n".join(lines)
+
+
+def stage(stats: Optional[ConversionStats], name: str) -> Any:
+    """``stats.stage(name)``, or a no-op context when no stats are being collected."""
+    return stats.stage(name) if stats is not None else contextlib.nullcontext()
+
+
+@contextlib.contextmanager
+def cprofile_to(path: Optional[str]) -> Iterator[None]:
+    """Profile the block with cProfile and dump the stats to ``path`` (no-op when None)."""
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
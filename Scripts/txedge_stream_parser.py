@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""Incremental reader for txEdge exports.
+
+Reads only the top-level sections the converters need (``configuredStreams``,
+``configuredSources``, ``configuredOutputs``) one item at a time and drops
+``state`` subtrees while scanning, so they are never built as Python objects.
+Everything else in the document is skipped without being decoded.
+
+Uses ``ijson`` when it is installed with a compiled backend, otherwise a
+stdlib scanner built on ``re`` and ``json.JSONDecoder``.
+"""
+import codecs
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from txedge_io import open_input
+
+try:
+    import ijson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    ijson = None  # type: ignore
+
+
+SECTIONS: Tuple[str, ...] = ("configuredStreams", "configuredSources", "configuredOutputs")
+SKIP_KEYS: Tuple[str, ...] = ("state",)
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Event kinds yielded by the backends: a section that is a list starts ("start"),
+# one element of it ("item"), or a section whose value is not a list ("value").
+_START = "start"
+_ITEM = "item"
+_VALUE = "value"
+
+_WS = re.compile(r"[ \t\n\r]*")
+_STRING_BODY = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_STRING = re.compile(_STRING_BODY)
+# Everything up to the next bracket, swallowing complete strings on the way. Stops
+# at a '"' only when the string is not terminated inside the buffer yet.
+_SKIP_FLAT = re.compile(r'[^"\[\]{}]*(?:' + _STRING_BODY + r'[^"\[\]{}]*)*')
+_SCALAR = re.compile(r"[^,\]}\s]*")
+
+
+class _StdlibScanner:
+    """Pull-based JSON scanner over a text file, holding only a sliding buffer."""
+
+    def __init__(self, f: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._mark: Optional[int] = None
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping text already consumed. False at EOF."""
+        if self._eof:
+            return False
+        keep = self._pos if self._mark is None else self._mark
+        # Grow reads geometrically while a kept value spans many chunks
+        chunk = self._f.read(max(self._chunk_size, len(self._buf) - keep))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[keep:] + chunk
+        self._pos -= keep
+        if self._mark is not None:
+            self._mark -= keep
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ('' at EOF)."""
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, ch: str) -> None:
+        found = self._peek()
+        if found != ch:
+            raise ValueError(f"Malformed JSON: expected {ch!r}, found {found or 'end of input'!r}")
+        self._pos += 1
+
+    def _skip_value(self) -> None:
+        ch = self._peek()
+        if ch in ("{", "["):
+            depth = 0
+            while True:
+                self._pos = _SKIP_FLAT.match(self._buf, self._pos).end()  # type: ignore[union-attr]
+                if self._pos >= len(self._buf) or self._buf[self._pos] == '"':
+                    # End of buffer, or a string split across chunks
+                    if not self._fill():
+                        raise ValueError("Malformed JSON: unexpected end of input")
+                    continue
+                c = self._buf[self._pos]
+                self._pos += 1
+                if c in "{[":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return
+        elif ch == '"':
+            while True:
+                m = _STRING.match(self._buf, self._pos)
+                if m:
+                    self._pos = m.end()
+                    return
+                if not self._fill():
+                    raise ValueError("Malformed JSON: unterminated string")
+        elif ch == "":
+            raise ValueError("Malformed JSON: unexpected end of input")
+        else:
+            while True:
+                end = _SCALAR.match(self._buf, self._pos).end()  # type: ignore[union-attr]
+                # A scalar touching the end of the buffer may continue in the next chunk
+                if end < len(self._buf) or not self._fill():
+                    self._pos = end
+                    return
+
+    def _read_value(self) -> Any:
+        """Decode one value verbatim (no key stripping)."""
+        self._peek()
+        self._mark = self._pos
+        try:
+            self._skip_value()
+        finally:
+            start = self._mark
+            self._mark = None
+        value, _ = self._decoder.raw_decode(self._buf[start : self._pos])
+        return value
+
+    def _read_object(self, skip_keys: Tuple[str, ...]) -> Dict[str, Any]:
+        """Decode an object, dropping ``skip_keys`` in it and in nested objects."""
+        self._expect("{")
+        obj: Dict[str, Any] = {}
+        if self._peek() == "}":
+            self._pos += 1
+            return obj
+        while True:
+            key = self._read_value()
+            self._expect(":")
+            if key in skip_keys:
+                self._skip_value()
+            elif self._peek() == "{":
+                obj[key] = self._read_object(skip_keys)
+            else:
+                obj[key] = self._read_value()
+            ch = self._peek()
+            self._pos += 1
+            if ch == "}":
+                return obj
+            if ch != ",":
+                raise ValueError(f"Malformed JSON: expected ',' or '}}', found {ch or 'end of input'!r}")
+
+    def iter_events(self, sections: Tuple[str, ...], skip_keys: Tuple[str, ...]) -> Iterator[Tuple[str, str, Any]]:
+        if self._peek() != "{":
+            raise ValueError("Input JSON must be an object")
+        self._pos += 1
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._read_value()
+            self._expect(":")
+            if key not in sections:
+                self._skip_value()
+            elif self._peek() == "[":
+                self._pos += 1
+                yield key, _START, None
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        if self._peek() == "{":
+                            yield key, _ITEM, self._read_object(skip_keys)
+                        else:
+                            yield key, _ITEM, self._read_value()
+                        ch = self._peek()
+                        self._pos += 1
+                        if ch == "]":
+                            break
+                        if ch != ",":
+                            raise ValueError(f"Malformed JSON: expected ',' or ']', found {ch or 'end of input'!r}")
+            elif self._peek() == "{":
+                yield key, _VALUE, self._read_object(skip_keys)
+            else:
+                yield key, _VALUE, self._read_value()
+            ch = self._peek()
+            self._pos += 1
+            if ch == "}":
+                return
+            if ch != ",":
+                raise ValueError(f"Malformed JSON: expected ',' or '}}', found {ch or 'end of input'!r}")
+
+
+def _ijson_build(events: Iterator[Tuple[str, Any]], event: str, value: Any, skip_keys: Tuple[str, ...]) -> Any:
+    if event == "start_map":
+        obj: Dict[str, Any] = {}
+        for ev, val in events:
+            if ev == "end_map":
+                return obj
+            # ev == "map_key"
+            child_ev, child_val = next(events)
+            if val in skip_keys:
+                _ijson_skip(events, child_ev)
+            else:
+                obj[val] = _ijson_build(events, child_ev, child_val, skip_keys)
+        return obj
+    if event == "start_array":
+        arr = []
+        for ev, val in events:
+            if ev == "end_array":
+                return arr
+            # Lists are kept verbatim, like json.load would produce them
+            arr.append(_ijson_build(events, ev, val, ()))
+        return arr
+    return value
+
+
+def _ijson_skip(events: Iterator[Tuple[str, Any]], event: str) -> None:
+    if event not in ("start_map", "start_array"):
+        return
+    depth = 1
+    for ev, _ in events:
+        if ev in ("start_map", "start_array"):
+            depth += 1
+        elif ev in ("end_map", "end_array"):
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def _ijson_iter_events(f: Any, sections: Tuple[str, ...], skip_keys: Tuple[str, ...]) -> Iterator[Tuple[str, str, Any]]:
+    events = iter(ijson.basic_parse(f, use_float=True))
+    first = next(events, (None, None))
+    if first[0] != "start_map":
+        raise ValueError("Input JSON must be an object")
+    for ev, key in events:
+        if ev == "end_map":
+            return
+        child_ev, child_val = next(events)
+        if key not in sections:
+            _ijson_skip(events, child_ev)
+        elif child_ev == "start_array":
+            yield key, _START, None
+            for item_ev, item_val in events:
+                if item_ev == "end_array":
+                    break
+                yield key, _ITEM, _ijson_build(events, item_ev, item_val, skip_keys)
+        else:
+            yield key, _VALUE, _ijson_build(events, child_ev, child_val, skip_keys)
+
+
+def available_backend() -> str:
+    """Name of the backend used when none is requested explicitly."""
+    if ijson is not None and getattr(ijson, "backend", "") in ("yajl2_c", "yajl2_cffi", "yajl2"):
+        return "ijson"
+    return "stdlib"
+
+
+def _iter_events(
+    input_path: str,
+    encoding: str,
+    sections: Iterable[str],
+    skip_keys: Iterable[str],
+    backend: Optional[str],
+    chunk_size: int,
+) -> Iterator[Tuple[str, str, Any]]:
+    sections_t = tuple(sections)
+    skip_t = tuple(skip_keys)
+    chosen = backend or available_backend()
+    if chosen == "ijson":
+        if ijson is None:
+            raise ValueError("ijson backend requested but ijson is not installed")
+        # ijson decodes UTF-8 bytes itself; other encodings go through the stdlib scanner
+        if codecs.lookup(encoding).name == "utf-8":
+            with open_input(input_path, "rb") as fb:
+                yield from _ijson_iter_events(fb, sections_t, skip_t)
+            return
+    elif chosen != "stdlib":
+        raise ValueError(f"Unknown streaming backend: {chosen}")
+    with open_input(input_path, "r", encoding=encoding) as f:
+        yield from _StdlibScanner(f, chunk_size).iter_events(sections_t, skip_t)
+
+
+def iter_section_items(
+    input_path: str,
+    encoding: str = "utf-8",
+    sections: Iterable[str] = SECTIONS,
+    skip_keys: Iterable[str] = SKIP_KEYS,
+    backend: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_value: Optional[Callable[[str, Any], None]] = None,
+) -> Iterator[Tuple[str, Any]]:
+    """Yield ``(section, item)`` for each element of the requested top-level lists.
+
+    Objects have ``skip_keys`` removed at every nesting level reachable through
+    dicts; list values are kept verbatim. Sections that are not lists are skipped,
+    after being passed to ``on_value(section, value)`` when given.
+    """
+    for section, kind, value in _iter_events(input_path, encoding, sections, skip_keys, backend, chunk_size):
+        if kind == _ITEM:
+            yield section, value
+        elif kind == _VALUE and on_value is not None:
+            on_value(section, value)
+
+
+def load_sections(
+    input_path: str,
+    encoding: str = "utf-8",
+    sections: Iterable[str] = SECTIONS,
+    skip_keys: Iterable[str] = SKIP_KEYS,
+    backend: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """Incrementally load only ``sections`` of a txEdge export into a dict.
+
+    Drop-in replacement for ``json.load`` in the JSON→CSV converters: the result
+    holds the requested sections (minus ``state`` blocks) and nothing else, so peak
+    memory tracks the retained objects instead of the size of the file.
+    """
+    data: Dict[str, Any] = {}
+    for section, kind, value in _iter_events(input_path, encoding, sections, skip_keys, backend, chunk_size):
+        if kind == _START:
+            data[section] = []
+        elif kind == _ITEM:
+            data[section].append(value)
+        else:
+            data[section] = value
+    return data
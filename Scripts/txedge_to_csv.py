@@ -1,45 +1,92 @@
 #!/usr/bin/env python3
 import argparse
-import csv
-import io
-import json
-import os
+import multiprocessing
 import sys
-from typing import Any, Dict, List, Optional
-
-
-def _get_option_value(item: Dict[str, Any], key: str) -> Optional[Any]:
-    options = item.get("options")
-    if isinstance(options, dict):
-        return options.get(key)
-    return None
-
-
-def _get_option_value_with_fallback(
-    item: Dict[str, Any], primary_key: str, secondary_key: str
-) -> Optional[Any]:
-    """Return options[primary_key] if present, otherwise options[secondary_key].
-
-    Only falls back when the primary key is not present (i.e., None). Values that are
-    present but falsy (e.g., empty string) are respected and not treated as missing.
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from txedge_grouping import StreamGrouping, group_by_stream, report_orphans
+from txedge_parallel import split_grouping, write_chunk_texts
+from txedge_partition import Partitioning, add_partition_arguments, partitioning_from_args, rows_per_stream, write_partitioned
+from txedge_records import RECORD_MODEL, Record, load_records
+from txedge_report_spec import OUTPUT, SOURCE, Column, Const, Field, ReportSpec, format_report_rows, write_report_csv
+from txedge_stats import ConversionStats, cprofile_to, stage
+
+
+# Columns per user specification/order (common across sources and outputs)
+INPUT_OUTPUT_REPORT = ReportSpec(
+    [
+        Column("streamName", Field("name", from_stream=True)),
+        Column("Input/Output", source=Const("Input"), output=Const("Output")),
+        Column("name", Field("name")),
+        Column("protocol", Field("protocol")),
+        Column("port", Field("options", "port")),
+        Column(
+            "networkInterface/hostAddress",
+            source=Field("options", "networkInterface"),
+            output=Field("options", "hostAddress"),
+        ),
+        # Sources fall back to options.address only when options.sourceAddress is missing (None)
+        Column(
+            "sourceAddress/address",
+            source=Field("options", "sourceAddress", fallback=("options", "address")),
+            output=Field("options", "address"),
+        ),
+        Column("stopped", source=Field("stopped")),  # blank for outputs
+        Column("paused", Field("paused")),
+        Column("priority", source=Field("priority")),  # blank for outputs
+    ],
+    row_kinds=(SOURCE, OUTPUT),
+)
+HEADERS: List[str] = INPUT_OUTPUT_REPORT.headers
+
+
+def write_txedge_csv(
+    grouping: StreamGrouping,
+    output_path: str,
+    delimiter: str = ",",
+    encoding: str = "utf-8",
+    model: Optional[Dict[str, Any]] = None,
+    workers: int = 1,
+) -> int:
+    """Write the Input/Output report for already-grouped streams/sources/outputs; returns the data row count.
+
+    With ``workers`` > 1, chunks of streams are formatted in worker processes
+    (see txedge_parallel); ``model`` must then be None or RECORD_MODEL.
     """
-    primary_value = _get_option_value(item, primary_key)
-    if primary_value is not None:
-        return primary_value
-    return _get_option_value(item, secondary_key)
-
-
-def _to_str(value: Any) -> str:
-    if value is None:
-        return ""
-    if isinstance(value, bool):
-        return "true" if value else "false"
-    return str(value)
-
-
-def convert_txedge_to_csv(input_path: str, output_path: str, delimiter: str = ",", encoding: str = "utf-8") -> None:
-    with io.open(input_path, "r", encoding=encoding) as f:
-        data = json.load(f)
+    chunks = split_grouping(grouping, workers)
+    if len(chunks) < 2:
+        return write_report_csv(
+            INPUT_OUTPUT_REPORT, grouping, output_path, delimiter=delimiter, encoding=encoding, model=model
+        )
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        texts = executor.map(_format_chunk, chunks, [delimiter] * len(chunks), [model is not None] * len(chunks))
+        return write_chunk_texts(output_path, INPUT_OUTPUT_REPORT.headers, texts, delimiter=delimiter, encoding=encoding)
+
+
+def _format_chunk(chunk: StreamGrouping, delimiter: str, records: bool) -> Tuple[str, int]:
+    # Runs in a worker process; the model is looked up here rather than pickled
+    return format_report_rows(INPUT_OUTPUT_REPORT, chunk, delimiter=delimiter, model=RECORD_MODEL if records else None)
+
+
+def convert_txedge_to_csv(
+    input_path: str,
+    output_path: str,
+    delimiter: str = ",",
+    encoding: str = "utf-8",
+    streaming: bool = False,
+    stats: Optional[ConversionStats] = None,
+    partitioning: Optional[Partitioning] = None,
+    workers: int = 1,
+) -> None:
+    """Write the Input/Output report; with ``partitioning`` as parts in ``<output>.parts/`` (see txedge_partition).
+
+    ``workers`` > 1 formats a single output file in that many processes (see txedge_parallel).
+    """
+    with stage(stats, "parse"):
+        # Objects are kept as compact records; with streaming each one is converted
+        # as soon as it is parsed
+        data = load_records(input_path, encoding=encoding, streaming=streaming)
 
     streams = data.get("configuredStreams") or []
     sources = data.get("configuredSources") or []
@@ -48,76 +95,31 @@ def convert_txedge_to_csv(input_path: str, output_path: str, delimiter: str = ",
     if not isinstance(streams, list) or not isinstance(sources, list) or not isinstance(outputs, list):
         raise ValueError("Input JSON must contain lists: configuredStreams, configuredSources, configuredOutputs")
 
-    # Header per user specification/order (common across sources and outputs)
-    headers: List[str] = [
-        "streamName",
-        "Input/Output",
-        "name",
-        "protocol",
-        "port",
-        "networkInterface/hostAddress",
-        "sourceAddress/address",
-        "stopped",
-        "paused",
-        "priority",
-    ]
-
-    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-
-    with io.open(output_path, "w", encoding=encoding, newline="") as csvfile:
-        writer = csv.writer(csvfile, delimiter=delimiter)
-        writer.writerow(headers)
-
-        # Iterate streams in order
-        for stream in streams:
-            if not isinstance(stream, dict):
-                continue
-            stream_id = stream.get("id")
-            stream_name = stream.get("name")
-
-            # First, write rows for matching configuredSources
-            for source in sources:
-                if not isinstance(source, dict):
-                    continue
-                if source.get("stream") != stream_id:
-                    continue
-
-                row = [
-                    _to_str(stream_name),
-                    "Input",
-                    _to_str(source.get("name")),
-                    _to_str(source.get("protocol")),
-                    _to_str(_get_option_value(source, "port")),
-                    _to_str(_get_option_value(source, "networkInterface")),
-                    _to_str(
-                        _get_option_value_with_fallback(source, "sourceAddress", "address")
-                    ),
-                    _to_str(source.get("stopped")),
-                    _to_str(source.get("paused")),
-                    _to_str(source.get("priority")),
-                ]
-                writer.writerow(row)
-
-            # Then, write rows for matching configuredOutputs
-            for output in outputs:
-                if not isinstance(output, dict):
-                    continue
-                if output.get("stream") != stream_id:
-                    continue
-
-                row = [
-                    _to_str(stream_name),
-                    "Output",
-                    _to_str(output.get("name")),
-                    _to_str(output.get("protocol")),
-                    _to_str(_get_option_value(output, "port")),
-                    _to_str(_get_option_value(output, "hostAddress")),
-                    _to_str(_get_option_value(output, "address")),
-                    "",  # blank entry in place of 'stopped'
-                    _to_str(output.get("paused")),
-                    "",  # blank entry in place of 'priority'
-                ]
-                writer.writerow(row)
+    with stage(stats, "group"):
+        grouping = group_by_stream(streams, sources, outputs, object_types=(Record,))
+    with stage(stats, "write"):
+        if partitioning is None:
+            rows_written = write_txedge_csv(
+                grouping, output_path, delimiter=delimiter, encoding=encoding, model=RECORD_MODEL, workers=workers
+            )
+            written = [(output_path, rows_written)]
+        else:
+            written = write_partitioned(
+                grouping,
+                output_path,
+                lambda part, path: write_txedge_csv(part, path, delimiter=delimiter, encoding=encoding, model=RECORD_MODEL),
+                rows_per_stream(INPUT_OUTPUT_REPORT.row_kinds),
+                partitioning,
+            )
+            rows_written = sum(rows for _, rows in written)
+    report_orphans(grouping, input_path)
+    if stats is not None:
+        stats.rows_written += rows_written
+        stats.objects_skipped += grouping.skipped_count
+        stats.add_input(input_path)
+        for path, _ in written:
+            stats.add_output(path)
+        stats.finish()
 
 
 def parse_args() -> argparse.Namespace:
@@ -126,19 +128,36 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("-o", "--output", required=True, help="Path to output CSV file")
     parser.add_argument("--delimiter", default=",", help="CSV delimiter")
     parser.add_argument("--encoding", default="utf-8", help="File encoding")
+    parser.add_argument("--stream", action="store_true", help="Parse the input incrementally to bound memory on large exports")
+    parser.add_argument("--profile", action="store_true", help="Print per-stage timings and counters to stderr")
+    parser.add_argument("--cprofile", metavar="FILE", help="Write a cProfile dump of the conversion to FILE")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Format chunks of streams in this many processes (same output; default 1)"
+    )
+    add_partition_arguments(parser)
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
+    stats = ConversionStats() if args.profile else None
     try:
-        convert_txedge_to_csv(args.input, args.output, delimiter=args.delimiter, encoding=args.encoding)
+        with cprofile_to(args.cprofile):
+            convert_txedge_to_csv(
+                args.input, args.output, delimiter=args.delimiter, encoding=args.encoding, streaming=args.stream,
+                stats=stats,
+                partitioning=partitioning_from_args(args),
+                workers=args.workers,
+            )
     except Exception as exc:
         print(f"Error: {exc}", file=sys.stderr)
         return 1
+    if stats is not None:
+        print(f"Profile for {args.input}:\n{stats.format()}", file=sys.stderr)
     return 0
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     sys.exit(main())
 
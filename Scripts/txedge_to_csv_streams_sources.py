@@ -1,42 +1,47 @@
 #!/usr/bin/env python3
 import argparse
-import csv
-import io
-import json
-import os
 import sys
 from typing import Any, Dict, List, Optional
 
-
-def _get(d: Optional[Dict[str, Any]], key: str) -> Optional[Any]:
-    if isinstance(d, dict):
-        return d.get(key)
-    return None
-
-
-def _to_str(value: Any) -> str:
-    if value is None:
-        return ""
-    if isinstance(value, bool):
-        return "true" if value else "false"
-    return str(value)
-
-
-STREAM_HEADERS: List[str] = [
-    "name",
-    "zeroBitrate",
-    "TSSyncLoss",
-    "lowBitrateThreshold",
-    "CCErrorsInPeriodThreshold",
-    "CCErrorsInPeriodTime",
-    "lowBitrate",
-    "CCErrorsInPeriod",
-    "failoverMode",
-    "failoverRevertTime",
-    "failoverWaitTime",
-    "enableThumbnails",
-    "priority",
-]
+from txedge_grouping import StreamGrouping, group_by_stream, report_orphans
+from txedge_partition import Partitioning, add_partition_arguments, partitioning_from_args, rows_per_stream, write_partitioned
+from txedge_records import RECORD_MODEL, Record, load_records
+from txedge_report_spec import SOURCE, STREAM, Column, Field, ReportSpec, write_report_csv
+from txedge_stats import ConversionStats, cprofile_to, stage
+
+
+# Stream rows carry the stream-level values and a blank priority; source rows
+# carry only the source name and its priority
+STREAM_INFO_REPORT = ReportSpec(
+    [
+        Column("name", Field("name")),
+        Column("zeroBitrate", stream=Field("options", "failoverTriggers", "zeroBitrate")),
+        Column("TSSyncLoss", stream=Field("options", "failoverTriggers", "TSSyncLoss")),
+        Column("lowBitrateThreshold", stream=Field("options", "failoverTriggers", "lowBitrateThreshold")),
+        Column("CCErrorsInPeriodThreshold", stream=Field("options", "failoverTriggers", "CCErrorsInPeriodThreshold")),
+        Column("CCErrorsInPeriodTime", stream=Field("options", "failoverTriggers", "CCErrorsInPeriodTime")),
+        Column("lowBitrate", stream=Field("options", "failoverTriggers", "lowBitrate")),
+        Column("CCErrorsInPeriod", stream=Field("options", "failoverTriggers", "CCErrorsInPeriod")),
+        Column("failoverMode", stream=Field("options", "failoverMode")),
+        Column("failoverRevertTime", stream=Field("options", "failoverRevertTime")),
+        Column("failoverWaitTime", stream=Field("options", "failoverWaitTime")),
+        Column("enableThumbnails", stream=Field("enableThumbnails", fallback=("options", "enableThumbnails"))),
+        Column("priority", source=Field("priority")),
+    ],
+    row_kinds=(STREAM, SOURCE),
+)
+STREAM_HEADERS: List[str] = STREAM_INFO_REPORT.headers
+
+
+def write_streams_sources_csv(
+    grouping: StreamGrouping,
+    output_path: str,
+    delimiter: str = ",",
+    encoding: str = "utf-8",
+    model: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Write the Stream Information report for already-grouped streams/sources; returns the data row count."""
+    return write_report_csv(STREAM_INFO_REPORT, grouping, output_path, delimiter=delimiter, encoding=encoding, model=model)
 
 
 def convert_streams_sources(
@@ -44,9 +49,15 @@ def convert_streams_sources(
     output_path: str,
     delimiter: str = ",",
     encoding: str = "utf-8",
+    streaming: bool = False,
+    stats: Optional[ConversionStats] = None,
+    partitioning: Optional[Partitioning] = None,
 ) -> None:
-    with io.open(input_path, "r", encoding=encoding) as f:
-        data = json.load(f)
+    """Write the Stream Information report; with ``partitioning`` as parts in ``<output>.parts/`` (see txedge_partition)."""
+    with stage(stats, "parse"):
+        # Objects are kept as compact records; with streaming each one is converted
+        # as soon as it is parsed. Outputs are not needed here, so skip them entirely
+        data = load_records(input_path, encoding=encoding, sections=("configuredStreams", "configuredSources"), streaming=streaming)
 
     streams = data.get("configuredStreams") or []
     sources = data.get("configuredSources") or []
@@ -54,52 +65,33 @@ def convert_streams_sources(
     if not isinstance(streams, list) or not isinstance(sources, list):
         raise ValueError("Input JSON must contain lists: configuredStreams, configuredSources")
 
-    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-
-    with io.open(output_path, "w", encoding=encoding, newline="") as csvfile:
-        writer = csv.writer(csvfile, delimiter=delimiter)
-        writer.writerow(STREAM_HEADERS)
-
-        for stream in streams:
-            if not isinstance(stream, dict):
-                continue
-
-            options = _get(stream, "options")
-            triggers = _get(options, "failoverTriggers")
-
-            # Row for stream-level values (columns 1-12), leave 'priority' blank
-            row_stream = [
-                _to_str(stream.get("name")),
-                _to_str(_get(triggers, "zeroBitrate")),
-                _to_str(_get(triggers, "TSSyncLoss")),
-                _to_str(_get(triggers, "lowBitrateThreshold")),
-                _to_str(_get(triggers, "CCErrorsInPeriodThreshold")),
-                _to_str(_get(triggers, "CCErrorsInPeriodTime")),
-                _to_str(_get(triggers, "lowBitrate")),
-                _to_str(_get(triggers, "CCErrorsInPeriod")),
-                _to_str(_get(options, "failoverMode")),
-                _to_str(_get(options, "failoverRevertTime")),
-                _to_str(_get(options, "failoverWaitTime")),
-                _to_str(stream.get("enableThumbnails") if stream.get("enableThumbnails") is not None else _get(options, "enableThumbnails")),
-                "",
-            ]
-            writer.writerow(row_stream)
-
-            stream_id = stream.get("id")
-
-            # Rows for each matching source: column 1 = source.name, columns 2-12 blanks, column 13 = priority
-            for source in sources:
-                if not isinstance(source, dict):
-                    continue
-                if source.get("stream") != stream_id:
-                    continue
-
-                row_source = [
-                    _to_str(source.get("name")),
-                ] + [""] * 11 + [
-                    _to_str(source.get("priority")),
-                ]
-                writer.writerow(row_source)
+    with stage(stats, "group"):
+        grouping = group_by_stream(streams, sources, object_types=(Record,))
+    with stage(stats, "write"):
+        if partitioning is None:
+            rows_written = write_streams_sources_csv(
+                grouping, output_path, delimiter=delimiter, encoding=encoding, model=RECORD_MODEL
+            )
+            written = [(output_path, rows_written)]
+        else:
+            written = write_partitioned(
+                grouping,
+                output_path,
+                lambda part, path: write_streams_sources_csv(
+                    part, path, delimiter=delimiter, encoding=encoding, model=RECORD_MODEL
+                ),
+                rows_per_stream(STREAM_INFO_REPORT.row_kinds),
+                partitioning,
+            )
+            rows_written = sum(rows for _, rows in written)
+    report_orphans(grouping, input_path)
+    if stats is not None:
+        stats.rows_written += rows_written
+        stats.objects_skipped += grouping.skipped_count
+        stats.add_input(input_path)
+        for path, _ in written:
+            stats.add_output(path)
+        stats.finish()
 
 
 def parse_args() -> argparse.Namespace:
@@ -108,16 +100,28 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("-o", "--output", required=True, help="Path to output CSV file")
     parser.add_argument("--delimiter", default=",", help="CSV delimiter")
     parser.add_argument("--encoding", default="utf-8", help="File encoding")
+    parser.add_argument("--stream", action="store_true", help="Parse the input incrementally to bound memory on large exports")
+    parser.add_argument("--profile", action="store_true", help="Print per-stage timings and counters to stderr")
+    parser.add_argument("--cprofile", metavar="FILE", help="Write a cProfile dump of the conversion to FILE")
+    add_partition_arguments(parser)
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
+    stats = ConversionStats() if args.profile else None
     try:
-        convert_streams_sources(args.input, args.output, delimiter=args.delimiter, encoding=args.encoding)
+        with cprofile_to(args.cprofile):
+            convert_streams_sources(
+                args.input, args.output, delimiter=args.delimiter, encoding=args.encoding, streaming=args.stream,
+                stats=stats,
+                partitioning=partitioning_from_args(args),
+            )
     except Exception as exc:
         print(f"Error: {exc}", file=sys.stderr)
         return 1
+    if stats is not None:
+        print(f"Profile for {args.input}:\n{stats.format()}", file=sys.stderr)
     return 0
 
 
@@ -1,9 +1,24 @@
 #!/usr/bin/env python3
+import argparse
 import csv
 import io
 import json
+import multiprocessing
 import os
-from typing import Any, Dict, List, Optional, Set
+import pickle
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from txedge_doc_cache import load_cached_json
+from txedge_grouping import StreamGrouping, group_by_stream, report_orphans
+from txedge_io import atomic_open
+from txedge_parallel import split_grouping, write_chunk_texts
+from txedge_partition import Partitioning, add_partition_arguments, partitioning_from_args, rows_per_stream, write_partitioned
+from txedge_report_spec import OUTPUT, SOURCE, STREAM
+from txedge_stats import ConversionStats, cprofile_to, stage
+from txedge_stream_parser import load_sections
 
 
 def _to_str(value: Any) -> str:
@@ -54,12 +69,114 @@ def _flatten_to_last_keys(obj: Any, out: Optional[Dict[str, str]] = None) -> Dic
     return out
 
 
-def _collect_headers(items: List[Dict[str, Any]]) -> List[str]:
-    header_set: Set[str] = set()
-    for obj in items:
-        flat = _flatten_to_last_keys(obj, {})
-        header_set.update(flat.keys())
+# Objects of the same protocol nearly always share one nested key layout, so the
+# recursive walk above is compiled once per layout ("shape") into a plain function
+# that builds the flat row directly. The shape records exact value types, so a
+# compiled plan can also specialise each leaf's string conversion.
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+_PLAN_CACHE_MAX = 4096
+_plan_cache: Dict[Any, Optional[Callable[[Dict[str, Any]], Dict[str, str]]]] = {}
+
+
+# Equivalent of json.dumps(value, ensure_ascii=False) without per-call encoder setup
+_encode_list = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _dump_list(value: Any) -> str:
+    try:
+        return _encode_list(value)
+    except Exception:
+        return _to_str(value)
+
+
+def _shape_key(obj: Dict[str, Any]) -> Any:
+    types = tuple(map(type, obj.values()))
+    if dict in types:
+        nested = tuple([_shape_key(v) for k, v in obj.items() if type(v) is dict and k != "state"])
+        return (tuple(obj), types, nested)
+    return (tuple(obj), types)
+
+
+def _trace_leaves(obj: Dict[str, Any], path: Tuple[str, ...], seen: Set[str], steps: List[Tuple[str, Tuple[str, ...], Any]]) -> bool:
+    """Record the leaves _flatten_to_last_keys would keep, in the same order.
+
+    Returns False if a value has a type the plan cannot reproduce exactly
+    (e.g. dict/list subclasses), in which case the shape stays uncompiled.
+    """
+    for key, value in obj.items():
+        if key == "state":
+            continue
+        cls = type(value)
+        if cls is dict or cls is list:
+            continue
+        if cls not in _SCALAR_TYPES:
+            return False
+        if key not in seen:
+            seen.add(key)
+            steps.append((key, path + (key,), value))
+    for key, value in obj.items():
+        if key == "state":
+            continue
+        cls = type(value)
+        if cls is dict:
+            if not _trace_leaves(value, path + (key,), seen, steps):
+                return False
+        elif cls is list:
+            if key not in seen:
+                seen.add(key)
+                steps.append((key, path + (key,), value))
+    return True
+
+
+def _compile_flatten_plan(obj: Dict[str, Any]) -> Optional[Callable[[Dict[str, Any]], Dict[str, str]]]:
+    steps: List[Tuple[str, Tuple[str, ...], Any]] = []
+    if not _trace_leaves(obj, (), set(), steps):
+        return None
+    items = []
+    for key, path, sample in steps:
+        expr = "obj" + "".join(f"[{k!r}]" for k in path)
+        cls = type(sample)
+        if cls is list:
+            value_expr = f"_dump_list({expr})"
+        elif cls is str:
+            value_expr = expr
+        elif sample is None:
+            value_expr = "''"
+        elif cls is bool:
+            value_expr = f"('true' if {expr} else 'false')"
+        else:
+            value_expr = f"str({expr})"
+        items.append(f"{key!r}: {value_expr}")
+    source = "def plan(obj):\n    return {" + ", ".join(items) + "}\n"
+    namespace: Dict[str, Any] = {"_dump_list": _dump_list}
+    try:
+        exec(compile(source, "<flatten plan>", "exec"), namespace)
+    except (SyntaxError, RecursionError, MemoryError):
+        # Pathologically deep/large shapes: keep using the generic walk
+        return None
+    return namespace["plan"]
+
 
+def _flatten_object(obj: Any) -> Dict[str, str]:
+    """_flatten_to_last_keys(obj, {}) via a compiled per-shape plan when possible."""
+    if type(obj) is not dict:
+        return _flatten_to_last_keys(obj, {})
+    shape = _shape_key(obj)
+    try:
+        plan = _plan_cache[shape]
+    except KeyError:
+        plan = _compile_flatten_plan(obj)
+        if len(_plan_cache) < _PLAN_CACHE_MAX:
+            _plan_cache[shape] = plan
+    except TypeError:
+        # Unhashable shape (cannot happen for JSON keys, but be safe)
+        plan = None
+    if plan is None:
+        return _flatten_to_last_keys(obj, {})
+    return plan(obj)
+
+
+def _order_headers(header_set: Set[str]) -> List[str]:
     # Keep key identifiers first if present, then "objectType" as the 4th column,
     # then the rest alphabetical for stability
     preferred_order = ["id", "stream", "name"]
@@ -71,14 +188,172 @@ def _collect_headers(items: List[Dict[str, Any]]) -> List[str]:
     return ordered
 
 
+def _iter_flat_rows(grouping: StreamGrouping) -> Iterator[Dict[str, str]]:
+    """Flatten each object once, in CSV order: stream row, its sources, its outputs."""
+    for stream in grouping.streams:
+        flat_stream = _flatten_object(stream)
+        flat_stream["objectType"] = "Stream"
+        yield flat_stream
+
+        for source in grouping.sources_for(stream):
+            flat_source = _flatten_object(source)
+            flat_source["objectType"] = "Source"
+            yield flat_source
+
+        for output in grouping.outputs_for(stream):
+            flat_output = _flatten_object(output)
+            flat_output["objectType"] = "Output"
+            yield flat_output
+
+
+def _orphan_headers(grouping: StreamGrouping) -> Set[str]:
+    # Orphans get no rows, but their keys have always been part of the header
+    header_set: Set[str] = set()
+    for obj in grouping.orphan_sources:
+        header_set.update(_flatten_object(obj))
+    for obj in grouping.orphan_outputs:
+        header_set.update(_flatten_object(obj))
+    return header_set
+
+
+def write_txedge_csv_with_id(
+    grouping: StreamGrouping,
+    output_csv_path: str,
+    delimiter: str = ",",
+    encoding: str = "utf-8",
+    low_memory: bool = False,
+    stats: Optional[ConversionStats] = None,
+    workers: int = 1,
+) -> int:
+    """Write the editable CSV for already-grouped streams/sources/outputs; returns the data row count.
+
+    Every object is flattened exactly once; the header is the union of the
+    flattened keys. Flat rows are kept in memory until the header is known,
+    or with ``low_memory`` spilled to a temporary file and read back.
+
+    With ``workers`` > 1, chunks of streams are flattened and formatted in
+    worker processes (see txedge_parallel); each worker spills its flat rows
+    until the merged header is known, so ``low_memory`` does not apply.
+    """
+    # Ensure parent directory exists
+    os.makedirs(os.path.dirname(os.path.abspath(output_csv_path)), exist_ok=True)
+
+    chunks = split_grouping(grouping, workers)
+    if len(chunks) > 1:
+        return _write_chunks_parallel(grouping, chunks, output_csv_path, delimiter, encoding, workers, stats)
+
+    if low_memory:
+        with tempfile.TemporaryFile("w+", encoding="utf-8", newline="\n") as spill:
+            with stage(stats, "flatten"):
+                header_set = _orphan_headers(grouping)
+                for flat in _iter_flat_rows(grouping):
+                    header_set.update(flat)
+                    spill.write(json.dumps(flat, ensure_ascii=False))
+                    spill.write("\n")
+            spill.seek(0)
+            with stage(stats, "write"):
+                return _write_rows(
+                    output_csv_path, _order_headers(header_set), (json.loads(line) for line in spill), delimiter, encoding
+                )
+
+    with stage(stats, "flatten"):
+        header_set = _orphan_headers(grouping)
+        rows: List[Dict[str, str]] = []
+        for flat in _iter_flat_rows(grouping):
+            header_set.update(flat)
+            rows.append(flat)
+    with stage(stats, "write"):
+        return _write_rows(output_csv_path, _order_headers(header_set), rows, delimiter, encoding)
+
+
+def _write_chunks_parallel(
+    grouping: StreamGrouping,
+    chunks: List[StreamGrouping],
+    output_csv_path: str,
+    delimiter: str,
+    encoding: str,
+    workers: int,
+    stats: Optional[ConversionStats],
+) -> int:
+    # Two passes over one pool: flatten every chunk (collecting its header keys),
+    # then format every chunk against the merged header
+    with tempfile.TemporaryDirectory(prefix="txedge-chunks-") as spill_dir:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            with stage(stats, "flatten"):
+                header_set = _orphan_headers(grouping)
+                spill_paths = []
+                for chunk_headers, spill_path in executor.map(_flatten_chunk, chunks, [spill_dir] * len(chunks)):
+                    header_set.update(chunk_headers)
+                    spill_paths.append(spill_path)
+            headers = _order_headers(header_set)
+            with stage(stats, "write"):
+                texts = executor.map(
+                    _format_chunk, spill_paths, [headers] * len(spill_paths), [delimiter] * len(spill_paths)
+                )
+                return write_chunk_texts(output_csv_path, headers, texts, delimiter=delimiter, encoding=encoding)
+
+
+def _flatten_chunk(chunk: StreamGrouping, spill_dir: str) -> Tuple[Set[str], str]:
+    """Worker: flatten a chunk into a spill file; returns (header keys, spill path)."""
+    header_set: Set[str] = set()
+    rows: List[Dict[str, str]] = []
+    for flat in _iter_flat_rows(chunk):
+        header_set.update(flat)
+        rows.append(flat)
+    fd, spill_path = tempfile.mkstemp(suffix=".pickle", dir=spill_dir)
+    with io.open(fd, "wb") as f:
+        pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return header_set, spill_path
+
+
+def _format_chunk(spill_path: str, headers: List[str], delimiter: str) -> Tuple[str, int]:
+    """Worker: a spilled chunk's rows as CSV text in ``headers`` order; returns (text, row count)."""
+    with io.open(spill_path, "rb") as f:
+        rows = pickle.load(f)
+    buffer = io.StringIO()
+    csv.writer(buffer, delimiter=delimiter).writerows([flat.get(h, "") for h in headers] for flat in rows)
+    return buffer.getvalue(), len(rows)
+
+
+def _write_rows(
+    output_csv_path: str,
+    headers: List[str],
+    rows: Iterable[Dict[str, str]],
+    delimiter: str,
+    encoding: str,
+) -> int:
+    rows_written = 0
+    with atomic_open(output_csv_path, "w", encoding=encoding, newline="") as csvfile:
+        writer = csv.writer(csvfile, delimiter=delimiter)
+        writer.writerow(headers)
+        # Rows are already grouped by stream id: stream row, then its sources, then its outputs
+        for flat in rows:
+            writer.writerow([flat.get(h, "") for h in headers])
+            rows_written += 1
+    return rows_written
+
+
 def convert_txedge_to_csv_with_id(
     input_json_path: str,
     output_csv_path: str,
     delimiter: str = ",",
     encoding: str = "utf-8",
+    streaming: bool = False,
+    low_memory: bool = False,
+    stats: Optional[ConversionStats] = None,
+    partitioning: Optional[Partitioning] = None,
+    workers: int = 1,
 ) -> None:
-    with io.open(input_json_path, "r", encoding=encoding) as f:
-        data = json.load(f)
+    """Write the editable CSV; with ``partitioning`` as parts in ``<output>.parts/`` (see txedge_partition).
+
+    ``workers`` > 1 formats a single output file in that many processes (see txedge_parallel).
+    """
+    with stage(stats, "parse"):
+        if streaming:
+            # Incremental parse; state blocks are excluded from this report anyway
+            data = load_sections(input_json_path, encoding=encoding)
+        else:
+            data = load_cached_json(input_json_path, encoding=encoding)
 
     streams = data.get("configuredStreams") or []
     sources = data.get("configuredSources") or []
@@ -87,45 +362,83 @@ def convert_txedge_to_csv_with_id(
     if not isinstance(streams, list) or not isinstance(sources, list) or not isinstance(outputs, list):
         raise ValueError("Input JSON must contain lists: configuredStreams, configuredSources, configuredOutputs")
 
-    # Build unified header set based on all three collections
-    headers = _collect_headers(streams + sources + outputs)
+    with stage(stats, "group"):
+        grouping = group_by_stream(streams, sources, outputs)
+    if partitioning is None:
+        rows_written = write_txedge_csv_with_id(
+            grouping,
+            output_csv_path,
+            delimiter=delimiter,
+            encoding=encoding,
+            low_memory=low_memory,
+            stats=stats,
+            workers=workers,
+        )
+        written = [(output_csv_path, rows_written)]
+    else:
+        # Parts are flattened concurrently, so they are timed as one stage
+        with stage(stats, "write"):
+            written = write_partitioned(
+                grouping,
+                output_csv_path,
+                lambda part, path: write_txedge_csv_with_id(
+                    part, path, delimiter=delimiter, encoding=encoding, low_memory=low_memory
+                ),
+                rows_per_stream((STREAM, SOURCE, OUTPUT)),
+                partitioning,
+            )
+        rows_written = sum(rows for _, rows in written)
+    report_orphans(grouping, input_json_path)
+    if stats is not None:
+        stats.rows_written += rows_written
+        stats.objects_skipped += grouping.skipped_count
+        stats.add_input(input_json_path)
+        for path, _ in written:
+            stats.add_output(path)
+        stats.finish()
 
-    # Ensure parent directory exists
-    os.makedirs(os.path.dirname(os.path.abspath(output_csv_path)), exist_ok=True)
 
-    with io.open(output_csv_path, "w", encoding=encoding, newline="") as csvfile:
-        writer = csv.writer(csvfile, delimiter=delimiter)
-        writer.writerow(headers)
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert txEdge JSON to an editable CSV with ids, grouped by stream")
+    parser.add_argument("-i", "--input", required=True, help="Path to txEdge JSON file")
+    parser.add_argument("-o", "--output", required=True, help="Path to output CSV file")
+    parser.add_argument("--delimiter", default=",", help="CSV delimiter")
+    parser.add_argument("--encoding", default="utf-8", help="File encoding")
+    parser.add_argument("--stream", action="store_true", help="Parse the input incrementally to bound memory on large exports")
+    parser.add_argument("--low-memory", action="store_true", help="Spill flattened rows to a temporary file instead of memory")
+    parser.add_argument("--profile", action="store_true", help="Print per-stage timings and counters to stderr")
+    parser.add_argument("--cprofile", metavar="FILE", help="Write a cProfile dump of the conversion to FILE")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Format chunks of streams in this many processes (same output; default 1)"
+    )
+    add_partition_arguments(parser)
+    return parser.parse_args()
 
-        # Write rows grouped by stream id: stream row, then its sources, then its outputs
-        for stream in streams:
-            if not isinstance(stream, dict):
-                continue
-            stream_id = stream.get("id")
-
-            # Stream row
-            flat_stream = _flatten_to_last_keys(stream, {})
-            flat_stream["objectType"] = "Stream"
-            writer.writerow([flat_stream.get(h, "") for h in headers])
-
-            # Matching sources
-            for source in sources:
-                if not isinstance(source, dict):
-                    continue
-                if source.get("stream") != stream_id:
-                    continue
-                flat_source = _flatten_to_last_keys(source, {})
-                flat_source["objectType"] = "Source"
-                writer.writerow([flat_source.get(h, "") for h in headers])
-
-            # Matching outputs
-            for output in outputs:
-                if not isinstance(output, dict):
-                    continue
-                if output.get("stream") != stream_id:
-                    continue
-                flat_output = _flatten_to_last_keys(output, {})
-                flat_output["objectType"] = "Output"
-                writer.writerow([flat_output.get(h, "") for h in headers])
+
+def main() -> int:
+    args = parse_args()
+    stats = ConversionStats() if args.profile else None
+    try:
+        with cprofile_to(args.cprofile):
+            convert_txedge_to_csv_with_id(
+                args.input,
+                args.output,
+                delimiter=args.delimiter,
+                encoding=args.encoding,
+                streaming=args.stream,
+                low_memory=args.low_memory,
+                stats=stats,
+                partitioning=partitioning_from_args(args),
+                workers=args.workers,
+            )
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    if stats is not None:
+        print(f"Profile for {args.input}:\n{stats.format()}", file=sys.stderr)
+    return 0
 
 
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""Load txEdge exports into a SQLite database for querying.
+
+One database holds any number of exports (the GUI/batch keep one per
+environment, ``<env>/txedge.sqlite``). Every row carries the ``export_file`` it
+came from, and loading an export again replaces only that export's rows:
+
+  python3 txedge_to_sqlite.py -i TDP/example-config.json -o TDP/txedge.sqlite
+  sqlite3 TDP/txedge.sqlite "SELECT export_file, name FROM sources WHERE port = 5004"
+
+Tables ``streams``, ``sources`` and ``outputs`` have one row per object, with
+the commonly queried fields as columns (indexed: stream id, name, protocol,
+port, address) and the whole object minus ``state`` as JSON in ``data`` for
+anything else (``json_extract(data, '$.options.latency')``). ``exports`` lists
+the loaded exports with their row counts and the SHA-256 of the file each was
+loaded from.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.request import pathname2url
+
+from txedge_doc_cache import load_cached_json
+from txedge_io import dumps_json, file_sha256
+from txedge_stats import ConversionStats, cprofile_to, stage
+from txedge_stream_parser import load_sections
+
+# Bumped whenever the tables change; older databases must be deleted and reloaded
+SCHEMA_VERSION = 1
+# Seconds to wait for another process (e.g. a parallel batch worker) to finish writing
+BUSY_TIMEOUT = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exports (
+    export_file TEXT PRIMARY KEY,
+    imported_at TEXT NOT NULL,
+    streams INTEGER NOT NULL,
+    sources INTEGER NOT NULL,
+    outputs INTEGER NOT NULL,
+    source_sha256 TEXT
+);
+CREATE TABLE IF NOT EXISTS streams (
+    export_file TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id INTEGER,
+    name TEXT,
+    failover_mode TEXT,
+    enable_thumbnails INTEGER,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS sources (
+    export_file TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id INTEGER,
+    stream_id INTEGER,
+    name TEXT,
+    protocol TEXT,
+    port INTEGER,
+    network_interface TEXT,
+    address TEXT,
+    priority INTEGER,
+    stopped INTEGER,
+    paused INTEGER,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS outputs (
+    export_file TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id INTEGER,
+    stream_id INTEGER,
+    name TEXT,
+    protocol TEXT,
+    port INTEGER,
+    host_address TEXT,
+    address TEXT,
+    paused INTEGER,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS streams_export_file ON streams (export_file);
+CREATE INDEX IF NOT EXISTS streams_id ON streams (id);
+CREATE INDEX IF NOT EXISTS streams_name ON streams (name);
+CREATE INDEX IF NOT EXISTS sources_export_file ON sources (export_file);
+CREATE INDEX IF NOT EXISTS sources_stream_id ON sources (stream_id);
+CREATE INDEX IF NOT EXISTS sources_name ON sources (name);
+CREATE INDEX IF NOT EXISTS sources_protocol ON sources (protocol);
+CREATE INDEX IF NOT EXISTS sources_port ON sources (port);
+CREATE INDEX IF NOT EXISTS sources_address ON sources (address);
+CREATE INDEX IF NOT EXISTS outputs_export_file ON outputs (export_file);
+CREATE INDEX IF NOT EXISTS outputs_stream_id ON outputs (stream_id);
+CREATE INDEX IF NOT EXISTS outputs_name ON outputs (name);
+CREATE INDEX IF NOT EXISTS outputs_protocol ON outputs (protocol);
+CREATE INDEX IF NOT EXISTS outputs_port ON outputs (port);
+CREATE INDEX IF NOT EXISTS outputs_address ON outputs (address);
+"""
+
+
+# SQLite INTEGER is a signed 64-bit value
+_SQL_INT_MIN = -(1 << 63)
+_SQL_INT_MAX = (1 << 63) - 1
+
+
+def _sql_value(value: Any) -> Any:
+    """A value SQLite can store: booleans as 0/1, integers beyond 64 bits as decimal text, containers as JSON text.
+
+    SQLite turns such text into the nearest REAL in INTEGER columns; the exact
+    value stays in TEXT columns and in ``data``.
+    """
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value if _SQL_INT_MIN <= value <= _SQL_INT_MAX else str(value)
+    if value is None or isinstance(value, (str, float)):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _option(obj: Dict[str, Any], key: str) -> Any:
+    options = obj.get("options")
+    return options.get(key) if isinstance(options, dict) else None
+
+
+def _data(obj: Dict[str, Any]) -> str:
+    return dumps_json({k: v for k, v in obj.items() if k != "state"}, compact=True)
+
+
+def _stream_row(obj: Dict[str, Any]) -> Tuple[Any, ...]:
+    enable_thumbnails = obj.get("enableThumbnails")
+    if enable_thumbnails is None:
+        enable_thumbnails = _option(obj, "enableThumbnails")
+    return (
+        obj.get("id"),
+        obj.get("name"),
+        _option(obj, "failoverMode"),
+        enable_thumbnails,
+        _data(obj),
+    )
+
+
+def _source_row(obj: Dict[str, Any]) -> Tuple[Any, ...]:
+    # Same fallback as the Input/Output report
+    address = _option(obj, "sourceAddress")
+    if address is None:
+        address = _option(obj, "address")
+    return (
+        obj.get("id"),
+        obj.get("stream"),
+        obj.get("name"),
+        obj.get("protocol"),
+        _option(obj, "port"),
+        _option(obj, "networkInterface"),
+        address,
+        obj.get("priority"),
+        obj.get("stopped"),
+        obj.get("paused"),
+        _data(obj),
+    )
+
+
+def _output_row(obj: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        obj.get("id"),
+        obj.get("stream"),
+        obj.get("name"),
+        obj.get("protocol"),
+        _option(obj, "port"),
+        _option(obj, "hostAddress"),
+        _option(obj, "address"),
+        obj.get("paused"),
+        _data(obj),
+    )
+
+
+# table -> (export section, column names after export_file/position, row builder)
+TABLES: Dict[str, Tuple[str, Sequence[str], Callable[[Dict[str, Any]], Tuple[Any, ...]]]] = {
+    "streams": (
+        "configuredStreams",
+        ("id", "name", "failover_mode", "enable_thumbnails", "data"),
+        _stream_row,
+    ),
+    "sources": (
+        "configuredSources",
+        ("id", "stream_id", "name", "protocol", "port", "network_interface", "address", "priority", "stopped", "paused", "data"),
+        _source_row,
+    ),
+    "outputs": (
+        "configuredOutputs",
+        ("id", "stream_id", "name", "protocol", "port", "host_address", "address", "paused", "data"),
+        _output_row,
+    ),
+}
+
+
+def _rows(
+    export_file: str, items: List[Any], build: Callable[[Dict[str, Any]], Tuple[Any, ...]], counts: List[int]
+) -> Iterator[Tuple[Any, ...]]:
+    # counts[0] -> rows produced, counts[1] -> non-object items skipped
+    for position, obj in enumerate(items):
+        if not isinstance(obj, dict):
+            counts[1] += 1
+            continue
+        counts[0] += 1
+        yield (export_file, position) + tuple(_sql_value(v) for v in build(obj))
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Open (creating if needed) a txEdge database; raises ValueError for another schema version."""
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    # Transactions are managed explicitly (BEGIN IMMEDIATE ... COMMIT)
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0:
+            conn.execute("BEGIN IMMEDIATE")
+            # Re-check under the write lock: another process may have just created it
+            if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+                for statement in _SCHEMA.split(";"):
+                    if statement.strip():
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        elif version != SCHEMA_VERSION:
+            raise ValueError(
+                f"{db_path} uses database schema {version}, expected {SCHEMA_VERSION}; delete it and load the exports again"
+            )
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+def load_export(
+    conn: sqlite3.Connection, export_file: str, data: Dict[str, Any], source_sha256: Optional[str] = None
+) -> Tuple[int, int]:
+    """Replace ``export_file``'s rows with the objects of ``data`` in one transaction.
+
+    ``source_sha256`` (the hash of the file ``data`` was read from) is stored in
+    ``exports``. Returns (rows written, non-object items skipped).
+    """
+    sections: Dict[str, List[Any]] = {}
+    for table, (section, _, _) in TABLES.items():
+        items = data.get(section) or []
+        if not isinstance(items, list):
+            raise ValueError(f"Input JSON must contain lists: {', '.join(s for s, _, _ in TABLES.values())}")
+        sections[table] = items
+
+    written: Dict[str, int] = {}
+    skipped = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM exports WHERE export_file = ?", (export_file,))
+        for table, (_, columns, build) in TABLES.items():
+            conn.execute(f"DELETE FROM {table} WHERE export_file = ?", (export_file,))
+            counts = [0, 0]
+            placeholders = ", ".join("?" * (len(columns) + 2))
+            conn.executemany(
+                f"INSERT INTO {table} (export_file, position, {', '.join(columns)}) VALUES ({placeholders})",
+                _rows(export_file, sections[table], build, counts),
+            )
+            written[table] = counts[0]
+            skipped += counts[1]
+        conn.execute(
+            "INSERT INTO exports (export_file, imported_at, streams, sources, outputs, source_sha256)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                export_file,
+                time.strftime("%Y-%m-%dT%H:%M:%S"),
+                written["streams"],
+                written["sources"],
+                written["outputs"],
+                source_sha256,
+            ),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return sum(written.values()), skipped
+
+
+def loaded_sha256(db_path: str, export_file: str) -> Optional[str]:
+    """``source_sha256`` of ``export_file`` in the database, or None if it is not loaded there.
+
+    The database is opened read-only and never created.
+    """
+    if not os.path.exists(db_path):
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro", uri=True, timeout=BUSY_TIMEOUT)
+    except sqlite3.Error:
+        return None
+    try:
+        row = conn.execute("SELECT source_sha256 FROM exports WHERE export_file = ?", (export_file,)).fetchone()
+    except sqlite3.Error:
+        # Another schema (or not a txEdge database): nothing can be trusted
+        return None
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def convert_txedge_to_sqlite(
+    input_path: str,
+    db_path: str,
+    encoding: str = "utf-8",
+    streaming: bool = False,
+    export_name: Optional[str] = None,
+    stats: Optional[ConversionStats] = None,
+) -> None:
+    """Load one export into ``db_path``, replacing earlier rows of the same export.
+
+    Rows are keyed by ``export_name`` (default: the input's file name); the
+    input's SHA-256 is recorded with them so batch runs can tell which version
+    of the export the database holds.
+    """
+    with stage(stats, "parse"):
+        if streaming:
+            # Incremental parse: only the three sections, without their state blocks
+            data = load_sections(input_path, encoding=encoding)
+        else:
+            data = load_cached_json(input_path, encoding=encoding)
+    if not isinstance(data, dict):
+        raise ValueError("Input JSON must be an object")
+
+    with stage(stats, "write"):
+        source_sha256 = file_sha256(input_path)
+        conn = connect(db_path)
+        try:
+            rows_written, skipped = load_export(conn, export_name or os.path.basename(input_path), data, source_sha256)
+        finally:
+            conn.close()
+    if stats is not None:
+        stats.rows_written += rows_written
+        stats.objects_skipped += skipped
+        stats.add_input(input_path)
+        stats.add_output(db_path)
+        stats.finish()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load a txEdge JSON export into a SQLite database")
+    parser.add_argument("-i", "--input", required=True, help="Path to txEdge JSON file")
+    parser.add_argument("-o", "--output", required=True, help="Path to the SQLite database (created if missing)")
+    parser.add_argument("--export-name", help="Name the rows are stored under (default: the input file name)")
+    parser.add_argument("--encoding", default="utf-8", help="File encoding")
+    parser.add_argument("--stream", action="store_true", help="Parse the input incrementally to bound memory on large exports")
+    parser.add_argument("--profile", action="store_true", help="Print per-stage timings and counters to stderr")
+    parser.add_argument("--cprofile", metavar="FILE", help="Write a cProfile dump of the conversion to FILE")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    stats = ConversionStats() if args.profile else None
+    try:
+        with cprofile_to(args.cprofile):
+            convert_txedge_to_sqlite(
+                args.input, args.output, encoding=args.encoding, streaming=args.stream, export_name=args.export_name,
+                stats=stats,
+            )
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    if stats is not None:
+        print(f"Profile for {args.input}:\n{stats.format()}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Converter benchmarks: a synthetic txEdge export generator and a timing/memory runner."""
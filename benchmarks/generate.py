@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Deterministic synthetic txEdge exports for benchmarking.
+
+The same arguments and seed always produce the same document, so timings from
+different runs and machines are comparable.
+
+  python -m benchmarks.generate -o /tmp/bench-config.json --objects 10000
+"""
+import argparse
+import io
+import json
+import random
+import sys
+from typing import Any, Dict, List
+
+PROTOCOLS = ["udp", "srt", "rtp", "rtsp", "http"]
+INTERFACES = ["eth0", "eth1", "eth2", "bond0"]
+
+
+def streams_for_objects(objects: int, sources_per_stream: int = 2, outputs_per_stream: int = 2) -> int:
+    """Number of streams giving roughly ``objects`` streams+sources+outputs in total."""
+    return max(1, round(objects / (1 + sources_per_stream + outputs_per_stream)))
+
+
+def _nested(rng: random.Random, depth: int, list_len: int) -> Dict[str, Any]:
+    """``depth`` levels of nested dicts under "advanced", each with a few leaves."""
+    node: Dict[str, Any] = {}
+    root = node
+    for level in range(depth):
+        node[f"level{level}Enabled"] = rng.random() < 0.5
+        node[f"level{level}Timeout"] = rng.randint(1, 10000)
+        node[f"level{level}Ratio"] = round(rng.random(), 3)
+        node[f"level{level}Labels"] = [f"L{level}-{rng.randint(0, 99)}" for _ in range(list_len)]
+        child: Dict[str, Any] = {}
+        node[f"level{level + 1}"] = child
+        node = child
+    node["leaf"] = rng.choice(["a", "b", "c"])
+    return root
+
+
+def _state(rng: random.Random, state_size: int) -> Dict[str, Any]:
+    return {
+        "bitrate": [rng.randint(0, 20_000_000) for _ in range(state_size)],
+        "ccErrors": [rng.randint(0, 5) for _ in range(state_size)],
+        "lastError": {"code": rng.randint(0, 99), "message": "x" * rng.randint(0, 64)},
+    }
+
+
+def generate_export(
+    streams: int,
+    sources_per_stream: int = 2,
+    outputs_per_stream: int = 2,
+    depth: int = 2,
+    state_size: int = 32,
+    list_len: int = 3,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Build a txEdge export with ``streams`` streams and their sources/outputs.
+
+    ``depth`` adds nested option levels, ``state_size`` sets the length of the
+    lists inside every ``state`` blob and ``list_len`` the length of list-valued
+    options. Sources and outputs are shuffled so they are not stored in stream order.
+    """
+    rng = random.Random(seed)
+    configured_streams: List[Dict[str, Any]] = []
+    configured_sources: List[Dict[str, Any]] = []
+    configured_outputs: List[Dict[str, Any]] = []
+    next_id = streams + 1
+    for i in range(streams):
+        stream_id = i + 1
+        configured_streams.append(
+            {
+                "id": stream_id,
+                "name": f"{stream_id} - stream {i}",
+                "options": {
+                    "failoverTriggers": {
+                        "zeroBitrate": rng.random() < 0.5,
+                        "TSSyncLoss": rng.random() < 0.5,
+                        "lowBitrateThreshold": rng.randint(0, 5000),
+                        "CCErrorsInPeriodThreshold": rng.randint(0, 20),
+                        "CCErrorsInPeriodTime": rng.randint(0, 20),
+                        "lowBitrate": rng.random() < 0.5,
+                        "CCErrorsInPeriod": rng.random() < 0.5,
+                    },
+                    "failoverMode": rng.choice(["reverting", "non-reverting"]),
+                    "failoverRevertTime": rng.randint(0, 60),
+                    "failoverWaitTime": rng.randint(0, 10),
+                    "enableThumbnails": rng.random() < 0.5,
+                    "tags": [f"tag{rng.randint(0, 50)}" for _ in range(list_len)],
+                    "advanced": _nested(rng, depth, list_len),
+                },
+                "enableThumbnails": rng.random() < 0.5,
+                "state": _state(rng, state_size),
+            }
+        )
+        for j in range(sources_per_stream):
+            configured_sources.append(
+                {
+                    "id": next_id,
+                    "name": f"{stream_id} - source {j}",
+                    "protocol": rng.choice(PROTOCOLS),
+                    "stream": stream_id,
+                    "options": {
+                        "port": rng.randint(1024, 65535),
+                        "networkInterface": rng.choice(INTERFACES),
+                        "sourceAddress": f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                        "allowedSenders": [f"10.0.0.{rng.randint(1, 254)}" for _ in range(list_len)],
+                        "advanced": _nested(rng, depth, list_len),
+                    },
+                    "stopped": rng.random() < 0.1,
+                    "paused": rng.random() < 0.1,
+                    "priority": j + 1,
+                    "state": _state(rng, state_size),
+                }
+            )
+            next_id += 1
+        for j in range(outputs_per_stream):
+            configured_outputs.append(
+                {
+                    "id": next_id,
+                    "name": f"{stream_id} - output {j}",
+                    "protocol": rng.choice(PROTOCOLS),
+                    "stream": stream_id,
+                    "options": {
+                        "port": rng.randint(1024, 65535),
+                        "hostAddress": f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                        "address": f"239.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                        "advanced": _nested(rng, depth, list_len),
+                    },
+                    "paused": rng.random() < 0.1,
+                    "state": _state(rng, state_size),
+                }
+            )
+            next_id += 1
+    rng.shuffle(configured_sources)
+    rng.shuffle(configured_outputs)
+    return {
+        "configuredStreams": configured_streams,
+        "configuredSources": configured_sources,
+        "configuredOutputs": configured_outputs,
+        "system": {"version": "bench", "seed": seed},
+    }
+
+
+def write_export(path: str, **kwargs: Any) -> None:
+    """Generate an export (see ``generate_export``) and write it like txEdge does."""
+    data = generate_export(**kwargs)
+    with io.open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic txEdge export")
+    parser.add_argument("-o", "--output", required=True, help="Path of the JSON file to write")
+    size = parser.add_mutually_exclusive_group(required=True)
+    size.add_argument("--streams", type=int, help="Number of configured streams")
+    size.add_argument("--objects", type=int, help="Approximate total number of streams+sources+outputs")
+    parser.add_argument("--sources-per-stream", type=int, default=2)
+    parser.add_argument("--outputs-per-stream", type=int, default=2)
+    parser.add_argument("--depth", type=int, default=2, help="Extra nested option levels per object")
+    parser.add_argument("--state-size", type=int, default=32, help="Length of the lists inside each state blob")
+    parser.add_argument("--list-len", type=int, default=3, help="Length of list-valued options")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    streams = args.streams or streams_for_objects(args.objects, args.sources_per_stream, args.outputs_per_stream)
+    try:
+        write_export(
+            args.output,
+            streams=streams,
+            sources_per_stream=args.sources_per_stream,
+            outputs_per_stream=args.outputs_per_stream,
+            depth=args.depth,
+            state_size=args.state_size,
+            list_len=args.list_len,
+            seed=args.seed,
+        )
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Time and memory-profile the converters on synthetic exports.
+
+  python -m benchmarks.run                      # 1k/10k/100k objects, compare with baseline.json
+  python -m benchmarks.run --scales 1k,10k --repeat 3
+  python -m benchmarks.run --update-baseline    # store this run as the new baseline
+
+Every measurement runs in a freshly spawned process, so peak RSS reflects that
+conversion alone. Inputs are generated with benchmarks.generate (fixed seed).
+"""
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(PROJECT_ROOT, "Scripts")
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.generate import streams_for_objects, write_export  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SCALES: Dict[str, int] = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+# Benchmarked converter -> (module, function)
+CONVERTERS: Dict[str, Tuple[str, str]] = {
+    "convert_txedge_to_csv": ("txedge_to_csv", "convert_txedge_to_csv"),
+    "convert_streams_sources": ("txedge_to_csv_streams_sources", "convert_streams_sources"),
+    "convert_txedge_to_csv_with_id": ("txedge_to_csv_with_id", "convert_txedge_to_csv_with_id"),
+    "convert_csv_to_json": ("CSV_to_JSON", "convert_csv_to_json"),
+}
+# Share of editable-CSV rows whose priority is edited before convert_csv_to_json
+EDIT_EVERY = 20
+DEFAULT_THRESHOLD = 1.25
+
+
+def _peak_rss_mb() -> float:
+    # VmHWM belongs to this address space; ru_maxrss on Linux also covers the
+    # parent's usage before exec, which would hide the conversion's own peak.
+    try:
+        with io.open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _measure(converter: str, input_path: str, output_path: str) -> Dict[str, float]:
+    """Run one conversion in this (fresh) process; returns seconds and RSS figures."""
+    import gc
+
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    module_name, func_name = CONVERTERS[converter]
+    func = getattr(__import__(module_name), func_name)
+    gc.collect()
+    rss_before = _peak_rss_mb()
+    start = time.perf_counter()
+    func(input_path, output_path)
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "rss_before_mb": rss_before, "peak_rss_mb": _peak_rss_mb()}
+
+
+def _run_isolated(converter: str, input_path: str, output_path: str) -> Dict[str, float]:
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        return pool.submit(_measure, converter, input_path, output_path).result()
+
+
+def _prepare_scale(work_dir: str, label: str, objects: int) -> Dict[str, Any]:
+    """Generate the export for one scale plus an edited editable CSV for CSV→JSON."""
+    env_dir = os.path.join(work_dir, label)
+    editable_dir = os.path.join(env_dir, "Editable CSVs")
+    os.makedirs(editable_dir, exist_ok=True)
+    json_path = os.path.join(env_dir, "bench-config.json")
+    write_export(json_path, streams=streams_for_objects(objects))
+
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    from txedge_to_csv_with_id import convert_txedge_to_csv_with_id  # type: ignore
+
+    csv_path = os.path.join(editable_dir, "bench.csv")
+    convert_txedge_to_csv_with_id(json_path, csv_path)
+    with io.open(csv_path, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    priority = rows[0].index("priority")
+    for n, row in enumerate(rows[1:]):
+        if n % EDIT_EVERY == 0 and row[priority]:
+            row[priority] = str(int(row[priority]) + 1)
+    with io.open(csv_path, "w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerows(rows)
+    return {
+        "json": json_path,
+        "csv": csv_path,
+        "out_dir": os.path.join(work_dir, f"{label}-out"),
+        "json_mb": os.path.getsize(json_path) / (1024 * 1024),
+    }
+
+
+def run_benchmarks(scales: List[str], repeat: int = 1, work_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Benchmark every converter at each scale; keeps the fastest of ``repeat`` runs."""
+    own_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix="txedge-bench-")
+    results: Dict[str, Any] = {}
+    try:
+        for label in scales:
+            inputs = _prepare_scale(work_dir, label, SCALES[label])
+            os.makedirs(inputs["out_dir"], exist_ok=True)
+            scale_results: Dict[str, Any] = {"input_mb": round(inputs["json_mb"], 1)}
+            for converter in CONVERTERS:
+                if converter == "convert_csv_to_json":
+                    input_path = inputs["csv"]
+                    output_path = os.path.join(inputs["out_dir"], "bench-config.json")
+                else:
+                    input_path = inputs["json"]
+                    output_path = os.path.join(inputs["out_dir"], f"{converter}.csv")
+                runs = [_run_isolated(converter, input_path, output_path) for _ in range(max(1, repeat))]
+                best = min(runs, key=lambda r: r["seconds"])
+                scale_results[converter] = {
+                    "seconds": round(best["seconds"], 3),
+                    "peak_rss_mb": round(max(r["peak_rss_mb"] for r in runs), 1),
+                    "rss_growth_mb": round(max(r["peak_rss_mb"] - r["rss_before_mb"] for r in runs), 1),
+                }
+                print(
+                    f"{label:>5} {converter:<32} {best['seconds']:8.3f}s "
+                    f"peak {scale_results[converter]['peak_rss_mb']:8.1f} MiB",
+                    flush=True,
+                )
+            results[label] = scale_results
+    finally:
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return {
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "system": f"{platform.system()} {platform.machine()}",
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Lines describing measurements more than ``threshold`` times the baseline."""
+    regressions: List[str] = []
+    for label, scale_results in current["results"].items():
+        base_scale = baseline.get("results", {}).get(label, {})
+        for converter, figures in scale_results.items():
+            base = base_scale.get(converter)
+            if not isinstance(figures, dict) or not isinstance(base, dict):
+                continue
+            for metric in ("seconds", "peak_rss_mb"):
+                old, new = base.get(metric), figures.get(metric)
+                if old and new and new > old * threshold:
+                    regressions.append(f"{label} {converter} {metric}: {old} -> {new} ({new / old:.2f}x)")
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the txEdge converters on synthetic exports")
+    parser.add_argument("--scales", default=",".join(SCALES), help=f"Comma-separated subset of {', '.join(SCALES)}")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per measurement; the fastest is kept")
+    parser.add_argument("--output", help="Also write the results JSON to this path")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Slowdown/memory ratio reported as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results to the baseline file")
+    parser.add_argument("--work-dir", help="Keep generated inputs and outputs in this folder")
+    args = parser.parse_args()
+    unknown = [s for s in args.scales.split(",") if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+    return args
+
+
+def main() -> int:
+    args = parse_args()
+    results = run_benchmarks(args.scales.split(","), repeat=args.repeat, work_dir=args.work_dir)
+    text = json.dumps(results, indent=2, sort_keys=True) + "\n"
+    if args.output:
+        with io.open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    if args.update_baseline:
+        with io.open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    try:
+        with io.open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
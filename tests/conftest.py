@@ -0,0 +1,42 @@
+import json
+import os
+import sys
+
+import pytest
+
+# The converters import each other as flat sibling modules
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Scripts")
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+
+def example_export():
+    """A small export with nested options, a list value and a ``state`` block."""
+    return {
+        "configuredStreams": [
+            {"id": 1, "name": "Stream A", "options": {"latency": 100, "enabled": True}},
+            {"id": 2, "name": "Stream B", "options": {"latency": 200, "enabled": False}, "tags": ["a", "b"]},
+        ],
+        "configuredSources": [
+            {
+                "id": 11,
+                "name": "Camera 1",
+                "stream": 1,
+                "options": {"port": 554, "sourceAddress": "10.0.0.11"},
+                "state": {"bitrate": 1},
+            },
+        ],
+        "configuredOutputs": [
+            {"id": 21, "name": "Output A1", "stream": 1, "options": {"port": 8554, "hostAddress": "10.0.0.2"}},
+        ],
+    }
+
+
+@pytest.fixture
+def env_dir(tmp_path):
+    """An environment folder holding ``example-config.json``."""
+    env = tmp_path / "TDP"
+    env.mkdir()
+    with open(env / "example-config.json", "w", encoding="utf-8") as f:
+        json.dump(example_export(), f, indent=2)
+    return env
@@ -0,0 +1,110 @@
+import copy
+import csv
+import json
+
+import pytest
+
+from CSV_to_JSON import _index_last_keys, _row_changes, _with_changes, convert_csv_to_json
+from conftest import example_export
+from txedge_doc_cache import DOCUMENT_CACHE, configure_document_cache, load_cached_json
+from txedge_patch import FORMAT_DELTA, FORMAT_FULL, FORMAT_JSON_PATCH, apply_patch, apply_patch_file
+from txedge_to_csv_with_id import convert_txedge_to_csv_with_id
+
+# (objectType, id) -> column -> new cell text
+EDITS = {
+    ("Stream", "1"): {"latency": "150", "enabled": "false"},
+    ("Stream", "2"): {"tags": '["c"]'},
+    ("Source", "11"): {"name": "Camera 1b"},
+    ("Output", "21"): {"port": "8555"},
+}
+
+
+def _edited_csv(env_dir):
+    csv_path = env_dir / "Editable CSVs" / "example.csv"
+    convert_txedge_to_csv_with_id(str(env_dir / "example-config.json"), str(csv_path))
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        row.update(EDITS.get((row["objectType"], row["id"]), {}))
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return csv_path
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_edits_are_written_back(env_dir):
+    csv_path = _edited_csv(env_dir)
+    changes = convert_csv_to_json(str(csv_path), str(env_dir / "out.json"))
+
+    expected = example_export()
+    expected["configuredStreams"][0]["options"].update(latency=150, enabled=False)
+    expected["configuredStreams"][1]["tags"] = ["c"]
+    expected["configuredSources"][0]["name"] = "Camera 1b"
+    expected["configuredOutputs"][0]["options"]["port"] = 8555
+    assert _load(env_dir / "out.json") == expected
+    assert len(changes) == 5
+
+
+@pytest.mark.parametrize("output_format", [FORMAT_JSON_PATCH, FORMAT_DELTA])
+def test_patch_round_trips_to_full_output(env_dir, output_format):
+    csv_path = _edited_csv(env_dir)
+    convert_csv_to_json(str(csv_path), str(env_dir / "full.json"), output_format=FORMAT_FULL)
+    convert_csv_to_json(str(csv_path), str(env_dir / "patch.json"), output_format=output_format)
+
+    apply_patch_file(str(env_dir / "example-config.json"), str(env_dir / "patch.json"), str(env_dir / "patched.json"))
+    assert _load(env_dir / "patched.json") == _load(env_dir / "full.json")
+
+
+def test_json_patch_test_compares_json_types(env_dir):
+    csv_path = _edited_csv(env_dir)
+    convert_csv_to_json(str(csv_path), str(env_dir / "patch.json"), output_format=FORMAT_JSON_PATCH)
+    patch = _load(env_dir / "patch.json")
+    assert {"op": "test", "path": "/configuredStreams/0/options/enabled", "value": True} in patch
+
+    # 1 == True in Python, but a JSON number is not a JSON boolean
+    doc = example_export()
+    doc["configuredStreams"][0]["options"]["enabled"] = 1
+    with pytest.raises(ValueError, match="test failed"):
+        apply_patch(doc, patch)
+    # Ints and floats are both JSON numbers
+    assert apply_patch({"a": 1}, [{"op": "test", "path": "/a", "value": 1.0}]) == {"a": 1}
+
+
+def test_cached_export_is_left_unchanged(env_dir):
+    csv_path = _edited_csv(env_dir)
+    configure_document_cache(1 << 30)
+    try:
+        cached = load_cached_json(str(env_dir / "example-config.json"))
+        convert_csv_to_json(str(csv_path), str(env_dir / "out.json"))
+        assert load_cached_json(str(env_dir / "example-config.json")) is cached
+        assert cached == example_export()
+    finally:
+        configure_document_cache(0)
+        DOCUMENT_CACHE.clear()
+
+
+def test_first_occurrence_of_a_column_wins():
+    obj = {"id": 1, "options": {"a": {"port": 1, "x": 2}, "port": 3}, "b": {"x": 4}, "port": 5}
+    index = _index_last_keys(obj)
+    # Direct scalars first, then nested dicts in order
+    assert index["port"] == (obj, ("port",))
+    assert index["x"] == (obj["options"]["a"], ("options", "a", "x"))
+
+    changes = _row_changes(obj, {"id": "1", "port": "6", "x": "7"}, "configuredStreams", 0)
+    assert [(c.path, c.old, c.new) for c in changes] == [(("port",), 5, 6), (("options", "a", "x"), 2, 7)]
+
+
+def test_changes_are_applied_to_a_copy():
+    obj = {"id": 1, "options": {"a": {"x": 2}, "y": {"z": 1}}}
+    original = copy.deepcopy(obj)
+    updated = _with_changes(obj, _row_changes(obj, {"x": "3"}))
+    assert obj == original
+    assert updated == {"id": 1, "options": {"a": {"x": 3}, "y": {"z": 1}}}
+    # Dicts off the changed path are shared
+    assert updated["options"]["y"] is obj["options"]["y"]
@@ -0,0 +1,45 @@
+import os
+
+from txedge_grouping import group_by_stream
+from txedge_partition import INDEX_NAME, Partitioning, parts_dir_for, read_index, write_partitioned
+
+
+def _grouping(count):
+    streams = [{"id": i, "name": f"stream-{i}"} for i in range(count)]
+    return group_by_stream(streams, [{"stream": i} for i in range(count)], [])
+
+
+def _write_part(grouping, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("name\n")
+        f.writelines(f"{stream['name']}\n" for stream in grouping.streams)
+    return len(grouping.streams)
+
+
+def _write(output_path, streams, max_rows):
+    return write_partitioned(_grouping(streams), output_path, _write_part, lambda g, s: 1, Partitioning(max_rows=max_rows))
+
+
+def test_rewrite_removes_stale_parts(tmp_path):
+    output_path = str(tmp_path / "report.csv")
+    parts_dir = parts_dir_for(output_path)
+    assert len(_write(output_path, 10, 2)) == 5
+    # Files that are not parts are left alone
+    with open(os.path.join(parts_dir, "notes.txt"), "w", encoding="utf-8") as f:
+        f.write("keep")
+
+    written = _write(output_path, 10, 5)
+    assert [os.path.basename(path) for path, _ in written] == ["part-001.csv", "part-002.csv"]
+    assert sorted(os.listdir(parts_dir)) == [INDEX_NAME, "notes.txt", "part-001.csv", "part-002.csv"]
+    _, csv_paths = read_index(parts_dir)
+    assert [os.path.basename(path) for path in csv_paths] == ["part-001.csv", "part-002.csv"]
+
+
+def test_streams_are_split_whole_and_in_order(tmp_path):
+    written = _write(str(tmp_path / "report.csv"), 7, 3)
+    assert [rows for _, rows in written] == [3, 3, 1]
+    names = []
+    for path, _ in written:
+        with open(path, encoding="utf-8") as f:
+            names.extend(f.read().split()[1:])
+    assert names == [f"stream-{i}" for i in range(7)]
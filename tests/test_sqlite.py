@@ -0,0 +1,58 @@
+import json
+import sqlite3
+
+import pytest
+
+from conftest import example_export
+from txedge_io import file_sha256
+from txedge_to_sqlite import SCHEMA_VERSION, connect, convert_txedge_to_sqlite, loaded_sha256
+
+
+def _rows(db_path, sql):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def _write_export(path, doc):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f)
+
+
+def test_reload_replaces_only_that_exports_rows(tmp_path):
+    db_path = tmp_path / "txedge.sqlite"
+    first, second = tmp_path / "a-config.json", tmp_path / "b-config.json"
+    _write_export(first, example_export())
+    _write_export(second, example_export())
+    convert_txedge_to_sqlite(str(first), str(db_path))
+    convert_txedge_to_sqlite(str(second), str(db_path))
+
+    edited = example_export()
+    edited["configuredStreams"] = edited["configuredStreams"][:1]
+    edited["configuredStreams"][0]["name"] = "Renamed"
+    _write_export(first, edited)
+    convert_txedge_to_sqlite(str(first), str(db_path))
+
+    streams = _rows(db_path, "SELECT export_file, name FROM streams ORDER BY export_file, position")
+    assert streams == [("a-config.json", "Renamed"), ("b-config.json", "Stream A"), ("b-config.json", "Stream B")]
+    exports = _rows(db_path, "SELECT export_file, streams, sources, outputs FROM exports ORDER BY export_file")
+    assert exports == [("a-config.json", 1, 1, 1), ("b-config.json", 2, 1, 1)]
+    assert loaded_sha256(str(db_path), "a-config.json") == file_sha256(str(first))
+    assert loaded_sha256(str(db_path), "b-config.json") == file_sha256(str(second))
+
+
+def test_loaded_sha256_without_database(tmp_path):
+    db_path = tmp_path / "missing.sqlite"
+    assert loaded_sha256(str(db_path), "a-config.json") is None
+    assert not db_path.exists()
+
+
+def test_other_schema_version_is_refused(tmp_path):
+    db_path = tmp_path / "txedge.sqlite"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+    conn.close()
+    with pytest.raises(ValueError, match="delete it and load the exports again"):
+        connect(str(db_path))